@@ -4,15 +4,79 @@ grpy package providing core functionality and tooling for application developmen
 This module exports the following manager classes:
 
 CommandManager: Handles command execution and management
+AsyncCommandManager: Runs validated commands as asyncio subprocesses
+CommandSpec: Immutable command validated once against the whitelist and PATH
+CommandResult: Per-command outcome with timing and resource usage
+CommandBatchError: Failure of a batch run with continue or retry, carrying every outcome
+CoProcessPool: Pool of long-lived whitelisted commands driven over stdin/stdout
+ResultCache: Memoizes results of read-only commands in memory and on disk
+CommandGraph: Runs commands as a dependency graph, skipping up-to-date steps
+CommandTemplate: Validates a command shape once and renders it for many targets
+CommandPipeline: Chains validated commands with OS pipes, without a shell
+CommandDaemon: Keeps a warm process that runs command batches sent over a Unix socket
+DaemonClient: Submits batches to a CommandDaemon using only the standard library
 PathManager: Manages file and directory paths
 LogManager: Provides custom logging functionality
+JsonLinesHandler: Batched JSON-lines log handler with structured command fields
+BufferedRotatingFileHandler: Batched log file writer with rotation and background compression
+RingBufferHandler: Holds recent records in memory and dumps them when a failure is logged
+LogAggregator: Collects log records from worker processes over a Unix socket
+BoundLogger: Slotted logger adapter that adds bound context fields to every record
+LogMetrics: Per-level record counts and handler emit latency histograms
+FastFormatter: Precompiled log formatter that renders timestamps once per second
+RateLimitFilter: Caps repeated log records and collapses runs of duplicates
 
-These managers form the core toolset for the grpy package operations.
+These managers form the core toolset for the grpy package operations. They are imported
+on first access, so importing a lightweight module such as DaemonClient does not pull in
+pydantic and the command managers.
 """
 
-from .command_manager import CommandManager
-from .log_handler import LogHandler
-from .log_level import LogLevel
-from .log_manager import LogManager
+import importlib
+from typing import Any
 
-__all__ = ["LogLevel", "LogHandler", "LogManager", "CommandManager"]
+# Exported name -> submodule that defines it
+_EXPORTS = {
+    "LogLevel": ".log_level",
+    "LogHandler": ".log_handler",
+    "LogManager": ".log_manager",
+    "JsonLinesHandler": ".json_log_handler",
+    "BufferedRotatingFileHandler": ".rotating_file_handler",
+    "RingBufferHandler": ".ring_buffer_handler",
+    "LogAggregator": ".log_aggregator",
+    "AggregatingHandler": ".log_aggregator",
+    "RateLimitFilter": ".rate_limit_filter",
+    "FastFormatter": ".fast_formatter",
+    "LogMetrics": ".log_metrics",
+    "BoundLogger": ".bound_logger",
+    "CommandManager": ".command_manager",
+    "CommandBatchError": ".command_manager",
+    "AsyncCommandManager": ".async_command_manager",
+    "CommandSpec": ".command_spec",
+    "CommandResult": ".command_result",
+    "SpoolConfig": ".spooled_output",
+    "SpooledOutput": ".spooled_output",
+    "CoProcessPool": ".coprocess",
+    "LineProtocol": ".coprocess",
+    "GitBatchProtocol": ".coprocess",
+    "ResultCache": ".result_cache",
+    "CommandGraph": ".command_graph",
+    "CommandNode": ".command_graph",
+    "CommandTemplate": ".command_template",
+    "CommandPipeline": ".command_pipeline",
+    "CommandDaemon": ".command_daemon",
+    "DaemonClient": ".daemon_client",
+}
+
+__all__ = list(_EXPORTS)
+
+
+def __getattr__(name: str) -> Any:
+    if name not in _EXPORTS:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(_EXPORTS[name], __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__() -> list:
+    return sorted(set(globals()) | set(__all__))
@@ -0,0 +1,175 @@
+import asyncio
+import os
+import signal
+import time
+from subprocess import PIPE, TimeoutExpired
+from typing import Awaitable, Callable, Dict, List, Optional
+
+from pydantic import model_validator
+
+from .command_manager import COMMAND_ERRORS, CommandManager, CommandType, SelfCM
+from .command_result import CommandResult
+from .process import process_group_options
+
+# CommandManager options that only the synchronous execution paths implement
+SYNC_ONLY_OPTIONS = ("stream_output", "on_output", "spool", "result_cache")
+
+
+class AsyncCommandManager(CommandManager):
+    """
+    Asyncio counterpart of CommandManager.
+
+    Commands are validated exactly like CommandManager (PATH lookup and cmd_whitelist) but
+    run as asyncio subprocesses, so waiting on them never blocks the event loop. With
+    parallel=True every command is gathered at once, bounded by max_workers when it is set.
+    failure_policy applies as in CommandManager. Cancelling a pending run kills the child
+    process, and its process group when new_process_group is set. Streaming, spooling and
+    result caching are not supported and are rejected at construction.
+    """
+
+    @model_validator(mode="after")
+    def reject_sync_only_options(self) -> SelfCM:
+        unsupported = [
+            name for name in SYNC_ONLY_OPTIONS if getattr(self, name) not in (None, False)
+        ]
+        if unsupported:
+            raise ValueError(f"AsyncCommandManager does not support: {', '.join(unsupported)}")
+        return self
+
+    async def run_command(self, cmd: CommandType) -> CommandResult:
+        started_at = time.time()
+        process = await asyncio.create_subprocess_exec(
+            *cmd,
+            executable=self.executable_for(cmd),
+            stdout=PIPE,
+            stdin=PIPE,
+            stderr=PIPE,
+            **(process_group_options() if self.new_process_group else {}),
+        )
+        self._info(lambda: f"Executing command: {' '.join(cmd)}")
+
+        try:
+            stdout, stderr = await asyncio.wait_for(process.communicate(), timeout=self.timeout)
+        except asyncio.TimeoutError:
+            await self._kill(process, self.new_process_group)
+            raise TimeoutExpired(cmd, self.timeout)
+        except asyncio.CancelledError:
+            await self._kill(process, self.new_process_group)
+            raise
+
+        ended_at = time.time()
+        stdout_text = self._decode(stdout)
+        stderr_text = self._decode(stderr)
+
+        if stdout_text:
+            self._info(lambda: f"Command output: {' '.join(cmd)}\n{stdout_text.strip()}")
+
+        if process.returncode != 0:
+            error_msg = stderr_text.strip() if stderr_text else "No error message provided"
+            raise RuntimeError(f"Command failed: {' '.join(cmd)}\nError: {error_msg}")
+
+        # asyncio reaps the child itself, so no rusage is available here
+        result = CommandResult.from_process(
+            cmd,
+            process,
+            started_at,
+            ended_at,
+            stdout_text,
+            stderr_text,
+            stdout_bytes=len(stdout),
+            stderr_bytes=len(stderr),
+        )
+        self._completed(result)
+        return result
+
+    async def run_commands(self) -> List[CommandResult]:
+        semaphore: Optional[asyncio.Semaphore] = (
+            asyncio.Semaphore(self.max_workers) if self.max_workers else None
+        )
+
+        async def run_bounded(cmd: CommandType) -> CommandResult:
+            if semaphore is None:
+                return await self.run_with_policy(cmd)
+            async with semaphore:
+                return await self.run_with_policy(cmd)
+
+        if self.parallel:
+            results = await self.run_parallel(run_bounded)
+        else:
+            results = await self.run_sequential()
+        self.logger.info("All commands executed successfully")
+        return results
+
+    async def run_sequential(self) -> List[CommandResult]:
+        results: List[Optional[CommandResult]] = []
+        errors: Dict[int, BaseException] = {}
+        for index, cmd in enumerate(self.cmds):
+            try:
+                results.append(await self.run_with_policy(cmd))
+            except COMMAND_ERRORS as exc:
+                self.logger.error(str(exc))
+                if self.failure_policy == "fail_fast":
+                    raise
+                results.append(None)
+                errors[index] = exc
+        if errors:
+            self._raise_failures(results, errors)
+        return results
+
+    async def run_parallel(
+        self, run: Callable[[CommandType], Awaitable[CommandResult]]
+    ) -> List[CommandResult]:
+        fail_fast = self.failure_policy == "fail_fast"
+        tasks = [asyncio.ensure_future(run(cmd)) for cmd in self.cmds]
+        done, pending = await asyncio.wait(
+            tasks, return_when=asyncio.FIRST_EXCEPTION if fail_fast else asyncio.ALL_COMPLETED
+        )
+        # Cancelled tasks kill their children on the way out
+        for task in pending:
+            task.cancel()
+        await asyncio.gather(*pending, return_exceptions=True)
+
+        errors = {
+            index: task.exception()
+            for index, task in enumerate(tasks)
+            if task in done and task.exception()
+        }
+        for exc in list(errors.values())[:1] if fail_fast else errors.values():
+            self.logger.error(str(exc))
+        if errors:
+            self._raise_failures(
+                [
+                    task.result() if task in done and index not in errors else None
+                    for index, task in enumerate(tasks)
+                ],
+                errors,
+            )
+        return [task.result() for task in tasks]
+
+    async def run_with_policy(self, cmd: CommandType) -> CommandResult:
+        attempts = self.max_retries + 1 if self.failure_policy == "retry" else 1
+        delay = self.retry_backoff
+        for attempt in range(1, attempts + 1):
+            try:
+                return await self.run_command(cmd)
+            except COMMAND_ERRORS as exc:
+                if attempt == attempts:
+                    raise
+                self.logger.warning(
+                    f"Command failed (attempt {attempt} of {attempts}), retrying in "
+                    f"{delay:g}s: {' '.join(cmd)}\n{exc}"
+                )
+            await asyncio.sleep(delay)
+            delay *= 2
+
+    @staticmethod
+    async def _kill(process: asyncio.subprocess.Process, group: bool = False) -> None:
+        if process.returncode is None:
+            try:
+                if group and hasattr(os, "killpg"):
+                    os.killpg(process.pid, signal.SIGKILL)
+                else:
+                    process.kill()
+            except ProcessLookupError:
+                pass
+        await process.wait()
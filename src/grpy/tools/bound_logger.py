@@ -0,0 +1,94 @@
+import logging
+from typing import Any, Dict, Mapping, Optional
+
+from .json_log_handler import STANDARD_ATTRIBUTES
+
+
+class BoundLogger:
+    """
+    Logger adapter that adds a fixed set of context fields to every record it logs, e.g.
+
+        log = LogManager.current().bind(repo="grpy-tools", command="git fetch")
+        log.error("Command failed")  # record.repo == "grpy-tools"
+
+    It shares the underlying logger, and so its level, filters and handlers. The context
+    dict is built once, in bind(), and passed as extra= on every call, so logging through
+    the adapter allocates nothing a plain logger call would not. Nothing is validated
+    per call; binding only checks that no key would overwrite a standard record field.
+    """
+
+    __slots__ = ("_logger", "_context")
+
+    def __init__(self, logger: logging.Logger, context: Mapping[str, Any]) -> None:
+        clashes = STANDARD_ATTRIBUTES.intersection(context)
+        if clashes:
+            raise ValueError(f"Context keys clash with LogRecord attributes: {sorted(clashes)}")
+        self._logger = logger
+        self._context: Dict[str, Any] = dict(context)
+
+    @property
+    def logger(self) -> logging.Logger:
+        return self._logger
+
+    @property
+    def context(self) -> Mapping[str, Any]:
+        return self._context
+
+    def bind(self, **context: Any) -> "BoundLogger":
+        """A new adapter with this one's context plus context, the latter taking precedence."""
+        return BoundLogger(self._logger, {**self._context, **context})
+
+    def isEnabledFor(self, level: int) -> bool:
+        return self._logger.isEnabledFor(level)
+
+    def debug(self, msg: object, *args: Any, **kwargs: Any) -> None:
+        if self._logger.isEnabledFor(logging.DEBUG):
+            self._log(logging.DEBUG, msg, args, **kwargs)
+
+    def info(self, msg: object, *args: Any, **kwargs: Any) -> None:
+        if self._logger.isEnabledFor(logging.INFO):
+            self._log(logging.INFO, msg, args, **kwargs)
+
+    def warning(self, msg: object, *args: Any, **kwargs: Any) -> None:
+        if self._logger.isEnabledFor(logging.WARNING):
+            self._log(logging.WARNING, msg, args, **kwargs)
+
+    def error(self, msg: object, *args: Any, **kwargs: Any) -> None:
+        if self._logger.isEnabledFor(logging.ERROR):
+            self._log(logging.ERROR, msg, args, **kwargs)
+
+    def exception(self, msg: object, *args: Any, exc_info: Any = True, **kwargs: Any) -> None:
+        if self._logger.isEnabledFor(logging.ERROR):
+            self._log(logging.ERROR, msg, args, exc_info=exc_info, **kwargs)
+
+    def critical(self, msg: object, *args: Any, **kwargs: Any) -> None:
+        if self._logger.isEnabledFor(logging.CRITICAL):
+            self._log(logging.CRITICAL, msg, args, **kwargs)
+
+    def log(self, level: int, msg: object, *args: Any, **kwargs: Any) -> None:
+        if self._logger.isEnabledFor(level):
+            self._log(level, msg, args, **kwargs)
+
+    def _log(
+        self,
+        level: int,
+        msg: object,
+        args: Any,
+        exc_info: Any = None,
+        extra: Optional[Mapping[str, Any]] = None,
+        stack_info: bool = False,
+        stacklevel: int = 1,
+    ) -> None:
+        # Skip this frame and the public method's, so records point at the caller
+        self._logger.log(
+            level,
+            msg,
+            *args,
+            exc_info=exc_info,
+            extra={**self._context, **extra} if extra else self._context,
+            stack_info=stack_info,
+            stacklevel=stacklevel + 2,
+        )
+
+    def __repr__(self) -> str:
+        return f"<{type(self).__name__} {self._logger.name} {self._context!r}>"
@@ -0,0 +1,204 @@
+import argparse
+import json
+import logging
+import os
+import socketserver
+import threading
+from typing import Any, Dict, List, Optional, Sequence, Union
+
+from pydantic import ValidationError
+
+from .command_manager import COMMAND_ERRORS, CommandManager
+from .log_manager import LogManager
+from .unix_socket import remove_stale_socket
+
+# CommandManager fields a client may set per batch; everything else stays under the
+# daemon's control
+CLIENT_OPTIONS = frozenset(
+    {
+        "timeout",
+        "parallel",
+        "max_workers",
+        "failure_policy",
+        "max_retries",
+        "retry_backoff",
+        "stream_output",
+    }
+)
+
+
+class _Session:
+    """One client connection: serialises writes from the threads of a batch."""
+
+    def __init__(self, wfile: Any) -> None:
+        self.wfile = wfile
+        self.lock = threading.Lock()
+        self.manager: Optional[CommandManager] = None
+        self.connected = True
+
+    def send(self, event: str, **data: Any) -> None:
+        line = json.dumps({"event": event, **data}, default=str).encode() + b"\n"
+        with self.lock:
+            if not self.connected:
+                return
+            try:
+                self.wfile.write(line)
+                self.wfile.flush()
+            except OSError:
+                self.connected = False
+        if not self.connected and self.manager is not None:
+            # Nobody is waiting for the batch any more
+            self.manager.cancel()
+
+
+class _SessionHandler(logging.Handler):
+    def __init__(self, session: _Session) -> None:
+        super().__init__()
+        self.session = session
+
+    def emit(self, record: logging.LogRecord) -> None:
+        try:
+            self.session.send("log", level=record.levelname, message=self.format(record))
+        except Exception:
+            self.handleError(record)
+
+
+class _RequestHandler(socketserver.StreamRequestHandler):
+    server: "_Server"
+
+    def handle(self) -> None:
+        line = self.rfile.readline()
+        if line:
+            self.server.daemon.handle_batch(line, _Session(self.wfile))
+
+
+class _Server(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+    daemon_threads = True
+
+    def __init__(self, path: str, daemon: "CommandDaemon") -> None:
+        self.daemon = daemon
+        super().__init__(path, _RequestHandler)
+
+
+class CommandDaemon:
+    """
+    Long-lived process that runs command batches sent by DaemonClient over a Unix socket.
+
+    The interpreter, pydantic models, executable cache and logger stay warm between
+    batches, so a client only pays for a socket round trip. Each connection carries one
+    JSON-lines batch; log records are streamed back as they are emitted, followed by the
+    results (or the error) and a final "done" event. Commands are validated against
+    cmd_whitelist exactly like CommandManager, and the socket is only accessible to the
+    daemon's user. A client that disconnects cancels its batch.
+    """
+
+    def __init__(
+        self,
+        path: str,
+        logger: Optional[Union[LogManager, logging.Logger]] = None,
+        cmd_whitelist: Optional[Sequence[str]] = None,
+    ) -> None:
+        self.path = path
+        self.logger = logger if logger is not None else LogManager.current()
+        self.cmd_whitelist = list(cmd_whitelist) if cmd_whitelist is not None else None
+        self._server: Optional[_Server] = None
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self) -> None:
+        """Bind the socket and serve in a background thread."""
+        self.bind()
+        self._thread = threading.Thread(
+            target=self._server.serve_forever, name="grpy-daemon", daemon=True
+        )
+        self._thread.start()
+
+    def serve_forever(self) -> None:
+        self.bind()
+        try:
+            self._server.serve_forever()
+        finally:
+            self.close()
+
+    def bind(self) -> None:
+        remove_stale_socket(self.path)
+        umask = os.umask(0o177)
+        try:
+            self._server = _Server(self.path, self)
+        finally:
+            os.umask(umask)
+        self.logger.info(f"Daemon listening on {self.path}")
+
+    def close(self) -> None:
+        if self._server is None:
+            return
+        if self._thread is not None:
+            self._server.shutdown()
+            self._thread.join()
+            self._thread = None
+        self._server.server_close()
+        self._server = None
+        if os.path.exists(self.path):
+            os.unlink(self.path)
+
+    def handle_batch(self, line: bytes, session: _Session) -> None:
+        handler = _SessionHandler(session)
+        handler.setFormatter(logging.Formatter("%(message)s"))
+        logger = self.batch_logger(handler)
+        try:
+            session.manager = self.build_manager(json.loads(line), logger)
+            results = session.manager.run_commands()
+        except (ValueError, ValidationError) as exc:
+            session.send("error", error="ValueError", message=str(exc))
+        except COMMAND_ERRORS as exc:
+            session.send("error", error=type(exc).__name__, message=str(exc))
+        except Exception as exc:
+            self.logger.exception(f"Daemon batch failed: {exc}")
+            session.send("error", error=type(exc).__name__, message=str(exc))
+        else:
+            for result in results:
+                session.send("result", result=result.to_dict())
+        session.send("done")
+
+    def batch_logger(self, handler: logging.Handler) -> logging.Logger:
+        # Not registered with logging.getLogger, so it is dropped with the batch; records
+        # still propagate to the daemon's own logger and its handlers
+        logger = logging.Logger("grpy.daemon.batch")
+        logger.parent = self.logger.logger if isinstance(self.logger, LogManager) else self.logger
+        logger.addHandler(handler)
+        return logger
+
+    def build_manager(self, request: Dict[str, Any], logger: logging.Logger) -> CommandManager:
+        if not isinstance(request, dict) or "cmds" not in request:
+            raise ValueError("Daemon request must be an object with a 'cmds' list")
+        unknown = sorted(set(request) - CLIENT_OPTIONS - {"cmds"})
+        if unknown:
+            raise ValueError(f"Unsupported daemon options: {', '.join(unknown)}")
+
+        data: Dict[str, Any] = {**request, "logger": logger}
+        if self.cmd_whitelist is not None:
+            data["cmd_whitelist"] = self.cmd_whitelist
+        return CommandManager(**data)
+
+    def __enter__(self) -> "CommandDaemon":
+        self.start()
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.close()
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description="Run grpy command batches for DaemonClient")
+    parser.add_argument("socket", help="Path of the Unix domain socket to listen on")
+    parser.add_argument(
+        "--allow", action="append", help="Permitted command (repeatable); default whitelist"
+    )
+    args = parser.parse_args(argv)
+    try:
+        CommandDaemon(args.socket, cmd_whitelist=args.allow).serve_forever()
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,246 @@
+import hashlib
+import json
+import logging
+import os
+import tempfile
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from typing import (
+    Annotated,
+    Any,
+    Deque,
+    Dict,
+    List,
+    Optional,
+    Set,
+    Tuple,
+    TypeVar,
+    Union,
+)
+
+from pydantic import BaseModel, ConfigDict, Field, PrivateAttr, model_validator
+
+from .command_manager import CommandManager, CommandType
+from .command_result import CommandResult
+from .command_spec import DEFAULT_WHITELIST
+from .log_manager import LogManager
+
+# Defining a return type for instances of this class
+# This implemention is required to support Python version 3.9 and 3.10
+# Typing includes type Self beginning in version 3.11
+SelfCG = TypeVar("SelfCG", bound="CommandGraph")
+
+Stamp = Dict[str, Any]
+
+# Bytes read per call while hashing input files
+HASH_CHUNK_SIZE = 1024 * 1024
+
+
+class CommandNode(BaseModel):
+    model_config = ConfigDict(strict=True)
+
+    name: Annotated[str, Field(min_length=1)]
+    cmd: Annotated[CommandType, Field(min_length=1)]
+    deps: List[str] = []
+    inputs: List[str] = []
+    outputs: List[str] = []
+
+
+class CommandGraph(BaseModel):
+    """
+    Runs commands as a dependency graph, make-style.
+
+    Nodes start as soon as all of their deps have succeeded, up to max_workers at once, so
+    independent branches run concurrently. A node is skipped as up to date when it declares
+    inputs, none of its deps ran, every declared output exists, and its argv and input
+    fingerprints match the stamp recorded after its last successful run. Fingerprints are
+    stat-based (mtime and size) unless hash_inputs is set. Stamps are kept in stamp_file.
+    When a node fails, its dependents are not run; other branches finish and the first
+    failure is raised at the end.
+    """
+
+    model_config = ConfigDict(strict=True, arbitrary_types_allowed=True)
+
+    nodes: Annotated[List[CommandNode], Field(min_length=1)]
+    timeout: Optional[float] = Field(default=2.0, gt=0, description="Command timeout in seconds")
+    logger: Union[LogManager, logging.Logger] = Field(default_factory=LogManager.current)
+    max_workers: Optional[int] = Field(default=None, gt=0)
+    cmd_whitelist: List[str] = Field(default_factory=lambda: list(DEFAULT_WHITELIST))
+    stamp_file: str = ".grpy-stamps.json"
+    hash_inputs: bool = False
+
+    _manager: CommandManager = PrivateAttr()
+    _commands: Dict[str, CommandType] = PrivateAttr(default_factory=dict)
+    _dependents: Dict[str, List[str]] = PrivateAttr(default_factory=dict)
+
+    @model_validator(mode="after")
+    def validate_graph(self) -> SelfCG:
+        names = [node.name for node in self.nodes]
+        duplicates = sorted({name for name in names if names.count(name) > 1})
+        if duplicates:
+            raise ValueError(f"Duplicate command names: {', '.join(duplicates)}")
+
+        self._dependents = {name: [] for name in names}
+        for node in self.nodes:
+            for dep in node.deps:
+                if dep not in self._dependents:
+                    raise ValueError(f"Command '{node.name}' depends on unknown command '{dep}'")
+                self._dependents[dep].append(node.name)
+        self._check_acyclic()
+
+        self._manager = CommandManager(
+            cmds=[node.cmd for node in self.nodes],
+            timeout=self.timeout,
+            logger=self.logger,
+            cmd_whitelist=self.cmd_whitelist,
+        )
+        self._commands = dict(zip(names, self._manager.cmds))
+        return self
+
+    def run(self) -> Dict[str, Optional[CommandResult]]:
+        """Run the graph; returns each node's result, or None for nodes that were skipped."""
+        state = _GraphRun(self, self._load_stamps())
+
+        with ThreadPoolExecutor(
+            max_workers=self.max_workers, thread_name_prefix="grpy-graph"
+        ) as executor:
+            while state.ready or state.running:
+                while state.ready:
+                    state.schedule(state.ready.popleft(), executor)
+                if state.running:
+                    done, _ = wait(state.running, return_when=FIRST_COMPLETED)
+                    for future in done:
+                        state.complete(future)
+
+        self._save_stamps(state.previous_stamps, state.stamps, state.errors)
+        for node in self.nodes:
+            if node.name in state.errors:
+                raise state.errors[node.name]
+        self.logger.info("All commands executed successfully")
+        return state.results
+
+    def _check_acyclic(self) -> None:
+        waiting = {node.name: len(node.deps) for node in self.nodes}
+        ready = [name for name, count in waiting.items() if count == 0]
+        visited = 0
+        while ready:
+            name = ready.pop()
+            visited += 1
+            for dependent in self._dependents[name]:
+                waiting[dependent] -= 1
+                if waiting[dependent] == 0:
+                    ready.append(dependent)
+        if visited != len(self.nodes):
+            cycle = sorted(name for name, count in waiting.items() if count > 0)
+            raise ValueError(f"Command dependencies contain a cycle: {', '.join(cycle)}")
+
+    def _up_to_date(
+        self, node: CommandNode, stamp: Stamp, previous: Optional[Stamp], ran: Set[str]
+    ) -> bool:
+        if not node.inputs or previous != stamp:
+            return False
+        if any(dep in ran for dep in node.deps):
+            return False
+        return all(os.path.exists(path) for path in node.outputs)
+
+    def _stamp(self, name: str, node: CommandNode) -> Stamp:
+        return {
+            "argv": self._commands[name],
+            "inputs": [self._fingerprint(path) for path in node.inputs],
+        }
+
+    def _fingerprint(self, path: str) -> List[Any]:
+        try:
+            stat = os.stat(path)
+        except OSError:
+            return [path, None]
+        if self.hash_inputs and os.path.isfile(path):
+            digest = hashlib.sha256()
+            with open(path, "rb") as file:
+                for chunk in iter(lambda: file.read(HASH_CHUNK_SIZE), b""):
+                    digest.update(chunk)
+            return [path, digest.hexdigest()]
+        return [path, stat.st_mtime_ns, stat.st_size]
+
+    def _load_stamps(self) -> Dict[str, Stamp]:
+        try:
+            with open(self.stamp_file) as file:
+                return json.load(file)
+        except FileNotFoundError:
+            return {}
+        except (OSError, ValueError) as exc:
+            self.logger.warning(f"Ignoring unreadable stamp file {self.stamp_file}: {exc}")
+            return {}
+
+    def _save_stamps(
+        self,
+        previous: Dict[str, Stamp],
+        stamps: Dict[str, Stamp],
+        errors: Dict[str, BaseException],
+    ) -> None:
+        merged = {name: stamp for name, stamp in previous.items() if name not in errors}
+        merged.update(stamps)
+        directory = os.path.dirname(os.path.abspath(self.stamp_file))
+        fd, tmp_path = tempfile.mkstemp(dir=directory, suffix=".tmp")
+        try:
+            with open(fd, "w") as file:
+                json.dump(merged, file, indent=2, sort_keys=True)
+            os.replace(tmp_path, self.stamp_file)
+        except BaseException:
+            os.unlink(tmp_path)
+            raise
+
+
+class _GraphRun:
+    """Bookkeeping for a single CommandGraph.run."""
+
+    def __init__(self, graph: CommandGraph, previous_stamps: Dict[str, Stamp]) -> None:
+        self.graph = graph
+        self.nodes = {node.name: node for node in graph.nodes}
+        self.previous_stamps = previous_stamps
+        self.stamps: Dict[str, Stamp] = {}
+        self.results: Dict[str, Optional[CommandResult]] = {}
+        self.errors: Dict[str, BaseException] = {}
+        self.ran: Set[str] = set()
+        self.blocked: Set[str] = set()
+        self.waiting = {node.name: len(node.deps) for node in graph.nodes}
+        self.ready: Deque[str] = deque(name for name, count in self.waiting.items() if count == 0)
+        self.running: Dict[Future, Tuple[str, Stamp]] = {}
+
+    def schedule(self, name: str, executor: ThreadPoolExecutor) -> None:
+        node = self.nodes[name]
+        if any(dep in self.blocked for dep in node.deps):
+            self.graph.logger.warning(f"Command skipped, dependency failed: {name}")
+            self.blocked.add(name)
+            self.finish(name, None)
+            return
+
+        stamp = self.graph._stamp(name, node)
+        if self.graph._up_to_date(node, stamp, self.previous_stamps.get(name), self.ran):
+            self.graph.logger.info(f"Command up to date: {name}")
+            self.stamps[name] = stamp
+            self.finish(name, None)
+            return
+
+        future = executor.submit(self.graph._manager.run_command, self.graph._commands[name])
+        self.running[future] = (name, stamp)
+
+    def complete(self, future: Future) -> None:
+        name, stamp = self.running.pop(future)
+        try:
+            result = future.result()
+        except Exception as exc:
+            self.errors[name] = exc
+            self.blocked.add(name)
+            result = None
+        else:
+            self.ran.add(name)
+            self.stamps[name] = stamp
+        self.finish(name, result)
+
+    def finish(self, name: str, result: Optional[CommandResult]) -> None:
+        self.results[name] = result
+        for dependent in self.graph._dependents[name]:
+            self.waiting[dependent] -= 1
+            if self.waiting[dependent] == 0:
+                self.ready.append(dependent)
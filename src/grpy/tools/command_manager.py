@@ -1,15 +1,95 @@
+import codecs
+import functools
+import locale
 import logging
-import shlex
-import shutil
-from subprocess import PIPE, Popen, TimeoutExpired
-from typing import Annotated, Callable, List, Optional, TypeVar, Union
+import os
+import selectors
+import threading
+import time
+from collections import deque
+from concurrent.futures import (
+    ALL_COMPLETED,
+    FIRST_EXCEPTION,
+    Future,
+    ThreadPoolExecutor,
+    wait,
+)
+from contextlib import contextmanager
+from subprocess import DEVNULL, PIPE, TimeoutExpired
+from typing import (
+    Annotated,
+    Any,
+    BinaryIO,
+    Callable,
+    Deque,
+    Dict,
+    Generator,
+    Iterator,
+    List,
+    Literal,
+    Optional,
+    Set,
+    Tuple,
+    TypeVar,
+    Union,
+)
 
-from pydantic import BaseModel, ConfigDict, Field, ValidationError, model_validator
+from pydantic import (
+    BaseModel,
+    ConfigDict,
+    Field,
+    PrivateAttr,
+    ValidationError,
+    ValidationInfo,
+    model_validator,
+)
 
-from .log_manager import LogManager
+from .command_result import CommandResult
+from .command_spec import DEFAULT_WHITELIST, CommandSpec
+from .coprocess import CoProcessPool, Protocol
+from .log_manager import LogManager, log_lazy
+from .process import Popen
+from .result_cache import ResultCache
+from .spooled_output import (
+    SpoolConfig,
+    SpooledOutput,
+    create_spool,
+    read_spool,
+    remove_spool,
+)
 
 CommandType = List[str]
 CommandListType = List[CommandType]
+# Receives the stream name ("stdout" or "stderr") and one line of output
+OutputCallback = Callable[[str, str], None]
+
+# Bytes read from a pipe per syscall while streaming; also the longest partial line
+# held in memory before it is handed out as a chunk
+STREAM_CHUNK_SIZE = 64 * 1024
+# Bytes read from the end of a spooled stderr file for the failure message
+SPOOL_ERROR_TAIL = 4 * 1024
+
+# What a batch does when one of its commands fails
+FAILURE_POLICY = Literal["fail_fast", "continue", "retry"]
+# Errors a failing command raises; anything else propagates immediately
+COMMAND_ERRORS = (RuntimeError, TimeoutExpired)
+
+
+class CommandBatchError(RuntimeError):
+    """
+    Raised by run_commands when commands failed under failure_policy "continue" or "retry".
+
+    The message is that of the first failure in cmds order. results has one entry per
+    command, its CommandResult or None if it failed, and errors maps the index in cmds of
+    each failed command to its exception, so the outcome of every command is available.
+    """
+
+    def __init__(
+        self, results: List[Optional[CommandResult]], errors: Dict[int, BaseException]
+    ) -> None:
+        super().__init__(str(errors[min(errors)]))
+        self.results = results
+        self.errors = errors
 
 
 T = TypeVar("T")
@@ -23,15 +103,48 @@ class CommandManager(BaseModel):
     model_config = ConfigDict(strict=True, arbitrary_types_allowed=True)
     cmds: Annotated[CommandListType, Field(min_length=1)]
     timeout: Optional[float] = Field(default=2.0, gt=0, description="Command timeout in seconds")
-    logger: Union[LogManager, logging.Logger] = Field(default_factory=LogManager)
+    logger: Union[LogManager, logging.Logger] = Field(default_factory=LogManager.current)
+    parallel: bool = False
+    max_workers: Optional[int] = Field(
+        default=None, gt=0, description="Maximum concurrent commands when running in parallel"
+    )
+    stream_output: bool = False
+    on_output: Optional[OutputCallback] = Field(default=None, exclude=True)
+    tail_lines: int = Field(
+        default=20, gt=0, description="Output lines kept for error reporting when streaming"
+    )
+    spool: Optional[SpoolConfig] = None
+    # Streamed runs bypass the cache, since a hit would never reach on_output
+    result_cache: Optional[ResultCache] = Field(default=None, exclude=True)
+    failure_policy: FAILURE_POLICY = "fail_fast"
+    max_retries: int = Field(
+        default=3, ge=0, description="Extra attempts per command with failure_policy='retry'"
+    )
+    retry_backoff: float = Field(
+        default=0.5, ge=0, description="Seconds before the first retry, doubled on each one"
+    )
+    # A command in its own process group is no longer in the terminal's foreground group,
+    # so it cannot prompt on /dev/tty (git credentials, ssh host keys) without being stopped
+    new_process_group: bool = Field(
+        default=False, description="Start each command in its own process group"
+    )
 
     # TODO: add pydantic field support, exclude=True
-    cmd_whitelist: List[str] = ["git", "python", "pip", "gh"]
+    cmd_whitelist: List[str] = Field(default_factory=lambda: list(DEFAULT_WHITELIST))
 
-    def __init__(self, **data) -> None:
-        super().__init__(**data)
+    # Absolute paths resolved during validation, handed to Popen so PATH is not searched twice
+    _executables: Dict[str, str] = PrivateAttr(default_factory=dict)
+    # Processes currently running, so cancel() can reach them from another thread
+    _running: Set[Popen] = PrivateAttr(default_factory=set)
+    _running_lock: threading.Lock = PrivateAttr(default_factory=threading.Lock)
+    # Set by cancel() while a batch is running, and cleared when the batch ends, so direct
+    # run_command() calls afterwards are unaffected
+    _cancelled: threading.Event = PrivateAttr(default_factory=threading.Event)
+    _batches: int = PrivateAttr(default=0)
 
     def handle_exception(validator_method: Callable[..., T]) -> Callable[..., T]:
+        # wraps keeps the signature visible, so pydantic still passes ValidationInfo through
+        @functools.wraps(validator_method)
         def wrapper(self, *args, **kwargs):
             try:
                 return validator_method(self, *args, **kwargs)
@@ -43,46 +156,489 @@ class CommandManager(BaseModel):
 
     @model_validator(mode="after")
     @handle_exception
-    def validate_commands(self) -> SelfCM:
-        processed_commands: CommandType = []
-        for cmd in self.cmds:
-            formatted_cmd = shlex.split(cmd[0]) if " " in cmd[0] else cmd
-
-            if shutil.which(formatted_cmd[0]) is None:
-                raise ValueError(f"Command '{formatted_cmd[0]}' not found in system PATH")
-            if formatted_cmd[0] not in self.cmd_whitelist:
-                raise ValueError(
-                    f"Command '{formatted_cmd[0]}' is not in the permitted commands list"
-                )
-
-            processed_commands.append(formatted_cmd)
+    def validate_commands(self, info: ValidationInfo) -> SelfCM:
+        # Specs were already resolved against PATH (see from_specs); only the whitelist
+        # check, a set lookup, is repeated against this manager's whitelist
+        specs: Optional[List[CommandSpec]] = (info.context or {}).get("specs")
+        if specs is None:
+            self.cmds = [self.validate_command(cmd) for cmd in self.cmds]
+            return self
 
-        self.cmds = processed_commands
+        whitelist = set(self.cmd_whitelist)
+        for spec in specs:
+            if spec.program not in whitelist:
+                raise ValueError(f"Command '{spec.program}' is not in the permitted commands list")
+            self._executables[spec.program] = spec.executable
         return self
 
+    @classmethod
+    def from_specs(cls, specs: List[CommandSpec], **data: Any) -> SelfCM:
+        """Build a manager from CommandSpecs without resolving their programs again."""
+        for spec in specs:
+            if not isinstance(spec, CommandSpec):
+                raise TypeError(f"Expected a CommandSpec, got {type(spec).__name__}")
+        cmds = [list(spec.argv) for spec in specs]
+        return cls.model_validate({**data, "cmds": cmds}, context={"specs": specs})
+
+    def validate_command(self, cmd: CommandType) -> CommandType:
+        spec = CommandSpec(cmd, self.cmd_whitelist)
+        self._executables[spec.program] = spec.executable
+        return list(spec.argv)
+
+    def _info(self, build: Callable[[], str], extra: Optional[Dict[str, Any]] = None) -> None:
+        # Messages embed whole command outputs, so they are only built if INFO is enabled
+        log_lazy(self.logger, logging.INFO, build, stacklevel=3, extra=extra)
+
+    def _completed(self, result: CommandResult) -> None:
+        # Structured handlers such as JsonLinesHandler emit the extra fields as-is; skip
+        # building them at all when INFO is disabled
+        logger = self.logger.logger if isinstance(self.logger, LogManager) else self.logger
+        if not logger.isEnabledFor(logging.INFO):
+            return
+        self._info(
+            lambda: f"Command completed successfully: {' '.join(result.argv)}",
+            extra={
+                "argv": result.argv,
+                "returncode": result.returncode,
+                "duration": result.duration,
+            },
+        )
+
+    def executable_for(self, cmd: CommandType) -> Optional[str]:
+        return self._executables.get(cmd[0])
+
+    def open_coprocess(
+        self, cmd: CommandType, protocol: Optional[Protocol] = None, size: int = 1
+    ) -> CoProcessPool:
+        """
+        Validate cmd like any other command and return a pool of long-lived instances of it,
+        e.g. ["git", "cat-file", "--batch"] with GitBatchProtocol. Requests time out after
+        self.timeout unless a timeout is passed to CoProcessPool.request.
+        """
+        formatted_cmd = self.validate_command(cmd)
+        return CoProcessPool(
+            formatted_cmd,
+            executable=self.executable_for(formatted_cmd),
+            protocol=protocol,
+            size=size,
+            timeout=self.timeout,
+            logger=self.logger,
+        )
+
     @handle_exception
-    def run_command(self, cmd: CommandType) -> None:
-        with Popen(cmd, stdout=PIPE, stdin=PIPE, stderr=PIPE, text=True) as process:
-            self.logger.info(f"Executing command: {' '.join(cmd)}")
+    def run_command(self, cmd: CommandType) -> CommandResult:
+        if self.stream_output:
+            return self.run_streaming(cmd)
+        if self.result_cache is None:
+            return self.execute(cmd)
+
+        key = self.result_cache.key(cmd)
+        result = self.result_cache.get(key)
+        if result is not None:
+            self._info(lambda: f"Command result from cache: {' '.join(cmd)}")
+            return result
+
+        result = self.execute(cmd)
+        # Spooled output lives in files the caller closes, so it cannot be shared
+        if not isinstance(result.stdout, SpooledOutput) and not isinstance(
+            result.stderr, SpooledOutput
+        ):
+            self.result_cache.put(key, result)
+        return result
+
+    def execute(self, cmd: CommandType) -> CommandResult:
+        if self.spool is not None:
+            return self.run_spooled(cmd)
+
+        started_at = time.time()
+        with self._spawn(cmd, stdout=PIPE, stdin=PIPE, stderr=PIPE, text=True) as process:
+            self._info(lambda: f"Executing command: {' '.join(cmd)}")
 
             try:
                 stdout, stderr = process.communicate(timeout=self.timeout)
             except (TimeoutExpired, TimeoutError):
-                process.kill()
+                process.kill_group()
                 raise TimeoutExpired(cmd, self.timeout)
+            result = CommandResult.from_process(
+                cmd, process, started_at, time.time(), stdout, stderr
+            )
 
             if stdout:
-                self.logger.info(f"Command output:\n{stdout.strip()}")
+                self._info(lambda: f"Command output: {' '.join(cmd)}\n{stdout.strip()}")
 
             if process.returncode == 0:
-                self.logger.info(f"Command completed successfully: {' '.join(cmd)}")
+                self._completed(result)
             else:
-                process.kill()
+                process.kill_group()
                 error_msg = stderr.strip() if stderr else "No error message provided"
                 raise RuntimeError(f"Command failed: {' '.join(cmd)}\nError: {error_msg}")
 
+            return result
+
+    @contextmanager
+    def _spawn(self, cmd: CommandType, **kwargs: Any) -> Iterator[Popen]:
+        with Popen(
+            cmd,
+            executable=self.executable_for(cmd),
+            new_process_group=self.new_process_group,
+            **kwargs,
+        ) as process:
+            with self._running_lock:
+                self._running.add(process)
+            try:
+                # cancel() may have run between the check in run_with_policy and the spawn
+                if self._cancelled.is_set():
+                    process.kill_group()
+                yield process
+            except BaseException:
+                # A child in its own group never saw a terminal Ctrl-C, and Popen.__exit__
+                # does not wait on KeyboardInterrupt; don't leave it running
+                if process.poll() is None:
+                    process.kill_group()
+                    process.wait()
+                raise
+            finally:
+                with self._running_lock:
+                    self._running.discard(process)
+
+    def run_streaming(self, cmd: CommandType) -> CommandResult:
+        on_output = self.on_output
+        if on_output is None:
+            label = " ".join(cmd)
+
+            def on_output(stream: str, line: str) -> None:
+                self._info(lambda: f"Command {stream}: {label} | {line}")
+
+        lines = self.stream_command(cmd)
+        while True:
+            try:
+                stream, line = next(lines)
+            except StopIteration as stop:
+                return stop.value
+            on_output(stream, line)
+
+    def stream_command(self, cmd: CommandType) -> Generator[Tuple[str, str], None, CommandResult]:
+        """
+        Run cmd and yield (stream, line) pairs as output arrives on stdout and stderr.
+        The generator returns the CommandResult once the command has completed.
+
+        Both pipes are multiplexed with a selector so neither can fill up and deadlock the
+        child. Only the last tail_lines lines of stderr are retained, for the error raised
+        when the command fails. Lines longer than STREAM_CHUNK_SIZE are yielded in
+        chunks. Closing the generator early kills the command.
+        """
+        started_at = time.time()
+        with self._spawn(cmd, stdout=PIPE, stdin=PIPE, stderr=PIPE) as process:
+            self._info(lambda: f"Executing command: {' '.join(cmd)}")
+            process.stdin.close()
+            deadline = None if self.timeout is None else time.monotonic() + self.timeout
+            stderr_tail: Deque[str] = deque(maxlen=self.tail_lines)
+            byte_counts = {"stdout": 0, "stderr": 0}
+
+            try:
+                for stream, line in self._read_pipes(process, deadline, byte_counts):
+                    if stream == "stderr":
+                        stderr_tail.append(line)
+                    yield stream, line
+                process.wait(timeout=self._remaining(deadline))
+            except (TimeoutExpired, TimeoutError):
+                process.kill_group()
+                raise TimeoutExpired(cmd, self.timeout)
+            finally:
+                if process.poll() is None:
+                    process.kill_group()
+
+            if process.returncode != 0:
+                error_msg = "\n".join(stderr_tail).strip() or "No error message provided"
+                raise RuntimeError(f"Command failed: {' '.join(cmd)}\nError: {error_msg}")
+
+            result = CommandResult.from_process(
+                cmd,
+                process,
+                started_at,
+                time.time(),
+                stdout_bytes=byte_counts["stdout"],
+                stderr_bytes=byte_counts["stderr"],
+            )
+            self._completed(result)
+            return result
+
+    @staticmethod
+    def _remaining(deadline: Optional[float]) -> Optional[float]:
+        """Seconds left until deadline, or None when there is no deadline."""
+        return None if deadline is None else max(deadline - time.monotonic(), 0)
+
+    @classmethod
+    def _read_pipes(
+        cls, process: Popen, deadline: Optional[float], byte_counts: Dict[str, int]
+    ) -> Iterator[Tuple[str, str]]:
+        encoding = locale.getpreferredencoding(False)
+        pending: Dict[str, str] = {}
+        decoders = {}
+
+        with selectors.DefaultSelector() as selector:
+            for stream in ("stdout", "stderr"):
+                selector.register(getattr(process, stream), selectors.EVENT_READ, stream)
+                pending[stream] = ""
+                decoders[stream] = codecs.getincrementaldecoder(encoding)(errors="replace")
+
+            while selector.get_map():
+                remaining = cls._remaining(deadline)
+                if remaining == 0:
+                    raise TimeoutExpired(process.args, 0)
+
+                for key, _ in selector.select(remaining):
+                    stream = key.data
+                    chunk = os.read(key.fd, STREAM_CHUNK_SIZE)
+                    byte_counts[stream] += len(chunk)
+                    if not chunk:
+                        selector.unregister(key.fileobj)
+                        rest = pending[stream] + decoders[stream].decode(b"", final=True)
+                        if rest:
+                            yield stream, rest
+                        continue
+
+                    lines = (pending[stream] + decoders[stream].decode(chunk)).split("\n")
+                    pending[stream] = lines.pop()
+                    for line in lines:
+                        yield stream, line.rstrip("\r")
+                    if len(pending[stream]) >= STREAM_CHUNK_SIZE:
+                        yield stream, pending[stream]
+                        pending[stream] = ""
+
+    def run_spooled(self, cmd: CommandType) -> CommandResult:
+        """
+        Run cmd with stdout and stderr redirected into temporary files, per self.spool.
+
+        Small outputs come back as text like run_command; outputs above the memory threshold
+        are returned as SpooledOutput objects which the caller must close.
+        """
+        config = self.spool
+        spools = [create_spool(config, "stdout"), create_spool(config, "stderr")]
+        (stdout_file, _), (stderr_file, _) = spools
+
+        try:
+            started_at = time.time()
+            with self._spawn(cmd, stdout=stdout_file, stdin=DEVNULL, stderr=stderr_file) as process:
+                self._info(lambda: f"Executing command: {' '.join(cmd)}")
+                self._wait_spooled(process, cmd, config, (stdout_file, stderr_file))
+            ended_at = time.time()
+
+            sizes = [os.fstat(file.fileno()).st_size for file, _ in spools]
+            outputs = [
+                self._collect_spool(cmd, config, file, path, size)
+                for (file, path), size in zip(spools, sizes)
+            ]
+        except BaseException:
+            for file, path in spools:
+                file.close()
+                remove_spool(path)
+            raise
+
+        stdout, stderr = outputs
+        if isinstance(stdout, SpooledOutput):
+            self._info(
+                lambda: f"Command output: {' '.join(cmd)} spooled to {stdout.path} "
+                f"({stdout.size} bytes)"
+            )
+        elif stdout:
+            self._info(lambda: f"Command output: {' '.join(cmd)}\n{stdout.strip()}")
+
+        if process.returncode != 0:
+            error = stderr.tail(SPOOL_ERROR_TAIL) if isinstance(stderr, SpooledOutput) else stderr
+            for output in outputs:
+                if isinstance(output, SpooledOutput):
+                    output.close()
+            error_msg = self._decode(error).strip() if error else "No error message provided"
+            raise RuntimeError(f"Command failed: {' '.join(cmd)}\nError: {error_msg}")
+
+        result = CommandResult.from_process(
+            cmd,
+            process,
+            started_at,
+            ended_at,
+            stdout,
+            stderr,
+            stdout_bytes=sizes[0],
+            stderr_bytes=sizes[1],
+        )
+        self._completed(result)
+        return result
+
+    def _wait_spooled(
+        self, process: Popen, cmd: CommandType, config: SpoolConfig, files: Tuple[BinaryIO, ...]
+    ) -> None:
+        deadline = None if self.timeout is None else time.monotonic() + self.timeout
+        # Only aborting needs to watch the files while the command runs; truncation happens
+        # once it has finished
+        watch = config.max_bytes is not None and config.on_limit == "abort"
+        while True:
+            remaining = self._remaining(deadline)
+            if watch:
+                remaining = (
+                    config.poll_interval
+                    if remaining is None
+                    else min(remaining, config.poll_interval)
+                )
+            try:
+                process.wait(timeout=remaining)
+                return
+            except TimeoutExpired:
+                pass
+
+            if watch and any(os.fstat(f.fileno()).st_size > config.max_bytes for f in files):
+                process.kill_group()
+                raise RuntimeError(
+                    f"Command aborted: {' '.join(cmd)}\n"
+                    f"Error: output exceeded {config.max_bytes} bytes"
+                )
+            if deadline is not None and time.monotonic() >= deadline:
+                process.kill_group()
+                raise TimeoutExpired(cmd, self.timeout)
+
+    def _collect_spool(
+        self, cmd: CommandType, config: SpoolConfig, file: BinaryIO, path: str, size: int
+    ) -> Union[str, SpooledOutput]:
+        truncated = config.max_bytes is not None and size > config.max_bytes
+        if truncated:
+            os.ftruncate(file.fileno(), config.max_bytes)
+            self.logger.warning(
+                f"Command output truncated: {' '.join(cmd)} ({size} > {config.max_bytes} bytes)"
+            )
+            size = config.max_bytes
+
+        if size > config.memory_threshold:
+            return SpooledOutput(file, path, size, truncated)
+
+        data = read_spool(file, size)
+        file.close()
+        remove_spool(path)
+        return self._decode(data)
+
+    @staticmethod
+    def _decode(data: Union[str, bytes]) -> str:
+        if isinstance(data, str):
+            return data
+        return data.decode(locale.getpreferredencoding(False), errors="replace")
+
     @handle_exception
-    def run_commands(self) -> None:
-        for cmd in self.cmds:
-            self.run_command(cmd)
+    def run_commands(self) -> List[CommandResult]:
+        """
+        Run every command, sequentially or in parallel, according to failure_policy:
+
+        fail_fast: stop at the first failure. In parallel, queued commands are dropped and
+            running ones are killed, with their process groups if new_process_group is set.
+        continue: run everything, then raise CommandBatchError, which carries the result
+            or error of every command and the message of the first failure in cmds order.
+        retry: retry each failing command up to max_retries times with exponential backoff,
+            then behave like continue.
+        """
+        with self._running_lock:
+            self._batches += 1
+        try:
+            results = self.run_parallel() if self.parallel else self.run_sequential()
+        finally:
+            with self._running_lock:
+                self._batches -= 1
+                if not self._batches:
+                    self._cancelled.clear()
         self.logger.info("All commands executed successfully")
+        return results
+
+    def run_sequential(self) -> List[CommandResult]:
+        results: List[Optional[CommandResult]] = []
+        errors: Dict[int, BaseException] = {}
+        for index, cmd in enumerate(self.cmds):
+            try:
+                results.append(self.run_with_policy(cmd))
+            except COMMAND_ERRORS as exc:
+                self.logger.error(str(exc))
+                if self.failure_policy == "fail_fast":
+                    raise
+                results.append(None)
+                errors[index] = exc
+        if errors:
+            self._raise_failures(results, errors)
+        return results
+
+    def run_parallel(self) -> List[CommandResult]:
+        fail_fast = self.failure_policy == "fail_fast"
+        with ThreadPoolExecutor(
+            max_workers=self.max_workers, thread_name_prefix="grpy-cmd"
+        ) as executor:
+            futures = [executor.submit(self.run_with_policy, cmd) for cmd in self.cmds]
+            done, pending = wait(
+                futures, return_when=FIRST_EXCEPTION if fail_fast else ALL_COMPLETED
+            )
+            if pending:
+                for future in pending:
+                    future.cancel()
+                self.cancel()
+
+        # After a fail-fast cancellation only the commands that had already finished count;
+        # siblings killed by the cancellation did not fail on their own
+        errors = {
+            index: exc
+            for index, exc in enumerate(
+                self._error(future) if future in done else None for future in futures
+            )
+            if exc
+        }
+        for exc in list(errors.values())[:1] if fail_fast else errors.values():
+            self.logger.error(str(exc))
+        if errors:
+            self._raise_failures(
+                [
+                    future.result() if future in done and index not in errors else None
+                    for index, future in enumerate(futures)
+                ],
+                errors,
+            )
+        return [future.result() for future in futures]
+
+    @staticmethod
+    def _error(future: Future) -> Optional[BaseException]:
+        return None if future.cancelled() else future.exception()
+
+    def _raise_failures(
+        self, results: List[Optional[CommandResult]], errors: Dict[int, BaseException]
+    ) -> None:
+        first = errors[min(errors)]
+        # Anything other than a command failure is a bug, and is never folded into the batch
+        if self.failure_policy == "fail_fast" or not all(
+            isinstance(exc, COMMAND_ERRORS) for exc in errors.values()
+        ):
+            raise first
+        raise CommandBatchError(results, errors) from first
+
+    def run_with_policy(self, cmd: CommandType) -> CommandResult:
+        attempts = self.max_retries + 1 if self.failure_policy == "retry" else 1
+        delay = self.retry_backoff
+        for attempt in range(1, attempts + 1):
+            if self._cancelled.is_set():
+                raise RuntimeError(f"Command cancelled: {' '.join(cmd)}")
+            try:
+                return self.run_command(cmd)
+            except COMMAND_ERRORS as exc:
+                if attempt == attempts:
+                    raise
+                self.logger.warning(
+                    f"Command failed (attempt {attempt} of {attempts}), retrying in "
+                    f"{delay:g}s: {' '.join(cmd)}\n{exc}"
+                )
+            # Waiting on the event lets cancel() cut the backoff short
+            self._cancelled.wait(delay)
+            delay *= 2
+
+    def cancel(self) -> None:
+        """
+        Stop the batch in progress: commands not yet started are skipped and running ones
+        are killed, with their process groups if new_process_group is set. Safe to call
+        from any thread. The cancellation ends with the batch; later commands run normally.
+        """
+        with self._running_lock:
+            if self._batches:
+                self._cancelled.set()
+            running = list(self._running)
+        for process in running:
+            process.kill_group()
@@ -0,0 +1,148 @@
+import signal
+import tempfile
+import time
+from subprocess import DEVNULL, PIPE, TimeoutExpired
+from typing import IO, List, Optional
+
+from pydantic import model_validator
+
+from .command_manager import CommandManager, SelfCM
+from .command_result import CommandResult
+from .process import Popen
+
+SIGPIPE = getattr(signal, "SIGPIPE", None)
+# CommandManager options that have no meaning for a pipeline, whose stages always run
+# together, once, with their output wired to each other
+PIPELINE_UNSUPPORTED_OPTIONS = (
+    "parallel",
+    "max_workers",
+    "stream_output",
+    "on_output",
+    "spool",
+    "result_cache",
+    "failure_policy",
+    "max_retries",
+    "retry_backoff",
+)
+
+
+class CommandPipeline(CommandManager):
+    """
+    Runs cmds as a single shell-free pipeline, each stage's stdout wired to the next stage's
+    stdin with an OS pipe, e.g. git ls-files | python filter.py.
+
+    Data flows between the processes through the kernel; Python only reads the last stage's
+    stdout. Each stage's stderr goes to its own temporary file so no pipe can fill up and
+    stall the pipeline. timeout applies to the pipeline as a whole. As with pipefail, the
+    first stage (in order) that exits non-zero is reported, except that upstream stages
+    killed by SIGPIPE after a downstream stage stopped reading are not failures. Options
+    that only apply to independent commands are rejected at construction, and cancel()
+    kills every running stage.
+    """
+
+    @model_validator(mode="after")
+    def reject_unsupported_options(self) -> SelfCM:
+        unsupported = [
+            name
+            for name in PIPELINE_UNSUPPORTED_OPTIONS
+            if getattr(self, name) != type(self).model_fields[name].default
+        ]
+        if unsupported:
+            raise ValueError(f"CommandPipeline does not support: {', '.join(unsupported)}")
+        return self
+
+    def run_commands(self) -> List[CommandResult]:
+        label = " | ".join(" ".join(cmd) for cmd in self.cmds)
+        self._info(lambda: f"Executing pipeline: {label}")
+
+        started_at = time.time()
+        deadline = None if self.timeout is None else time.monotonic() + self.timeout
+        processes: List[Popen] = []
+        stderr_files: List[IO[bytes]] = []
+        try:
+            self._start(processes, stderr_files)
+            stdout = self._wait(processes, deadline)
+            ended_at = time.time()
+            stderrs = [self._read_stderr(file) for file in stderr_files]
+        finally:
+            for process in processes:
+                if process.poll() is None:
+                    process.kill_group()
+                    process.wait()
+            with self._running_lock:
+                self._running.difference_update(processes)
+            for file in stderr_files:
+                file.close()
+
+        results = [
+            CommandResult.from_process(
+                cmd,
+                process,
+                started_at,
+                ended_at,
+                stdout if index == len(processes) - 1 else None,
+                stderr,
+            )
+            for index, (cmd, process, stderr) in enumerate(zip(self.cmds, processes, stderrs))
+        ]
+
+        failed = self._failed_stage(processes)
+        if failed is not None:
+            error_msg = stderrs[failed].strip() or "No error message provided"
+            raise RuntimeError(
+                f"Pipeline failed at stage {failed + 1}: {' '.join(self.cmds[failed])}\n"
+                f"Exit code: {processes[failed].returncode}\nError: {error_msg}"
+            )
+
+        if stdout:
+            self._info(lambda: f"Command output: {label}\n{stdout.strip()}")
+        self._info(lambda: f"Pipeline completed successfully: {label}")
+        return results
+
+    def _start(self, processes: List[Popen], stderr_files: List[IO[bytes]]) -> None:
+        upstream: Optional[IO[bytes]] = None
+        for cmd in self.cmds:
+            stderr_file = tempfile.TemporaryFile()
+            stderr_files.append(stderr_file)
+            process = Popen(
+                cmd,
+                executable=self.executable_for(cmd),
+                stdin=DEVNULL if upstream is None else upstream,
+                stdout=PIPE,
+                stderr=stderr_file,
+                new_process_group=self.new_process_group,
+            )
+            processes.append(process)
+            with self._running_lock:
+                self._running.add(process)
+            if upstream is not None:
+                # Only the downstream stage may hold the read end, so the upstream stage gets
+                # SIGPIPE if it exits early
+                upstream.close()
+            upstream = process.stdout
+
+    def _wait(self, processes: List[Popen], deadline: Optional[float]) -> str:
+        try:
+            stdout, _ = processes[-1].communicate(timeout=self._remaining(deadline))
+            for process in processes[:-1]:
+                process.wait(timeout=self._remaining(deadline))
+        except (TimeoutExpired, TimeoutError):
+            for process in processes:
+                process.kill_group()
+            raise TimeoutExpired(" | ".join(" ".join(cmd) for cmd in self.cmds), self.timeout)
+        return self._decode(stdout)
+
+    def _read_stderr(self, file: IO[bytes]) -> str:
+        file.seek(0)
+        return self._decode(file.read())
+
+    @staticmethod
+    def _failed_stage(processes: List[Popen]) -> Optional[int]:
+        last = len(processes) - 1
+        for index, process in enumerate(processes):
+            if process.returncode == 0:
+                continue
+            if index < last and process.returncode == -SIGPIPE:
+                continue
+            return index
+        return None
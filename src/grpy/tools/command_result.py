@@ -0,0 +1,121 @@
+import sys
+from typing import Any, Dict, List, Optional, Union
+
+from .spooled_output import SpooledOutput
+
+# ru_maxrss is reported in bytes on macOS and in kilobytes everywhere else
+MAX_RSS_SCALE = 1 if sys.platform == "darwin" else 1024
+
+Output = Optional[Union[str, bytes, SpooledOutput]]
+
+
+class CommandResult:
+    """
+    Outcome of a single command run by CommandManager.
+
+    started_at and ended_at are wall-clock epoch seconds. user_time, system_time (seconds) and
+    max_rss (bytes) come from the child's rusage and are None when it was not available.
+    Slotted so that large batches of results stay cheap to hold and aggregate.
+    """
+
+    __slots__ = (
+        "argv",
+        "returncode",
+        "stdout",
+        "stderr",
+        "started_at",
+        "ended_at",
+        "user_time",
+        "system_time",
+        "max_rss",
+        "stdout_bytes",
+        "stderr_bytes",
+    )
+
+    def __init__(
+        self,
+        argv: List[str],
+        returncode: int,
+        stdout: Output = None,
+        stderr: Output = None,
+        started_at: float = 0.0,
+        ended_at: float = 0.0,
+        user_time: Optional[float] = None,
+        system_time: Optional[float] = None,
+        max_rss: Optional[int] = None,
+        stdout_bytes: int = 0,
+        stderr_bytes: int = 0,
+    ) -> None:
+        self.argv = argv
+        self.returncode = returncode
+        self.stdout = stdout
+        self.stderr = stderr
+        self.started_at = started_at
+        self.ended_at = ended_at
+        self.user_time = user_time
+        self.system_time = system_time
+        self.max_rss = max_rss
+        self.stdout_bytes = stdout_bytes
+        self.stderr_bytes = stderr_bytes
+
+    @classmethod
+    def from_process(
+        cls,
+        argv: List[str],
+        process: Any,
+        started_at: float,
+        ended_at: float,
+        stdout: Output = None,
+        stderr: Output = None,
+        stdout_bytes: Optional[int] = None,
+        stderr_bytes: Optional[int] = None,
+    ) -> "CommandResult":
+        result = cls(
+            argv,
+            process.returncode,
+            stdout,
+            stderr,
+            started_at,
+            ended_at,
+            stdout_bytes=byte_count(stdout) if stdout_bytes is None else stdout_bytes,
+            stderr_bytes=byte_count(stderr) if stderr_bytes is None else stderr_bytes,
+        )
+        rusage = getattr(process, "rusage", None)
+        # struct_rusage is a structseq (a tuple subclass); anything else carries no usage data
+        if isinstance(rusage, tuple):
+            result.user_time = rusage.ru_utime
+            result.system_time = rusage.ru_stime
+            result.max_rss = rusage.ru_maxrss * MAX_RSS_SCALE
+        return result
+
+    @property
+    def args(self) -> List[str]:
+        # Keeps results interchangeable with subprocess.CompletedProcess
+        return self.argv
+
+    @property
+    def duration(self) -> float:
+        return self.ended_at - self.started_at
+
+    @property
+    def cpu_time(self) -> Optional[float]:
+        if self.user_time is None or self.system_time is None:
+            return None
+        return self.user_time + self.system_time
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {name: getattr(self, name) for name in self.__slots__}
+
+    def __repr__(self) -> str:
+        return (
+            f"{self.__class__.__name__}(argv={self.argv!r}, returncode={self.returncode}, "
+            f"duration={self.duration:.3f}, max_rss={self.max_rss})"
+        )
+
+
+def byte_count(output: Output) -> int:
+    if output is None:
+        return 0
+    if isinstance(output, str):
+        return len(output.encode(errors="surrogateescape"))
+    return len(output)
@@ -0,0 +1,93 @@
+import shlex
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+from .executable_cache import resolve_executable
+
+DEFAULT_WHITELIST = ("git", "python", "pip", "gh")
+
+
+class CommandSpec:
+    """
+    An argv checked against a whitelist and PATH once, then passed around cheaply.
+
+        specs = CommandSpec.validate_many([["git", "status"], ["git", "fetch"]])
+        managers = [CommandManager.from_specs([spec]) for spec in specs]
+
+    Immutable and slotted, so it costs a fraction of a pydantic model to build and hold,
+    and CommandManager.from_specs reuses its resolved executable, repeating only the
+    whitelist lookup. A single string element is split like a shell would, as
+    CommandManager does.
+    """
+
+    __slots__ = ("argv", "executable")
+
+    argv: Tuple[str, ...]
+    executable: str
+
+    def __init__(
+        self, cmd: Sequence[str], cmd_whitelist: Sequence[str] = DEFAULT_WHITELIST
+    ) -> None:
+        self._validate(self._split(cmd), cmd_whitelist)
+
+    def _validate(
+        self, argv: Tuple[str, ...], cmd_whitelist: Iterable[str], executable: Optional[str] = None
+    ) -> None:
+        program = argv[0]
+        if executable is None:
+            executable = resolve_executable(program)
+            if executable is None:
+                raise ValueError(f"Command '{program}' not found in system PATH")
+        if program not in cmd_whitelist:
+            raise ValueError(f"Command '{program}' is not in the permitted commands list")
+
+        object.__setattr__(self, "argv", argv)
+        object.__setattr__(self, "executable", executable)
+
+    @staticmethod
+    def _split(cmd: Sequence[str]) -> Tuple[str, ...]:
+        return tuple(shlex.split(cmd[0]) if " " in cmd[0] else cmd)
+
+    @classmethod
+    def validate_many(
+        cls, cmds: Iterable[Sequence[str]], cmd_whitelist: Sequence[str] = DEFAULT_WHITELIST
+    ) -> List["CommandSpec"]:
+        """Validate every command in one pass, resolving each distinct program only once."""
+        whitelist = frozenset(cmd_whitelist)
+        executables: Dict[str, str] = {}
+        specs = []
+        for cmd in cmds:
+            spec = cls.__new__(cls)
+            argv = cls._split(cmd)
+            spec._validate(argv, whitelist, executables.get(argv[0]))
+            executables[spec.program] = spec.executable
+            specs.append(spec)
+        return specs
+
+    @classmethod
+    def _resolved(cls, argv: Sequence[str], executable: str) -> "CommandSpec":
+        # For callers that already ran the whitelist and PATH checks, e.g. CommandTemplate
+        spec = cls.__new__(cls)
+        object.__setattr__(spec, "argv", tuple(argv))
+        object.__setattr__(spec, "executable", executable)
+        return spec
+
+    @property
+    def program(self) -> str:
+        return self.argv[0]
+
+    def __setattr__(self, name: str, value: object) -> None:
+        raise AttributeError(f"{self.__class__.__name__} is immutable")
+
+    def __delattr__(self, name: str) -> None:
+        raise AttributeError(f"{self.__class__.__name__} is immutable")
+
+    def __eq__(self, other: object) -> bool:
+        if not isinstance(other, CommandSpec):
+            return NotImplemented
+        return self.argv == other.argv and self.executable == other.executable
+
+    def __hash__(self) -> int:
+        return hash((self.argv, self.executable))
+
+    def __repr__(self) -> str:
+        return f"{self.__class__.__name__}({list(self.argv)!r})"
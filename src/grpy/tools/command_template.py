@@ -0,0 +1,86 @@
+import shlex
+from string import Formatter
+from typing import Any, Iterable, Iterator, List, Mapping, Sequence, Tuple, Union
+
+from .command_manager import CommandManager
+from .command_result import CommandResult
+from .command_spec import DEFAULT_WHITELIST, CommandSpec
+from .executable_cache import resolve_executable
+
+# Slot kinds: a token that is exactly "{name}" is looked up directly, anything else with
+# placeholders goes through str.format_map
+_FIELD = 0
+_FORMAT = 1
+
+
+class CommandTemplate:
+    """
+    A command shape parsed and validated once, then stamped out cheaply for many targets.
+
+        template = CommandTemplate("git -C {repo} fetch --prune")
+        manager = template.manager(({"repo": path} for path in repos), parallel=True)
+
+    The program must be a literal so that the whitelist and PATH checks can run once, up
+    front. Each placeholder is substituted into a single argv element and never re-split,
+    so parameter values cannot inject extra arguments.
+    """
+
+    __slots__ = ("template", "program", "executable", "fields", "_argv", "_slots")
+
+    def __init__(
+        self, template: Union[str, Sequence[str]], cmd_whitelist: Sequence[str] = DEFAULT_WHITELIST
+    ) -> None:
+        tokens = shlex.split(template) if isinstance(template, str) else list(template)
+        if not tokens:
+            raise ValueError("Command template must not be empty")
+
+        self.template = template
+        self.program = tokens[0]
+        if self._placeholders(self.program):
+            raise ValueError(f"Command template program must be literal: '{self.program}'")
+
+        self.executable = resolve_executable(self.program)
+        if self.executable is None:
+            raise ValueError(f"Command '{self.program}' not found in system PATH")
+        if self.program not in cmd_whitelist:
+            raise ValueError(f"Command '{self.program}' is not in the permitted commands list")
+
+        self._argv = tokens
+        slots: List[Tuple[int, int, str]] = []
+        fields = set()
+        for index, token in enumerate(tokens):
+            names = self._placeholders(token)
+            if not names:
+                continue
+            fields.update(names)
+            if len(names) == 1 and token == f"{{{names[0]}}}" and names[0].isidentifier():
+                slots.append((index, _FIELD, names[0]))
+            else:
+                slots.append((index, _FORMAT, token))
+        self.fields = frozenset(fields)
+        self._slots = tuple(slots)
+
+    def render(self, params: Mapping[str, Any]) -> List[str]:
+        argv = self._argv.copy()
+        for index, kind, value in self._slots:
+            argv[index] = str(params[value]) if kind == _FIELD else value.format_map(params)
+        return argv
+
+    def render_many(self, params: Iterable[Mapping[str, Any]]) -> Iterator[List[str]]:
+        render = self.render
+        return (render(item) for item in params)
+
+    def manager(self, params: Iterable[Mapping[str, Any]], **data: Any) -> CommandManager:
+        """Build a CommandManager for every parameter set without re-validating each argv."""
+        specs = [CommandSpec._resolved(argv, self.executable) for argv in self.render_many(params)]
+        return CommandManager.from_specs(specs, **data)
+
+    def run(self, params: Iterable[Mapping[str, Any]], **data: Any) -> List[CommandResult]:
+        return self.manager(params, **data).run_commands()
+
+    @staticmethod
+    def _placeholders(token: str) -> List[str]:
+        return [field for _, field, _, _ in Formatter().parse(token) if field is not None]
+
+    def __repr__(self) -> str:
+        return f"{self.__class__.__name__}({self.template!r})"
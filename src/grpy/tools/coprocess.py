@@ -0,0 +1,251 @@
+import logging
+import os
+import queue
+import selectors
+import threading
+import time
+from subprocess import DEVNULL, PIPE, TimeoutExpired
+from typing import Any, List, NamedTuple, Optional, Union
+
+from .log_manager import LogManager
+from .process import Popen
+
+# Bytes requested from the co-process stdout per read
+READ_CHUNK_SIZE = 64 * 1024
+
+
+class PipeReader:
+    """Buffered reader over a pipe descriptor where every read honours a deadline."""
+
+    def __init__(self, fd: int) -> None:
+        self._fd = fd
+        self._buffer = bytearray()
+        self._selector = selectors.DefaultSelector()
+        self._selector.register(fd, selectors.EVENT_READ)
+
+    def readline(self, deadline: Optional[float]) -> bytes:
+        while True:
+            end = self._buffer.find(b"\n")
+            if end >= 0:
+                return self._take(end + 1)
+            self._fill(deadline)
+
+    def read_exact(self, size: int, deadline: Optional[float]) -> bytes:
+        while len(self._buffer) < size:
+            self._fill(deadline)
+        return self._take(size)
+
+    def close(self) -> None:
+        self._selector.close()
+
+    def _take(self, size: int) -> bytes:
+        data = bytes(self._buffer[:size])
+        del self._buffer[:size]
+        return data
+
+    def _fill(self, deadline: Optional[float]) -> None:
+        remaining = None if deadline is None else deadline - time.monotonic()
+        if (remaining is not None and remaining <= 0) or not self._selector.select(remaining):
+            raise TimeoutError("Timed out waiting for co-process response")
+        chunk = os.read(self._fd, READ_CHUNK_SIZE)
+        if not chunk:
+            raise EOFError("Co-process closed its output")
+        self._buffer += chunk
+
+
+class PipeWriter:
+    """Writer over a non-blocking pipe descriptor where every write honours a deadline."""
+
+    def __init__(self, fd: int) -> None:
+        os.set_blocking(fd, False)
+        self._fd = fd
+        self._selector = selectors.DefaultSelector()
+        self._selector.register(fd, selectors.EVENT_WRITE)
+
+    def write(self, data: bytes, deadline: Optional[float]) -> None:
+        view = memoryview(data)
+        while view:
+            try:
+                view = view[os.write(self._fd, view) :]
+            except BlockingIOError:
+                pass
+            if view:
+                self._wait(deadline)
+
+    def close(self) -> None:
+        self._selector.close()
+
+    def _wait(self, deadline: Optional[float]) -> None:
+        # The co-process stopped reading, e.g. because its own stdout is full
+        remaining = None if deadline is None else deadline - time.monotonic()
+        if (remaining is not None and remaining <= 0) or not self._selector.select(remaining):
+            raise TimeoutError("Timed out writing co-process request")
+
+
+class LineProtocol:
+    """One newline-terminated request answered by one newline-terminated response."""
+
+    def encode(self, request: bytes) -> bytes:
+        return request if request.endswith(b"\n") else request + b"\n"
+
+    def read_response(self, reader: PipeReader, deadline: Optional[float]) -> bytes:
+        return reader.readline(deadline)[:-1]
+
+
+class BatchObject(NamedTuple):
+    oid: str
+    type: str
+    size: int
+    content: bytes
+
+
+class GitBatchProtocol(LineProtocol):
+    """Framing used by `git cat-file --batch`: a header line followed by the object body."""
+
+    def read_response(self, reader: PipeReader, deadline: Optional[float]) -> BatchObject:
+        header = reader.readline(deadline)[:-1].decode()
+        fields = header.split()
+        if len(fields) != 3:
+            # "<object> missing" or "<object> ambiguous"
+            return BatchObject(fields[0], fields[-1], 0, b"")
+
+        oid, object_type, size = fields[0], fields[1], int(fields[2])
+        # The body is followed by a single LF
+        content = reader.read_exact(size + 1, deadline)[:-1]
+        return BatchObject(oid, object_type, size, content)
+
+
+Protocol = Union[LineProtocol, GitBatchProtocol]
+
+
+class CoProcess:
+    """A single long-lived command spoken to over stdin/stdout with a request framing."""
+
+    def __init__(self, argv: List[str], executable: Optional[str], protocol: Protocol) -> None:
+        self.argv = argv
+        self.protocol = protocol
+        self.process = Popen(argv, executable=executable, stdin=PIPE, stdout=PIPE, stderr=DEVNULL)
+        self._reader = PipeReader(self.process.stdout.fileno())
+        self._writer = PipeWriter(self.process.stdin.fileno())
+
+    @property
+    def alive(self) -> bool:
+        return self.process.poll() is None
+
+    def request(self, data: bytes, timeout: Optional[float]) -> Any:
+        deadline = None if timeout is None else time.monotonic() + timeout
+        self._writer.write(self.protocol.encode(data), deadline)
+        return self.protocol.read_response(self._reader, deadline)
+
+    def close(self, timeout: float = 1.0) -> None:
+        try:
+            self.process.stdin.close()
+            self.process.wait(timeout=timeout)
+        except (OSError, TimeoutExpired):
+            self.kill()
+        finally:
+            self._reader.close()
+            self._writer.close()
+            self.process.stdout.close()
+
+    def kill(self) -> None:
+        if self.alive:
+            self.process.kill()
+        self.process.wait()
+
+
+class CoProcessPool:
+    """
+    Pool of identical co-processes, so that a request costs a pipe round-trip rather than a
+    process spawn.
+
+    Co-processes are started lazily up to size and reused. One that has exited is restarted
+    when it is next acquired. A request that times out or loses its co-process kills it, since
+    its stream position can no longer be trusted; the next request gets a fresh one.
+    """
+
+    def __init__(
+        self,
+        argv: List[str],
+        executable: Optional[str] = None,
+        protocol: Optional[Protocol] = None,
+        size: int = 1,
+        timeout: Optional[float] = 2.0,
+        logger: Union[LogManager, logging.Logger, None] = None,
+    ) -> None:
+        if size < 1:
+            raise ValueError("Co-process pool size must be at least 1")
+        self.argv = argv
+        self.executable = executable
+        self.protocol = protocol or LineProtocol()
+        self.timeout = timeout
+        self.logger = logger or logging.getLogger(__name__)
+        self.restarts = 0
+        self._closed = False
+        self._lock = threading.Lock()
+        self._processes: List[CoProcess] = []
+        # Free slots; None marks a slot whose co-process has not been started yet
+        self._idle: "queue.LifoQueue[Optional[CoProcess]]" = queue.LifoQueue()
+        for _ in range(size):
+            self._idle.put(None)
+
+    def request(self, data: Union[str, bytes], timeout: Optional[float] = None) -> Any:
+        if isinstance(data, str):
+            data = data.encode()
+        timeout = self.timeout if timeout is None else timeout
+
+        coprocess = self._acquire()
+        try:
+            return coprocess.request(data, timeout)
+        except (TimeoutError, TimeoutExpired):
+            coprocess.kill()
+            raise TimeoutExpired(self.argv, timeout)
+        except (EOFError, BrokenPipeError) as exc:
+            coprocess.kill()
+            raise RuntimeError(
+                f"Co-process failed: {' '.join(self.argv)}\nError: {exc} "
+                f"(exit code {coprocess.process.returncode})"
+            )
+        finally:
+            self._idle.put(coprocess)
+
+    def close(self) -> None:
+        with self._lock:
+            self._closed = True
+            processes, self._processes = self._processes, []
+        for coprocess in processes:
+            coprocess.close()
+
+    def _acquire(self) -> CoProcess:
+        if self._closed:
+            raise RuntimeError("Co-process pool is closed")
+
+        coprocess = self._idle.get()
+        if coprocess is not None and coprocess.alive:
+            return coprocess
+
+        try:
+            if coprocess is not None:
+                self.restarts += 1
+                self.logger.warning(
+                    f"Restarting co-process: {' '.join(self.argv)} "
+                    f"(exit code {coprocess.process.returncode})"
+                )
+                coprocess.close()
+            replacement = CoProcess(self.argv, self.executable, self.protocol)
+        except BaseException:
+            self._idle.put(None)
+            raise
+
+        with self._lock:
+            if coprocess in self._processes:
+                self._processes.remove(coprocess)
+            self._processes.append(replacement)
+        self.logger.info(f"Started co-process: {' '.join(self.argv)}")
+        return replacement
+
+    def __enter__(self) -> "CoProcessPool":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
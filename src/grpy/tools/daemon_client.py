@@ -0,0 +1,51 @@
+import json
+import socket
+from typing import Any, Callable, Dict, List, Optional
+
+# Receives the level name and the formatted message of each log record sent by the daemon
+LogCallback = Callable[[str, str], None]
+
+
+class DaemonClient:
+    """
+    Thin client for a CommandDaemon listening on a Unix domain socket.
+
+        results = DaemonClient("/tmp/grpy.sock").run([["git", "status"]], parallel=True)
+
+    Only the standard library is imported here, so a short-lived script that submits
+    batches to a warm daemon does not pay for pydantic or the command managers. Results
+    come back as CommandResult.to_dict() dictionaries.
+    """
+
+    def __init__(self, path: str, timeout: Optional[float] = None) -> None:
+        self.path = path
+        self.timeout = timeout
+
+    def run(
+        self, cmds: List[List[str]], on_log: Optional[LogCallback] = None, **options: Any
+    ) -> List[Dict[str, Any]]:
+        """
+        Run cmds on the daemon. options are CommandManager fields such as parallel, timeout
+        or failure_policy. Log lines are passed to on_log as they arrive. A rejected batch
+        raises ValueError and a failed one RuntimeError, carrying the daemon's message.
+        """
+        results: List[Dict[str, Any]] = []
+        with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+            sock.settimeout(self.timeout)
+            sock.connect(self.path)
+            sock.sendall(json.dumps({"cmds": cmds, **options}).encode() + b"\n")
+            with sock.makefile("rb") as stream:
+                for line in stream:
+                    message = json.loads(line)
+                    event = message["event"]
+                    if event == "log":
+                        if on_log is not None:
+                            on_log(message["level"], message["message"])
+                    elif event == "result":
+                        results.append(message["result"])
+                    elif event == "error":
+                        error = ValueError if message["error"] == "ValueError" else RuntimeError
+                        raise error(message["message"])
+                    elif event == "done":
+                        return results
+        raise RuntimeError(f"Daemon closed the connection before finishing: {self.path}")
@@ -0,0 +1,70 @@
+import os
+import shutil
+import threading
+import time
+from typing import Dict, Optional, Tuple
+
+PathSignature = Tuple[int, ...]
+
+
+class ExecutableCache:
+    """
+    Process-wide cache of shutil.which lookups keyed on (name, PATH).
+
+    Each entry remembers the mtimes of the PATH directories it was resolved against, so
+    installing or removing an executable (which touches its directory) invalidates it.
+    Those mtimes are re-read at most once every recheck_interval seconds per PATH value;
+    a recheck_interval of 0 stats the PATH directories on every lookup.
+    """
+
+    def __init__(self, recheck_interval: float = 1.0) -> None:
+        self.recheck_interval = recheck_interval
+        self._entries: Dict[Tuple[str, str], Tuple[PathSignature, Optional[str]]] = {}
+        self._signatures: Dict[str, Tuple[float, PathSignature]] = {}
+        self._lock = threading.Lock()
+
+    def resolve(self, name: str, path: Optional[str] = None) -> Optional[str]:
+        search_path = os.environ.get("PATH", os.defpath) if path is None else path
+
+        signature = self._signature(search_path)
+        key = (name, search_path)
+        entry = self._entries.get(key)
+        if entry is not None and entry[0] == signature:
+            return entry[1]
+
+        resolved = shutil.which(name) if path is None else shutil.which(name, path=path)
+        if resolved is not None:
+            resolved = os.path.abspath(resolved)
+        with self._lock:
+            self._entries[key] = (signature, resolved)
+        return resolved
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._signatures.clear()
+
+    def _signature(self, path: str) -> PathSignature:
+        now = time.monotonic()
+        cached = self._signatures.get(path)
+        if cached is not None and now - cached[0] < self.recheck_interval:
+            return cached[1]
+
+        signature = tuple(self._mtime(directory) for directory in path.split(os.pathsep))
+        with self._lock:
+            self._signatures[path] = (now, signature)
+        return signature
+
+    @staticmethod
+    def _mtime(directory: str) -> int:
+        try:
+            return os.stat(directory or os.curdir).st_mtime_ns
+        except OSError:
+            return -1
+
+
+executable_cache = ExecutableCache()
+
+
+def resolve_executable(name: str, path: Optional[str] = None) -> Optional[str]:
+    return executable_cache.resolve(name, path)
@@ -0,0 +1,99 @@
+import json
+import logging
+import time
+from typing import IO, Any, Dict, List, Optional
+
+from .periodic_flush import PeriodicFlush
+
+# Attributes every LogRecord has; anything else on a record came from extra=
+STANDARD_ATTRIBUTES = frozenset(logging.makeLogRecord({}).__dict__) | {"message", "asctime"}
+
+_encoder = json.JSONEncoder(ensure_ascii=False, separators=(",", ":"), default=str)
+_exception_formatter = logging.Formatter()
+
+
+class JsonLinesHandler(logging.StreamHandler):
+    """
+    Writes one JSON object per record, e.g.
+
+        {"ts":1700000000.123456,"level":"INFO","logger":"_custom_logger",
+         "message":"Command completed successfully: git status",
+         "argv":["git","status"],"returncode":0,"duration":0.0123}
+
+    ts is the epoch time in seconds at the clock's full resolution. Fields passed with
+    extra=, such as the argv, returncode and duration CommandManager attaches to completed
+    commands, are added as top-level keys. Lines are buffered and written with a single
+    write once batch_size records are pending or a record at flush_level or above
+    arrives; a background thread writes whatever is pending every flush_interval seconds.
+    """
+
+    def __init__(
+        self,
+        stream: Optional[IO[str]] = None,
+        batch_size: int = 256,
+        flush_interval: float = 1.0,
+        flush_level: int = logging.ERROR,
+    ) -> None:
+        super().__init__(stream)
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.flush_level = flush_level
+        self._buffer: List[str] = []
+        self._last_write = time.monotonic()
+        self._timer = (
+            PeriodicFlush(self._flush_pending, flush_interval, "grpy-json-log-flush")
+            if flush_interval > 0
+            else None
+        )
+
+    def serialize(self, record: logging.LogRecord) -> str:
+        payload: Dict[str, Any] = {
+            "ts": record.created,
+            "level": record.levelname,
+            "logger": record.name,
+            "message": record.getMessage(),
+        }
+        for key, value in record.__dict__.items():
+            if key not in STANDARD_ATTRIBUTES:
+                payload[key] = value
+        if record.exc_info:
+            payload["exc_info"] = _exception_formatter.formatException(record.exc_info)
+        return _encoder.encode(payload)
+
+    def emit(self, record: logging.LogRecord) -> None:
+        try:
+            self._buffer.append(self.serialize(record) + "\n")
+            if (
+                len(self._buffer) >= self.batch_size
+                or record.levelno >= self.flush_level
+                or time.monotonic() - self._last_write >= self.flush_interval
+            ):
+                self._write()
+        except Exception:
+            self.handleError(record)
+
+    def flush(self) -> None:
+        with self.lock:
+            self._write()
+            super().flush()
+
+    def _flush_pending(self) -> None:
+        with self.lock:
+            if self._buffer:
+                self._write()
+                super().flush()
+
+    def close(self) -> None:
+        if self._timer is not None:
+            self._timer.stop()
+        try:
+            self.flush()
+        finally:
+            super().close()
+
+    def _write(self) -> None:
+        if self._buffer:
+            self.stream.write("".join(self._buffer))
+            self._buffer.clear()
+            self.stream.flush()
+        self._last_write = time.monotonic()
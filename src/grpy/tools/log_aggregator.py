@@ -0,0 +1,224 @@
+import json
+import logging
+import os
+import socket
+import socketserver
+import threading
+import weakref
+from collections import deque
+from typing import Any, Deque, Dict, List, Optional
+
+from .unix_socket import remove_stale_socket
+
+_encoder = json.JSONEncoder(separators=(",", ":"), default=str)
+_exception_formatter = logging.Formatter()
+# Senders whose lock may have been held by another thread at fork time
+_senders: "weakref.WeakSet[AggregatingHandler]" = weakref.WeakSet()
+
+
+def record_to_dict(record: logging.LogRecord) -> Dict[str, Any]:
+    """Flatten a record so it can cross a process boundary, like QueueHandler.prepare."""
+    data = dict(record.__dict__)
+    data["msg"] = record.getMessage()
+    data["args"] = None
+    if record.exc_info and not record.exc_text:
+        data["exc_text"] = _exception_formatter.formatException(record.exc_info)
+    data["exc_info"] = None
+    data.pop("message", None)
+    return data
+
+
+class AggregatingHandler(logging.Handler):
+    """
+    Worker-side handler that ships records to a LogAggregator over a Unix socket.
+
+    emit() only appends to a bounded in-memory queue; a background thread sends records
+    in batches of up to batch_size, at least every flush_interval seconds, as one JSON
+    array per line. The worker never waits on the socket or on the aggregator's handlers:
+    when the queue is full, or the aggregator cannot be reached, records are dropped and
+    counted in dropped. The sender thread is restarted after a fork.
+    """
+
+    def __init__(
+        self,
+        address: str,
+        batch_size: int = 256,
+        flush_interval: float = 0.1,
+        queue_size: int = 10000,
+    ) -> None:
+        super().__init__()
+        self.address = address
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.queue_size = queue_size
+        self.dropped = 0
+
+        self._pending: Deque[Dict[str, Any]] = deque()
+        self._condition = threading.Condition()
+        self._in_flight = 0
+        self._closed = False
+        self._socket: Optional[socket.socket] = None
+        self._sender: Optional[threading.Thread] = None
+        self._pid = 0
+        _senders.add(self)
+
+    def emit(self, record: logging.LogRecord) -> None:
+        try:
+            data = record_to_dict(record)
+        except Exception:
+            self.handleError(record)
+            return
+        with self._condition:
+            if self._pid != os.getpid():
+                self._start_sender()
+            if len(self._pending) >= self.queue_size:
+                self.dropped += 1
+                return
+            self._pending.append(data)
+            if len(self._pending) >= self.batch_size:
+                self._condition.notify_all()
+
+    def _after_fork(self) -> None:
+        # The parent still owns, and will send, the records queued before the fork
+        self._condition = threading.Condition()
+        self._pending = deque()
+        self.dropped = 0
+
+    def _start_sender(self) -> None:
+        # A forked child inherits neither the thread nor a usable connection
+        self._pid = os.getpid()
+        self._socket = None
+        self._in_flight = 0
+        self._sender = threading.Thread(target=self._run, name="grpy-log-sender", daemon=True)
+        self._sender.start()
+
+    def _run(self) -> None:
+        while True:
+            with self._condition:
+                if not self._pending and not self._closed:
+                    self._condition.wait(self.flush_interval)
+                if not self._pending:
+                    if self._closed:
+                        return
+                    continue
+                batch = [
+                    self._pending.popleft() for _ in range(min(len(self._pending), self.batch_size))
+                ]
+                self._in_flight = len(batch)
+            self._send(batch)
+            with self._condition:
+                self._in_flight = 0
+                self._condition.notify_all()
+
+    def _send(self, batch: List[Dict[str, Any]]) -> None:
+        try:
+            if self._socket is None:
+                self._socket = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+                self._socket.connect(self.address)
+            self._socket.sendall(_encoder.encode(batch).encode() + b"\n")
+        except OSError:
+            if self._socket is not None:
+                self._socket.close()
+                self._socket = None
+            with self._condition:
+                self.dropped += len(batch)
+
+    def flush(self, timeout: float = 5.0) -> None:
+        """Wait, up to timeout seconds, until every queued record has been sent."""
+        with self._condition:
+            if self._sender is None or self._pid != os.getpid():
+                return
+            self._condition.notify_all()
+            self._condition.wait_for(lambda: not self._pending and not self._in_flight, timeout)
+
+    def close(self) -> None:
+        self.flush()
+        with self._condition:
+            self._closed = True
+            self._condition.notify_all()
+            sender = self._sender if self._pid == os.getpid() else None
+        if sender is not None:
+            sender.join()
+        if self._socket is not None:
+            self._socket.close()
+            self._socket = None
+        super().close()
+
+
+class _AggregatorRequestHandler(socketserver.StreamRequestHandler):
+    server: "_AggregatorServer"
+
+    def handle(self) -> None:
+        for line in self.rfile:
+            for data in json.loads(line):
+                self.server.aggregator.dispatch(logging.makeLogRecord(data))
+
+
+class _AggregatorServer(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+    daemon_threads = True
+
+    def __init__(self, path: str, aggregator: "LogAggregator") -> None:
+        self.aggregator = aggregator
+        super().__init__(path, _AggregatorRequestHandler)
+
+
+class LogAggregator:
+    """
+    Listener that owns the real handlers and receives records from AggregatingHandlers
+    in worker processes over a Unix socket at path.
+
+    Each record is handled whole under the handler's lock, so lines from different
+    workers never interleave or tear. Handler levels are respected. The socket is only
+    accessible to the current user.
+    """
+
+    def __init__(self, path: str, handlers: List[logging.Handler]) -> None:
+        self.path = path
+        self.handlers = handlers
+        self._server: Optional[_AggregatorServer] = None
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self) -> None:
+        remove_stale_socket(self.path)
+        umask = os.umask(0o177)
+        try:
+            self._server = _AggregatorServer(self.path, self)
+        finally:
+            os.umask(umask)
+        self._thread = threading.Thread(
+            target=self._server.serve_forever, name="grpy-log-aggregator", daemon=True
+        )
+        self._thread.start()
+
+    def dispatch(self, record: logging.LogRecord) -> None:
+        for handler in self.handlers:
+            if record.levelno >= handler.level:
+                handler.handle(record)
+
+    def close(self) -> None:
+        if self._server is None:
+            return
+        self._server.shutdown()
+        self._thread.join()
+        self._server.server_close()
+        self._server = None
+        if os.path.exists(self.path):
+            os.unlink(self.path)
+        for handler in self.handlers:
+            handler.flush()
+
+    def __enter__(self) -> "LogAggregator":
+        self.start()
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.close()
+
+
+def _reinit_senders() -> None:
+    for handler in list(_senders):
+        handler._after_fork()
+
+
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_reinit_senders)
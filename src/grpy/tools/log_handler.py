@@ -1,13 +1,22 @@
 import logging
 from typing import Literal
 
-HANDLER_TYPE = Literal["STREAM"]
+from .json_log_handler import JsonLinesHandler
+from .ring_buffer_handler import RingBufferHandler
+from .rotating_file_handler import BufferedRotatingFileHandler
+
+HANDLER_TYPE = Literal["STREAM", "JSON", "FILE", "RING"]
 HANDLER_MAPPING = dict[HANDLER_TYPE, type[logging.Handler]]
 
 
 class LogHandler:
     handler_type: HANDLER_TYPE = "STREAM"
-    handlers: HANDLER_MAPPING = {"STREAM": logging.StreamHandler}
+    handlers: HANDLER_MAPPING = {
+        "STREAM": logging.StreamHandler,
+        "JSON": JsonLinesHandler,
+        "FILE": BufferedRotatingFileHandler,
+        "RING": RingBufferHandler,
+    }
 
     def create(self, handler_type: HANDLER_TYPE = "STREAM") -> logging.Handler:
         return self.handlers[handler_type]()
@@ -1,11 +1,36 @@
+import atexit
 import logging
-from typing import Annotated, Any, TypeVar
+import multiprocessing.util
+import os
+from typing import Annotated, Any, Callable, Dict, Optional, TypeVar, Union
 
 from pydantic import BaseModel, ConfigDict, Field
 
 SelfLM = TypeVar("SelfLM", bound="LogManager")
 
+from .bound_logger import BoundLogger
+from .fast_formatter import FastFormatter
+from .log_aggregator import AggregatingHandler, LogAggregator
 from .log_level import LogLevel
+from .log_metrics import LogMetrics
+from .log_queue import OVERFLOW_POLICY, BoundedQueueHandler, DrainingQueueListener
+from .rate_limit_filter import RateLimitFilter
+
+# Logger methods bound onto each LogManager so calls skip the __getattr__ fallback. Levels
+# and handlers are looked up by the logger on every call, so the bindings never go stale.
+DELEGATED_METHODS = (
+    "debug",
+    "info",
+    "warning",
+    "error",
+    "exception",
+    "critical",
+    "log",
+    "isEnabledFor",
+)
+
+LOG_FORMAT = "%(asctime)s - %(levelname)s - %(message)s"
+DATE_FORMAT = "%Y-%m-%d"
 
 
 class LogManagerSingleton(object):
@@ -28,12 +53,46 @@ class LogManager(BaseModel, LogManagerSingleton):
     handler: Annotated[
         logging.Handler, Field(default_factory=logging.StreamHandler)
     ] = logging.StreamHandler()
+    # In async mode callers only enqueue records; a listener thread writes them to handler
+    async_mode: bool = False
+    queue_size: Annotated[int, Field(gt=0)] = 10000
+    overflow_policy: OVERFLOW_POLICY = "block"
+    # Worker processes send their records to the LogAggregator listening on this socket
+    aggregate_to: Annotated[Optional[str], Field(max_length=108)] = None
+    # Format records with a precompiled FastFormatter instead of logging.Formatter
+    fast_format: bool = False
+    # Count records and time every handler's emit; read with metrics_snapshot()
+    instrument: bool = False
 
     def __init__(self, **data: Any) -> None:
+        # Re-initialising the singleton replaces its state, so stop its background threads
+        # first; a singleton inherited across a fork only has its handlers detached, as
+        # those threads belong to the parent
+        if self.__dict__.get("_pid") == os.getpid():
+            self.remove_rate_limit()
+            self.disable_metrics()
+            self.stop_listener()
+            self.stop_aggregation()
+        else:
+            self.detach_background_handlers()
         super().__init__(**data)
+        object.__setattr__(self, "_pid", os.getpid())
         self.init_logger()
         self.set_level()
         self.init_handler()
+        if self.instrument:
+            self.enable_metrics()
+
+    @classmethod
+    def current(cls) -> "LogManager":
+        """
+        The configured singleton, or a default one if there is none yet. Unlike LogManager(),
+        this does not re-initialise an existing instance back to default settings.
+        """
+        instance = getattr(cls, "instance", None)
+        if instance is not None and instance.__dict__.get("_logger") is not None:
+            return instance
+        return cls()
 
     def set_level(self) -> None:
         self.setLevel(self.log_level.value_int)
@@ -45,28 +104,214 @@ class LogManager(BaseModel, LogManagerSingleton):
         if self.has_handler() and handler is None:
             return
 
-        formatter = logging.Formatter(
-            "%(asctime)s - %(levelname)s - %(message)s",
-            datefmt="%Y-%m-%d",
-        )
-        self.handler.setFormatter(formatter)
+        self.handler.setFormatter(self.formatter())
         self.addHandler(self.handler)
 
     def init_handler(self):
+        if self.aggregate_to is not None:
+            self.start_sending()
+            return
+        if self.async_mode:
+            self.start_listener()
+            return
         if self.has_handler():
             return
         self.add_handler()
 
+    def formatter(self) -> logging.Formatter:
+        if self.fast_format:
+            # Same output as the default formatter: the date format has no sub-second part
+            return FastFormatter(LOG_FORMAT, datefmt=DATE_FORMAT, precision=0)
+        return logging.Formatter(LOG_FORMAT, datefmt=DATE_FORMAT)
+
+    def start_listener(self) -> None:
+        """
+        Route records through a bounded queue drained by a background thread, so callers
+        never wait on handler I/O (unless overflow_policy is "block" and the queue is full).
+        """
+        if self.__dict__.get("_listener") is not None:
+            return
+        self.handler.setFormatter(self.formatter())
+        if self.has_handler():
+            self.removeHandler(self.handler)
+
+        queue_handler = BoundedQueueHandler(self.queue_size, self.overflow_policy)
+        listener = DrainingQueueListener(
+            queue_handler.queue, self.handler, respect_handler_level=True
+        )
+        listener.start()
+        object.__setattr__(self, "_queue_handler", queue_handler)
+        object.__setattr__(self, "_listener", listener)
+        self.addHandler(queue_handler)
+        atexit.register(self.stop_listener)
+
+    def stop_listener(self) -> None:
+        """Write out every queued record and detach the queue. Runs at interpreter exit."""
+        listener: Optional[DrainingQueueListener] = self.__dict__.get("_listener")
+        if listener is None:
+            return
+        atexit.unregister(self.stop_listener)
+        self.removeHandler(self._queue_handler)
+        listener.stop()
+        self.handler.flush()
+        object.__setattr__(self, "_listener", None)
+
+    def start_aggregator(self, path: str) -> LogAggregator:
+        """
+        Listen on the Unix socket at path for records from worker processes created with
+        LogManager(aggregate_to=path), and write them all through this manager's handler.
+        """
+        self.stop_aggregation()
+        self.handler.setFormatter(self.formatter())
+        aggregator = LogAggregator(path, [self.handler])
+        aggregator.start()
+        object.__setattr__(self, "_aggregator", aggregator)
+        atexit.register(self.stop_aggregation)
+        return aggregator
+
+    def start_sending(self) -> None:
+        # Everything goes through the aggregator, including handlers inherited by a fork
+        for handler in list(self.handlers):
+            self.removeHandler(handler)
+        sender = AggregatingHandler(self.aggregate_to)
+        object.__setattr__(self, "_sender", sender)
+        self.addHandler(sender)
+        atexit.register(self.stop_aggregation)
+        # multiprocessing workers exit without running atexit handlers, only finalizers
+        multiprocessing.util.Finalize(None, self.stop_aggregation, exitpriority=0)
+
+    def stop_aggregation(self) -> None:
+        """Send any queued records, then stop the sender and the aggregator, if running."""
+        atexit.unregister(self.stop_aggregation)
+        sender: Optional[AggregatingHandler] = self.__dict__.get("_sender")
+        if sender is not None:
+            self.removeHandler(sender)
+            sender.close()
+            object.__setattr__(self, "_sender", None)
+        aggregator: Optional[LogAggregator] = self.__dict__.get("_aggregator")
+        if aggregator is not None:
+            aggregator.close()
+            object.__setattr__(self, "_aggregator", None)
+
+    def add_rate_limit(
+        self,
+        rate: int = 10,
+        window: float = 1.0,
+        max_keys: int = 1024,
+        collapse: bool = True,
+    ) -> RateLimitFilter:
+        """
+        Cap records per message to rate every window seconds and collapse consecutive
+        duplicates, e.g. a looping command failing over and over. The filter sits on the
+        logger, so suppressed records never reach the handler or the async queue.
+        """
+        self.remove_rate_limit()
+        rate_limit = RateLimitFilter(rate, window, max_keys, collapse).attach(self._logger)
+        object.__setattr__(self, "_rate_limit", rate_limit)
+        return rate_limit
+
+    def remove_rate_limit(self) -> None:
+        """Detach the rate limit filter, first reporting any duplicates it is holding back."""
+        rate_limit: Optional[RateLimitFilter] = self.__dict__.get("_rate_limit")
+        if rate_limit is None:
+            return
+        rate_limit.detach(self._logger)
+        object.__setattr__(self, "_rate_limit", None)
+
+    @property
+    def suppressed_records(self) -> int:
+        """Records held back by the rate limit filter."""
+        rate_limit: Optional[RateLimitFilter] = self.__dict__.get("_rate_limit")
+        return rate_limit.suppressed if rate_limit is not None else 0
+
+    def enable_metrics(self) -> LogMetrics:
+        """
+        Count records per level and logger and record an emit latency histogram for every
+        handler on the logger, plus the handler behind the async queue or the aggregator.
+        """
+        metrics: Optional[LogMetrics] = self.__dict__.get("_metrics")
+        if metrics is None:
+            metrics = LogMetrics()
+            object.__setattr__(self, "_metrics", metrics)
+        for handler in {*self.handlers, self.handler}:
+            metrics.instrument(handler)
+        return metrics
+
+    def disable_metrics(self) -> None:
+        metrics: Optional[LogMetrics] = self.__dict__.get("_metrics")
+        if metrics is None:
+            return
+        metrics.close()
+        object.__setattr__(self, "_metrics", None)
+
+    def metrics_snapshot(self) -> Dict[str, Any]:
+        """Current counters and histograms, or an empty dict when metrics are disabled."""
+        metrics: Optional[LogMetrics] = self.__dict__.get("_metrics")
+        return metrics.snapshot() if metrics is not None else {}
+
+    def detach_background_handlers(self) -> None:
+        for name in ("_queue_handler", "_sender"):
+            handler = self.__dict__.get(name)
+            if handler is not None and self.__dict__.get("_logger") is not None:
+                self.removeHandler(handler)
+
+    @property
+    def dropped_records(self) -> int:
+        """Records discarded by the overflow policy or the aggregation sender."""
+        return sum(
+            handler.dropped
+            for handler in (self.__dict__.get("_queue_handler"), self.__dict__.get("_sender"))
+            if handler is not None
+        )
+
     def init_logger(self):
         self._logger = logging.getLogger(self.log_handle)
+        # Instance attributes are found before __getattr__ is ever consulted
+        self.__dict__.update({name: getattr(self._logger, name) for name in DELEGATED_METHODS})
 
     def __getattr__(self, name: str) -> Any:
+        logger = self.__dict__.get("_logger")
         if name == "_logger":
-            return None
-        if hasattr(self, "_logger") and self._logger is not None:
-            return getattr(self._logger, name)
+            return logger
+        if logger is not None:
+            return getattr(logger, name)
         raise AttributeError(f"'{self.__class__.__name__}' object has no attribute '{name}'")
 
     @property
     def logger(self) -> logging.Logger:
         return self._logger
+
+    def is_enabled(self, level: int) -> bool:
+        # Logger.isEnabledFor caches its answer per level until any level changes
+        return self._logger.isEnabledFor(level)
+
+    def bind(self, **context: Any) -> BoundLogger:
+        """
+        A lightweight adapter that logs through this manager's logger and adds context to
+        every record as extra fields. Cheap enough to create one per command in a loop;
+        the manager itself is neither copied nor re-validated.
+        """
+        return BoundLogger(self._logger, context)
+
+    def log_lazy(
+        self, level: int, build: Callable[[], str], extra: Optional[Dict[str, Any]] = None
+    ) -> None:
+        """Log build() at level, calling it only if a record at level would be handled."""
+        log_lazy(self._logger, level, build, stacklevel=3, extra=extra)
+
+
+def log_lazy(
+    logger: Union[LogManager, logging.Logger],
+    level: int,
+    build: Callable[[], str],
+    stacklevel: int = 2,
+    extra: Optional[Dict[str, Any]] = None,
+) -> None:
+    """
+    Log build() at level on a LogManager or a plain logging.Logger, skipping the call, and
+    so the cost of formatting the message, when the level is disabled.
+    """
+    if isinstance(logger, LogManager):
+        logger = logger.logger
+    if logger.isEnabledFor(level):
+        logger.log(level, build(), stacklevel=stacklevel, extra=extra)
@@ -0,0 +1,165 @@
+import logging
+import logging.handlers
+import threading
+import time
+from array import array
+from bisect import bisect_left
+from typing import Any, Dict
+
+# Upper bounds of the emit latency buckets in nanoseconds; slower emits land in a last,
+# unbounded bucket
+LATENCY_BUCKETS_NS = (
+    1_000,
+    2_500,
+    5_000,
+    10_000,
+    25_000,
+    50_000,
+    100_000,
+    250_000,
+    500_000,
+    1_000_000,
+    2_500_000,
+    5_000_000,
+    10_000_000,
+    25_000_000,
+    50_000_000,
+    100_000_000,
+    250_000_000,
+    500_000_000,
+    1_000_000_000,
+)
+
+# Handler methods that produce a record's output text, wrapped to count bytes emitted
+OUTPUT_METHODS = ("format", "serialize")
+
+
+class HandlerStats:
+    """Emit latency histogram and output size of one handler."""
+
+    __slots__ = ("label", "buckets", "count", "total_ns", "max_ns", "bytes")
+
+    def __init__(self, label: str) -> None:
+        self.label = label
+        self.buckets = array("Q", bytes(8 * (len(LATENCY_BUCKETS_NS) + 1)))
+        self.count = 0
+        self.total_ns = 0
+        self.max_ns = 0
+        self.bytes = 0
+
+    def observe(self, elapsed: int) -> None:
+        self.buckets[bisect_left(LATENCY_BUCKETS_NS, elapsed)] += 1
+        self.count += 1
+        self.total_ns += elapsed
+        if elapsed > self.max_ns:
+            self.max_ns = elapsed
+
+    def snapshot(self) -> Dict[str, Any]:
+        return {
+            "count": self.count,
+            "bytes": self.bytes,
+            "total_ns": self.total_ns,
+            "max_ns": self.max_ns,
+            "bounds_ns": list(LATENCY_BUCKETS_NS),
+            "buckets": self.buckets.tolist(),
+        }
+
+
+class LogMetrics:
+    """
+    Counts records per level and per logger name, and times each instrumented handler's
+    emit into a fixed-bucket HandlerStats histogram.
+
+    Handlers are instrumented by shadowing emit, and format (or serialize), with wrappers
+    on the handler instance; nothing is allocated per record beyond what the wrapped calls
+    do, except to measure non-ASCII output. Records are counted as the first instrumented
+    handler emits them, so records propagated from child loggers, or dispatched by a
+    LogAggregator, are counted too, and a record emitted by several handlers is counted
+    once. Queue handlers are timed but count nothing, as the handler behind the queue
+    counts the same records. Bytes are the encoded size of the text handlers format,
+    without line terminators. Handler emits run under the handler's lock, so their stats
+    need no lock of their own. snapshot() returns plain dicts and lists that can be
+    dumped as JSON.
+    """
+
+    def __init__(self) -> None:
+        self.levels: Dict[str, int] = {}
+        self.loggers: Dict[str, int] = {}
+        self.handlers: Dict[logging.Handler, HandlerStats] = {}
+        self._lock = threading.Lock()
+        # The record each thread counted last; handlers for one record run in one thread
+        self._last = threading.local()
+
+    def count(self, record: logging.LogRecord) -> None:
+        last = self._last
+        if getattr(last, "record", None) is record:
+            return
+        last.record = record
+        with self._lock:
+            self.levels[record.levelname] = self.levels.get(record.levelname, 0) + 1
+            self.loggers[record.name] = self.loggers.get(record.name, 0) + 1
+
+    def instrument(self, handler: logging.Handler) -> None:
+        if handler in self.handlers:
+            return
+        label = handler.get_name() or type(handler).__name__
+        labels = {stats.label for stats in self.handlers.values()}
+        if label in labels:
+            label = f"{label}-{len(self.handlers)}"
+        stats = self.handlers[handler] = HandlerStats(label)
+
+        emit = handler.emit
+        clock = time.perf_counter_ns
+        # Its records are counted, and its output measured, by the handler behind the queue
+        forwards = isinstance(handler, logging.handlers.QueueHandler)
+        count = self.count
+
+        def timed_emit(record: logging.LogRecord) -> None:
+            if not forwards:
+                count(record)
+            start = clock()
+            try:
+                emit(record)
+            finally:
+                stats.observe(clock() - start)
+
+        handler.emit = timed_emit
+        if forwards:
+            return
+        encoding = getattr(handler, "encoding", None) or "utf-8"
+        for name in OUTPUT_METHODS:
+            if hasattr(handler, name):
+                setattr(handler, name, _counting(getattr(handler, name), stats, encoding))
+
+    def uninstrument(self, handler: logging.Handler) -> None:
+        if self.handlers.pop(handler, None) is None:
+            return
+        for name in ("emit",) + OUTPUT_METHODS:
+            handler.__dict__.pop(name, None)
+
+    def close(self) -> None:
+        for handler in list(self.handlers):
+            self.uninstrument(handler)
+
+    def snapshot(self) -> Dict[str, Any]:
+        with self._lock:
+            levels = dict(self.levels)
+            loggers = dict(self.loggers)
+        handlers = {stats.label: stats.snapshot() for stats in list(self.handlers.values())}
+        return {
+            "levels": levels,
+            "loggers": loggers,
+            "records": sum(levels.values()),
+            "bytes": sum(stats["bytes"] for stats in handlers.values()),
+            "handlers": handlers,
+        }
+
+
+def _counting(method: Any, stats: HandlerStats, encoding: str) -> Any:
+    def counted(record: logging.LogRecord) -> str:
+        text = method(record)
+        # ASCII encodes to one byte per character in any encoding a log is likely to use
+        stats.bytes += len(text) if text.isascii() else len(text.encode(encoding, "replace"))
+        return text
+
+    return counted
@@ -0,0 +1,55 @@
+import logging
+import queue
+import threading
+from logging.handlers import QueueHandler, QueueListener
+from typing import Literal
+
+# What a full queue does with a new record: wait for room, evict the oldest queued record,
+# or discard the new one
+OVERFLOW_POLICY = Literal["block", "drop_oldest", "drop_new"]
+
+
+class BoundedQueueHandler(QueueHandler):
+    """
+    QueueHandler over a bounded queue that applies overflow_policy once it is full.
+
+    Records discarded by a drop policy are counted in dropped rather than reported, since
+    reporting them would need the very I/O the queue is there to avoid.
+    """
+
+    def __init__(self, maxsize: int, overflow_policy: OVERFLOW_POLICY = "block") -> None:
+        super().__init__(queue.Queue(maxsize))
+        self.overflow_policy = overflow_policy
+        self.dropped = 0
+        self._dropped_lock = threading.Lock()
+
+    def enqueue(self, record: logging.LogRecord) -> None:
+        if self.overflow_policy == "block":
+            self.queue.put(record)
+            return
+        while True:
+            try:
+                self.queue.put_nowait(record)
+                return
+            except queue.Full:
+                pass
+            if self.overflow_policy == "drop_new":
+                self._count_drop()
+                return
+            try:
+                self.queue.get_nowait()
+            except queue.Empty:
+                # The listener made room in the meantime
+                continue
+            self._count_drop()
+
+    def _count_drop(self) -> None:
+        with self._dropped_lock:
+            self.dropped += 1
+
+
+class DrainingQueueListener(QueueListener):
+    """QueueListener whose stop() waits for room for its sentinel, so a full queue still drains."""
+
+    def enqueue_sentinel(self) -> None:
+        self.queue.put(self._sentinel)
@@ -0,0 +1,36 @@
+import threading
+import weakref
+from typing import Callable, Optional
+
+
+class PeriodicFlush:
+    """
+    Calls a handler's flush method every interval seconds from a daemon thread, so records
+    buffered by a burst are written even if no further record arrives to trigger it.
+
+    Only a weak reference to the method is held; the thread exits once the handler is
+    garbage collected or stop() is called.
+    """
+
+    def __init__(self, flush: Callable[[], None], interval: float, name: str) -> None:
+        self.interval = interval
+        self._flush = weakref.WeakMethod(flush)
+        self._stopped = threading.Event()
+        self._thread: Optional[threading.Thread] = threading.Thread(
+            target=self._run, name=name, daemon=True
+        )
+        self._thread.start()
+
+    def _run(self) -> None:
+        while not self._stopped.wait(self.interval):
+            flush = self._flush()
+            if flush is None:
+                return
+            flush()
+            del flush
+
+    def stop(self) -> None:
+        self._stopped.set()
+        thread, self._thread = self._thread, None
+        if thread is not None and thread is not threading.current_thread():
+            thread.join()
@@ -0,0 +1,67 @@
+import os
+import signal
+import subprocess
+import sys
+from typing import Any, Dict, Optional, Tuple
+
+
+def process_group_options() -> Dict[str, Any]:
+    """
+    Popen keyword arguments that start the child as the leader of a new process group.
+
+    Only the group changes; the child stays in the caller's session, so it keeps its
+    controlling terminal. Empty where process groups are not supported.
+    """
+    if not hasattr(os, "setpgid"):
+        return {}
+    if sys.version_info >= (3, 11):
+        return {"process_group": 0}
+    return {"preexec_fn": os.setpgrp}
+
+
+class Popen(subprocess.Popen):
+    """
+    subprocess.Popen that keeps the child's resource usage when it is reaped.
+
+    Waiting goes through os.wait4 instead of os.waitpid where the platform provides it, and
+    the struct_rusage it returns is stored on rusage. It stays None if the child was reaped
+    by poll(), on platforms without wait4, or if waiting on children is disabled.
+
+    Started with new_process_group=True the child leads its own process group, and
+    kill_group() takes down everything it spawned along with it.
+    """
+
+    rusage: Optional[Any] = None
+
+    def __init__(self, *args: Any, new_process_group: bool = False, **kwargs: Any) -> None:
+        if new_process_group:
+            kwargs.update(process_group_options())
+        self.own_group = (new_process_group or bool(kwargs.get("start_new_session"))) and hasattr(
+            os, "killpg"
+        )
+        super().__init__(*args, **kwargs)
+
+    def kill_group(self) -> None:
+        """Kill the child and, when it leads its own process group, every process in it."""
+        if not self.own_group:
+            self.kill()
+            return
+        try:
+            os.killpg(self.pid, signal.SIGKILL)
+        except ProcessLookupError:
+            pass
+        except PermissionError:
+            # The group id may have been recycled once the whole group exited
+            self.kill()
+
+    if hasattr(os, "wait4"):
+
+        def _try_wait(self, wait_flags: int) -> Tuple[int, int]:
+            try:
+                pid, sts, rusage = os.wait4(self.pid, wait_flags)
+            except ChildProcessError:
+                # Mirrors subprocess: the child is gone and its status is unavailable
+                return self.pid, 0
+            if pid == self.pid:
+                self.rusage = rusage
+            return pid, sts
@@ -0,0 +1,162 @@
+import logging
+import threading
+import time
+from collections import OrderedDict
+from typing import Callable, Hashable, Optional, Tuple, Union
+
+# Longest part of a suppressed message repeated in its summary record
+PREVIEW_LENGTH = 200
+
+
+class _KeyState:
+    __slots__ = ("window_start", "count", "suppressed", "preview")
+
+    def __init__(self, window_start: float, preview: str) -> None:
+        self.window_start = window_start
+        self.count = 0
+        self.suppressed = 0
+        self.preview = preview
+
+
+class RateLimitFilter(logging.Filter):
+    """
+    Caps repeated records and collapses runs of duplicates.
+
+    Records are keyed by logger name, level and message. At most rate records per key
+    pass in any window seconds; the rest are suppressed, and the next record of that key
+    to pass is preceded by a summary of how many were dropped. With collapse, a record
+    identical to the one before it is suppressed, and the run is reported as a single
+    "Last message repeated N times" record when a different record arrives. A run also
+    ends once window seconds pass without a duplicate, so the same record arriving after
+    a quiet period is reported and passes. Only the max_keys most recently seen keys are
+    tracked, so memory stays bounded however many distinct messages go by.
+
+    Summaries are written through the logger or handler the filter was attached to with
+    attach(), bypassing this filter so they are never rate limited themselves.
+    """
+
+    def __init__(
+        self,
+        rate: int = 10,
+        window: float = 1.0,
+        max_keys: int = 1024,
+        collapse: bool = True,
+    ) -> None:
+        super().__init__()
+        self.rate = rate
+        self.window = window
+        self.max_keys = max_keys
+        self.collapse = collapse
+        self.suppressed = 0
+
+        self._keys: "OrderedDict[Hashable, _KeyState]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._last: Optional[Tuple[Hashable, logging.LogRecord]] = None
+        self._repeats = 0
+        self._last_seen = 0.0
+        self._sink: Optional[Callable[[logging.LogRecord], None]] = None
+
+    def attach(self, target: Union[logging.Logger, logging.Handler]) -> "RateLimitFilter":
+        """Add this filter to target, a logger or a handler, and write summaries through it."""
+        if isinstance(target, logging.Logger):
+            self._sink = target.callHandlers
+        else:
+            self._sink = lambda record: self._emit_locked(target, record)
+        target.addFilter(self)
+        return self
+
+    def detach(self, target: Union[logging.Logger, logging.Handler]) -> None:
+        self.flush()
+        target.removeFilter(self)
+        self._sink = None
+
+    @staticmethod
+    def _emit_locked(handler: logging.Handler, record: logging.LogRecord) -> None:
+        # Handler.handle would run this filter again, so take its lock and emit directly
+        with handler.lock:
+            handler.emit(record)
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        message = record.getMessage()
+        key = (record.name, record.levelno, hash(message))
+        now = time.monotonic()
+        summaries = []
+
+        with self._lock:
+            if (
+                self.collapse
+                and self._last is not None
+                and self._last[0] == key
+                and now - self._last_seen < self.window
+            ):
+                self._repeats += 1
+                self.suppressed += 1
+                self._last_seen = now
+                return False
+            if self._repeats:
+                summaries.append(
+                    self._summary(self._last[1], f"Last message repeated {self._repeats} times")
+                )
+            self._last = (key, record)
+            self._repeats = 0
+            self._last_seen = now
+
+            state = self._state(key, message, now)
+            if now - state.window_start >= self.window:
+                if state.suppressed:
+                    summaries.append(
+                        self._summary(
+                            record,
+                            f"Suppressed {state.suppressed} records like: {state.preview}",
+                        )
+                    )
+                state.window_start = now
+                state.count = 0
+                state.suppressed = 0
+            state.count += 1
+            allowed = state.count <= self.rate
+            if not allowed:
+                state.suppressed += 1
+                self.suppressed += 1
+
+        for summary in summaries:
+            self._write(summary)
+        return allowed
+
+    def flush(self) -> None:
+        """Report a run of duplicates that is still open, e.g. before shutting down."""
+        with self._lock:
+            if not self._repeats:
+                return
+            summary = self._summary(self._last[1], f"Last message repeated {self._repeats} times")
+            self._repeats = 0
+            self._last = None
+        self._write(summary)
+
+    def _state(self, key: Hashable, message: str, now: float) -> _KeyState:
+        state = self._keys.get(key)
+        if state is None:
+            state = self._keys[key] = _KeyState(now, message[:PREVIEW_LENGTH])
+            if len(self._keys) > self.max_keys:
+                self._keys.popitem(last=False)
+        else:
+            self._keys.move_to_end(key)
+        return state
+
+    @staticmethod
+    def _summary(record: logging.LogRecord, message: str) -> logging.LogRecord:
+        return logging.makeLogRecord(
+            {
+                "name": record.name,
+                "levelno": record.levelno,
+                "levelname": record.levelname,
+                "msg": message,
+                "pathname": record.pathname,
+                "lineno": record.lineno,
+                "funcName": record.funcName,
+            }
+        )
+
+    def _write(self, record: logging.LogRecord) -> None:
+        if self._sink is not None:
+            self._sink(record)
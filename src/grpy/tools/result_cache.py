@@ -0,0 +1,154 @@
+import hashlib
+import os
+import pickle
+import tempfile
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Hashable, List, Optional, Sequence, Tuple
+
+from .command_result import CommandResult
+
+CacheKey = Tuple[Hashable, ...]
+
+
+class ResultCache:
+    """
+    Memoizes successful CommandResults for read-only commands.
+
+    Entries are keyed on argv, the working directory, the values of env_keys and the stat
+    fingerprints (mtime and size) of input_paths, so touching a declared input invalidates
+    them. Results live in a bounded in-memory LRU and, when directory is set, in a pickle
+    store on disk that survives the process. Entries older than ttl seconds are ignored.
+    The disk store is only as trustworthy as the directory it lives in, since entries are
+    unpickled on read.
+    """
+
+    def __init__(
+        self,
+        maxsize: int = 1024,
+        ttl: Optional[float] = None,
+        directory: Optional[str] = None,
+        env_keys: Sequence[str] = (),
+        input_paths: Sequence[str] = (),
+    ) -> None:
+        if maxsize < 1:
+            raise ValueError("Result cache maxsize must be at least 1")
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.directory = directory
+        self.env_keys = tuple(env_keys)
+        self.input_paths = tuple(input_paths)
+        self.hits = 0
+        self.misses = 0
+        self.disk_hits = 0
+        self._entries: "OrderedDict[CacheKey, Tuple[float, CommandResult]]" = OrderedDict()
+        self._lock = threading.Lock()
+        if directory is not None:
+            os.makedirs(directory, exist_ok=True)
+
+    def key(self, argv: List[str]) -> CacheKey:
+        environ = os.environ
+        return (
+            tuple(argv),
+            os.getcwd(),
+            tuple(environ.get(name) for name in self.env_keys),
+            tuple(self._fingerprint(path) for path in self.input_paths),
+        )
+
+    def get(self, key: CacheKey) -> Optional[CommandResult]:
+        now = time.time()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and not self._expired(entry[0], now):
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return entry[1]
+
+        entry = self._load(key, now) if self.directory is not None else None
+        with self._lock:
+            if entry is None:
+                self._entries.pop(key, None)
+                self.misses += 1
+                return None
+            self.hits += 1
+            self.disk_hits += 1
+            self._remember(key, entry)
+        return entry[1]
+
+    def put(self, key: CacheKey, result: CommandResult) -> None:
+        entry = (time.time(), result)
+        with self._lock:
+            self._remember(key, entry)
+        if self.directory is not None:
+            self._store(key, entry)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self.hits = self.misses = self.disk_hits = 0
+        if self.directory is not None:
+            for name in os.listdir(self.directory):
+                if name.endswith(".pickle"):
+                    os.unlink(os.path.join(self.directory, name))
+
+    def stats(self) -> Dict[str, int]:
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "disk_hits": self.disk_hits,
+            "size": len(self._entries),
+        }
+
+    def _remember(self, key: CacheKey, entry: Tuple[float, CommandResult]) -> None:
+        self._entries[key] = entry
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
+
+    def _expired(self, stored_at: float, now: float) -> bool:
+        return self.ttl is not None and now - stored_at > self.ttl
+
+    def _path(self, key: CacheKey) -> str:
+        digest = hashlib.sha256(repr(key).encode()).hexdigest()
+        return os.path.join(self.directory, f"{digest}.pickle")
+
+    def _load(self, key: CacheKey, now: float) -> Optional[Tuple[float, CommandResult]]:
+        path = self._path(key)
+        try:
+            with open(path, "rb") as file:
+                stored_key, stored_at, result = pickle.load(file)
+        except (OSError, EOFError, pickle.UnpicklingError, ValueError):
+            return None
+        if stored_key != key:
+            return None
+        if self._expired(stored_at, now):
+            self._discard(path)
+            return None
+        return stored_at, result
+
+    def _store(self, key: CacheKey, entry: Tuple[float, CommandResult]) -> None:
+        # Written to a temporary file and renamed so readers never see a partial entry
+        fd, tmp_path = tempfile.mkstemp(dir=self.directory, suffix=".tmp")
+        try:
+            with open(fd, "wb") as file:
+                pickle.dump((key, *entry), file, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(tmp_path, self._path(key))
+        except BaseException:
+            self._discard(tmp_path)
+            raise
+
+    @staticmethod
+    def _discard(path: str) -> None:
+        try:
+            os.unlink(path)
+        except FileNotFoundError:
+            pass
+
+    @staticmethod
+    def _fingerprint(path: str) -> Tuple[Any, ...]:
+        try:
+            stat = os.stat(path)
+        except OSError:
+            return (path, None, None)
+        return (path, stat.st_mtime_ns, stat.st_size)
@@ -0,0 +1,182 @@
+import logging
+import mmap
+import os
+import struct
+from collections import deque
+from typing import Deque, List, Optional
+
+# Dump file layout: magic, the total number of bytes ever written, the stream position of
+# the oldest line that is still whole, then the ring
+DUMP_MAGIC = b"GRPYRING"
+DUMP_HEADER = struct.Struct("<8sQQ")
+
+
+class ByteRing:
+    """
+    Fixed-size ring of formatted log lines in a memory-mapped file.
+
+    The mapping is shared with the page cache, so whatever was written survives the
+    process dying without a flush, and read_dump can recover it post mortem.
+    """
+
+    def __init__(self, path: str, size: int) -> None:
+        self.path = path
+        self.size = size
+        fd = os.open(path, os.O_RDWR | os.O_CREAT | os.O_TRUNC, 0o600)
+        try:
+            os.ftruncate(fd, DUMP_HEADER.size + size)
+            self._map = mmap.mmap(fd, DUMP_HEADER.size + size)
+        finally:
+            os.close(fd)
+        self.written = 0
+        # Stream positions where the lines held by the ring start
+        self._starts: Deque[int] = deque()
+        DUMP_HEADER.pack_into(self._map, 0, DUMP_MAGIC, 0, 0)
+
+    def write(self, data: bytes) -> None:
+        if len(data) > self.size:
+            data = data[-self.size :]
+        else:
+            self._starts.append(self.written)
+        offset = self.written % self.size
+        first = min(len(data), self.size - offset)
+        base = DUMP_HEADER.size
+        self._map[base + offset : base + offset + first] = data[:first]
+        if first < len(data):
+            self._map[base : base + len(data) - first] = data[first:]
+        self.written += len(data)
+
+        oldest = self.written - self.size
+        while self._starts and self._starts[0] < oldest:
+            self._starts.popleft()
+        whole = self._starts[0] if self._starts else self.written
+        DUMP_HEADER.pack_into(self._map, 0, DUMP_MAGIC, self.written, whole)
+
+    def close(self) -> None:
+        self._map.close()
+
+    @staticmethod
+    def read_dump(path: str) -> List[str]:
+        """Complete lines held by the ring file at path, oldest first."""
+        with open(path, "rb") as file:
+            data = file.read()
+        magic, written, whole = DUMP_HEADER.unpack_from(data)
+        if magic != DUMP_MAGIC:
+            raise ValueError(f"Not a grpy ring buffer dump: {path}")
+        ring = data[DUMP_HEADER.size :]
+        size = len(ring)
+        if written <= size:
+            text = ring[:written]
+        else:
+            offset = written % size
+            # Skip what is left of the oldest line, if it was partly overwritten
+            text = (ring[offset:] + ring[:offset])[whole - (written - size) :]
+        return text.decode("utf-8", errors="replace").splitlines()
+
+
+class RingBufferHandler(logging.Handler):
+    """
+    Keeps the most recent records in memory and hands them to target only when a record
+    at trigger_level or above arrives, e.g. the ERROR CommandManager logs for a failure.
+
+        ring = RingBufferHandler(target=logging.StreamHandler(), capacity=2000)
+        logger.setLevel(logging.DEBUG)  # so DEBUG records reach the ring
+
+    Up to capacity records are held in preallocated slots, with the oldest overwritten
+    first, and without formatting them, so buffered DEBUG logging stays cheap. With
+    max_bytes the formatted size of the held records is bounded as well. With dump_path
+    every formatted line is also written to a memory-mapped ring file of dump_bytes,
+    which outlives a crash and can be read back with ByteRing.read_dump.
+    """
+
+    def __init__(
+        self,
+        target: Optional[logging.Handler] = None,
+        capacity: int = 1000,
+        trigger_level: int = logging.ERROR,
+        max_bytes: Optional[int] = None,
+        dump_path: Optional[str] = None,
+        dump_bytes: int = 1024 * 1024,
+    ) -> None:
+        super().__init__()
+        if capacity <= 0:
+            raise ValueError("Ring buffer capacity must be greater than 0")
+        self.target = target if target is not None else logging.StreamHandler()
+        self.capacity = capacity
+        self.trigger_level = trigger_level
+        self.max_bytes = max_bytes
+        self.dump = ByteRing(dump_path, dump_bytes) if dump_path is not None else None
+
+        self._slots: List[Optional[logging.LogRecord]] = [None] * capacity
+        self._sizes = [0] * capacity
+        self._start = 0
+        self._count = 0
+        self._bytes = 0
+
+    def __len__(self) -> int:
+        return self._count
+
+    def emit(self, record: logging.LogRecord) -> None:
+        try:
+            size = 0
+            if self.max_bytes is not None or self.dump is not None:
+                line = (self.format(record) + "\n").encode("utf-8", errors="replace")
+                size = len(line)
+                if self.dump is not None:
+                    self.dump.write(line)
+            self._push(record, size)
+            if record.levelno >= self.trigger_level:
+                self._flush_to_target()
+        except Exception:
+            self.handleError(record)
+
+    def _push(self, record: logging.LogRecord, size: int) -> None:
+        if self._count == self.capacity:
+            self._drop_oldest()
+        if self.max_bytes is not None:
+            while self._count and self._bytes + size > self.max_bytes:
+                self._drop_oldest()
+        index = (self._start + self._count) % self.capacity
+        self._slots[index] = record
+        self._sizes[index] = size
+        self._count += 1
+        self._bytes += size
+
+    def _drop_oldest(self) -> None:
+        self._slots[self._start] = None
+        self._bytes -= self._sizes[self._start]
+        self._start = (self._start + 1) % self.capacity
+        self._count -= 1
+
+    def records(self) -> List[logging.LogRecord]:
+        """Buffered records, oldest first."""
+        with self.lock:
+            return [self._slots[(self._start + i) % self.capacity] for i in range(self._count)]
+
+    def flush_buffer(self) -> None:
+        """Hand every buffered record to target now, as if a trigger record had arrived."""
+        with self.lock:
+            self._flush_to_target()
+
+    def flush(self) -> None:
+        # logging.shutdown flushes every handler; that must not dump the buffered records
+        self.target.flush()
+
+    def _flush_to_target(self) -> None:
+        for i in range(self._count):
+            self.target.handle(self._slots[(self._start + i) % self.capacity])
+        self.target.flush()
+        self.clear()
+
+    def clear(self) -> None:
+        with self.lock:
+            for index in range(self.capacity):
+                self._slots[index] = None
+            self._start = self._count = self._bytes = 0
+
+    def close(self) -> None:
+        with self.lock:
+            if self.dump is not None:
+                self.dump.close()
+                self.dump = None
+        super().close()
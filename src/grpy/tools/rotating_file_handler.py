@@ -0,0 +1,181 @@
+import glob
+import gzip
+import logging
+import lzma
+import os
+import shutil
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import IO, List, Literal, Optional
+
+from .periodic_flush import PeriodicFlush
+
+COMPRESSION = Literal["gzip", "lzma"]
+COMPRESSORS = {"gzip": (gzip.open, ".gz"), "lzma": (lzma.open, ".xz")}
+
+
+class BufferedRotatingFileHandler(logging.Handler):
+    """
+    File handler that writes formatted records in batches and rotates by size or time.
+
+    Records are held in memory until buffer_bytes have accumulated or a record at
+    flush_level or above comes in; then they are written with one write() call. A
+    background thread writes whatever is pending every flush_interval seconds, so an idle
+    logger does not hold records back. The file is rotated before a write would take it
+    past max_bytes, or once rotate_interval seconds have passed since it was opened.
+    Rotated segments are renamed with a timestamp suffix and compressed on a background
+    thread, so the logging path never waits on the compressor. Only the newest
+    backup_count segments are kept.
+    """
+
+    def __init__(
+        self,
+        filename: str = "grpy.log",
+        buffer_bytes: int = 64 * 1024,
+        flush_interval: float = 1.0,
+        flush_level: int = logging.ERROR,
+        max_bytes: int = 10 * 1024 * 1024,
+        rotate_interval: Optional[float] = None,
+        backup_count: int = 5,
+        compression: Optional[COMPRESSION] = "gzip",
+        encoding: str = "utf-8",
+    ) -> None:
+        super().__init__()
+        self.filename = os.path.abspath(filename)
+        self.buffer_bytes = buffer_bytes
+        self.flush_interval = flush_interval
+        self.flush_level = flush_level
+        self.max_bytes = max_bytes
+        self.rotate_interval = rotate_interval
+        self.backup_count = backup_count
+        self.compression = compression
+        self.encoding = encoding
+
+        self._buffer: List[str] = []
+        self._buffered = 0
+        self._last_write = time.monotonic()
+        self._stream: Optional[IO[str]] = None
+        self._opened_at = 0.0
+        self._compressor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="grpy-log-compress")
+        self._timer = (
+            PeriodicFlush(self._flush_pending, flush_interval, "grpy-log-flush")
+            if flush_interval > 0
+            else None
+        )
+
+    def emit(self, record: logging.LogRecord) -> None:
+        try:
+            line = self.format(record) + "\n"
+            self._buffer.append(line)
+            self._buffered += len(line)
+            if (
+                self._buffered >= self.buffer_bytes
+                or record.levelno >= self.flush_level
+                or time.monotonic() - self._last_write >= self.flush_interval
+            ):
+                self._write()
+        except Exception:
+            self.handleError(record)
+
+    def flush(self) -> None:
+        with self.lock:
+            self._write()
+
+    def _flush_pending(self) -> None:
+        with self.lock:
+            if self._buffer:
+                self._write()
+
+    def close(self) -> None:
+        if self._timer is not None:
+            self._timer.stop()
+        with self.lock:
+            try:
+                self._write()
+            finally:
+                if self._stream is not None:
+                    self._stream.close()
+                    self._stream = None
+        # Let pending compressions finish so no half-written archive is left behind
+        self._compressor.shutdown(wait=True)
+        super().close()
+
+    def rotate(self) -> None:
+        """Close the current file and hand it to the background compressor."""
+        with self.lock:
+            self._write()
+            self._rotate()
+
+    def _write(self) -> None:
+        self._last_write = time.monotonic()
+        if not self._buffer:
+            return
+        data = "".join(self._buffer)
+        self._buffer.clear()
+        self._buffered = 0
+
+        stream = self._open()
+        if self._should_rotate(stream, len(data)):
+            self._rotate()
+            stream = self._open()
+        stream.write(data)
+        stream.flush()
+
+    def _open(self) -> IO[str]:
+        if self._stream is None:
+            self._stream = open(self.filename, "a", encoding=self.encoding)
+            self._opened_at = time.time()
+        return self._stream
+
+    def _should_rotate(self, stream: IO[str], pending: int) -> bool:
+        position = stream.tell()
+        if position == 0:
+            return False
+        if self.max_bytes and position + pending > self.max_bytes:
+            return True
+        return bool(self.rotate_interval) and time.time() - self._opened_at >= self.rotate_interval
+
+    def _rotate(self) -> None:
+        if self._stream is None:
+            return
+        self._stream.close()
+        self._stream = None
+        if not os.path.exists(self.filename) or os.path.getsize(self.filename) == 0:
+            return
+
+        # UTC with nanoseconds, so segment names sort in rotation order
+        now = time.time_ns()
+        stamp = time.strftime("%Y%m%d-%H%M%S", time.gmtime(now // 10**9))
+        segment = f"{self.filename}.{stamp}.{now % 10**9:09d}"
+        os.replace(self.filename, segment)
+        self._compressor.submit(self._finish_segment, segment)
+
+    def _finish_segment(self, segment: str) -> None:
+        try:
+            if self.compression is not None:
+                opener, extension = COMPRESSORS[self.compression]
+                partial = segment + extension + ".tmp"
+                with open(segment, "rb") as source, opener(partial, "wb") as target:
+                    shutil.copyfileobj(source, target)
+                os.replace(partial, segment + extension)
+                os.unlink(segment)
+            self._prune()
+        except OSError:
+            # A failed compression leaves the plain segment in place; nothing is lost
+            logging.getLogger(__name__).debug("Log compression failed", exc_info=True)
+
+    def segments(self) -> List[str]:
+        """Rotated segments, oldest first."""
+        return sorted(
+            path
+            for path in glob.glob(glob.escape(self.filename) + ".*")
+            if not path.endswith(".tmp")
+        )
+
+    def _prune(self) -> None:
+        segments = self.segments()
+        for path in segments[: max(len(segments) - self.backup_count, 0)]:
+            try:
+                os.unlink(path)
+            except FileNotFoundError:
+                pass
@@ -0,0 +1,107 @@
+import mmap
+import os
+import tempfile
+from typing import BinaryIO, Literal, Optional, Tuple
+
+from pydantic import BaseModel, ConfigDict, Field
+
+LIMIT_POLICY = Literal["truncate", "abort"]
+
+
+class SpoolConfig(BaseModel):
+    """
+    Settings for capturing command output in temporary files instead of pipes.
+
+    The child writes straight into the files through their descriptors. Outputs of at most
+    memory_threshold bytes are read back and returned as text; larger ones are returned as a
+    SpooledOutput. Beyond max_bytes, output is either truncated or the command is aborted,
+    depending on on_limit. Truncation only happens after the command exits: until then the
+    files grow to the full output size, so only "abort" bounds disk use during the run.
+    """
+
+    model_config = ConfigDict(strict=True)
+
+    directory: Optional[str] = None
+    memory_threshold: int = Field(default=1024 * 1024, ge=0)
+    max_bytes: Optional[int] = Field(default=None, gt=0)
+    on_limit: LIMIT_POLICY = "truncate"
+    poll_interval: float = Field(
+        default=0.05, gt=0, description="Seconds between size checks when on_limit is abort"
+    )
+
+
+class SpooledOutput:
+    """
+    Command output held in a temporary file.
+
+    The file is removed by close(), so results holding a SpooledOutput should be closed (or
+    used as a context manager) once the output has been consumed.
+    """
+
+    __slots__ = ("path", "size", "truncated", "_file", "_mmap")
+
+    def __init__(self, file: BinaryIO, path: str, size: int, truncated: bool = False) -> None:
+        self.path = path
+        self.size = size
+        self.truncated = truncated
+        self._file = file
+        self._mmap: Optional[mmap.mmap] = None
+
+    def mmap(self) -> mmap.mmap:
+        if self.size == 0:
+            raise ValueError(f"Cannot memory-map empty output: {self.path}")
+        if self._mmap is None:
+            self._mmap = mmap.mmap(self._file.fileno(), self.size, access=mmap.ACCESS_READ)
+        return self._mmap
+
+    def read(self) -> bytes:
+        return read_spool(self._file, self.size)
+
+    def tail(self, size: int) -> bytes:
+        offset = max(self.size - size, 0)
+        return read_spool(self._file, self.size - offset, offset)
+
+    def close(self) -> None:
+        if self._mmap is not None:
+            self._mmap.close()
+            self._mmap = None
+        if not self._file.closed:
+            self._file.close()
+            remove_spool(self.path)
+
+    def __len__(self) -> int:
+        return self.size
+
+    def __enter__(self) -> "SpooledOutput":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def __repr__(self) -> str:
+        return f"{self.__class__.__name__}(path={self.path!r}, size={self.size})"
+
+
+def create_spool(config: SpoolConfig, stream: str) -> Tuple[BinaryIO, str]:
+    fd, path = tempfile.mkstemp(prefix="grpy-", suffix=f".{stream}", dir=config.directory)
+    return open(fd, "w+b"), path
+
+
+def read_spool(file: BinaryIO, size: int, offset: int = 0) -> bytes:
+    # pread may return short reads for very large sizes, so keep reading until size is met
+    chunks = []
+    end = offset + size
+    while offset < end:
+        chunk = os.pread(file.fileno(), end - offset, offset)
+        if not chunk:
+            break
+        chunks.append(chunk)
+        offset += len(chunk)
+    return b"".join(chunks)
+
+
+def remove_spool(path: str) -> None:
+    try:
+        os.unlink(path)
+    except FileNotFoundError:
+        pass
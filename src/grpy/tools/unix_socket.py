@@ -0,0 +1,30 @@
+import os
+import socket
+import stat
+
+
+def remove_stale_socket(path: str) -> None:
+    """
+    Remove a Unix socket at path left behind by a server that did not shut down cleanly,
+    so a new server can bind there. Raises RuntimeError if path is not a socket, or if a
+    server is still accepting connections on it.
+    """
+    try:
+        mode = os.lstat(path).st_mode
+    except FileNotFoundError:
+        return
+    if not stat.S_ISSOCK(mode):
+        raise RuntimeError(f"Refusing to replace a file that is not a socket: {path}")
+
+    probe = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    try:
+        probe.connect(path)
+    except (ConnectionRefusedError, FileNotFoundError):
+        try:
+            os.unlink(path)
+        except FileNotFoundError:
+            pass
+        return
+    finally:
+        probe.close()
+    raise RuntimeError(f"Socket is in use by a running server: {path}")
@@ -28,5 +28,7 @@ def reset_log_manager():
         if logger:
             for handler in logger.handlers[:]:
                 logger.removeHandler(handler)
+            for log_filter in logger.filters[:]:
+                logger.removeFilter(log_filter)
 
         delattr(LogManager, "instance")
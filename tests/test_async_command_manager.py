@@ -0,0 +1,133 @@
+import asyncio
+import os
+import time
+from subprocess import TimeoutExpired
+
+import pytest
+
+from src.grpy.tools.async_command_manager import AsyncCommandManager
+from src.grpy.tools.command_manager import CommandBatchError
+from src.grpy.tools.result_cache import ResultCache
+from src.grpy.tools.spooled_output import SpoolConfig
+
+
+@pytest.fixture
+def sleep_cmd():
+    return ["python", "-c", "import time; time.sleep(0.5); print('done')"]
+
+
+def test_async_command_manager_validates_whitelist():
+    with pytest.raises(ValueError) as exc_info:
+        AsyncCommandManager(cmds=[["ls", "-la"]])
+    assert "Command 'ls' is not in the permitted commands list" in str(exc_info.value)
+
+
+def test_async_command_manager_run_command():
+    cm = AsyncCommandManager(cmds=[["python", "-c", "print('hello')"]])
+    result = asyncio.run(cm.run_command(cm.cmds[0]))
+
+    assert result.returncode == 0
+    assert result.stdout.strip() == "hello"
+
+
+def test_async_command_manager_replaces_undecodable_output():
+    script = "import sys; sys.stdout.buffer.write(b'ok \\xff\\n')"
+    cm = AsyncCommandManager(cmds=[["python", "-c", script]])
+    result = asyncio.run(cm.run_command(cm.cmds[0]))
+
+    # Decoded with the locale encoding, like the synchronous paths
+    assert result.stdout == AsyncCommandManager._decode(b"ok \xff\n")
+
+
+def test_async_command_manager_failure():
+    cm = AsyncCommandManager(cmds=[["python", "-c", "import sys; sys.exit('boom')"]])
+    with pytest.raises(RuntimeError) as exc_info:
+        asyncio.run(cm.run_commands())
+    assert "Error: boom" in str(exc_info.value)
+
+
+def test_async_command_manager_parallel_fan_out(sleep_cmd):
+    cm = AsyncCommandManager(cmds=[sleep_cmd] * 6, parallel=True)
+
+    start = time.monotonic()
+    results = asyncio.run(cm.run_commands())
+
+    assert time.monotonic() - start < 1.5
+    assert len(results) == 6
+    assert all(result.stdout.strip() == "done" for result in results)
+
+
+def test_async_command_manager_process_group_keeps_session():
+    script = "import os; print(os.getsid(0), os.getpgid(0))"
+    cm = AsyncCommandManager(cmds=[["python", "-c", script]], new_process_group=True)
+    sid, pgid = asyncio.run(cm.run_command(cm.cmds[0])).stdout.split()
+
+    assert int(sid) == os.getsid(0)
+    assert int(pgid) != os.getpgid(0)
+
+
+def test_async_command_manager_timeout_kills_child():
+    cm = AsyncCommandManager(cmds=[["python", "-c", "import time; time.sleep(5)"]], timeout=0.2)
+    with pytest.raises(TimeoutExpired):
+        asyncio.run(cm.run_commands())
+
+
+def test_async_command_manager_cancellation_kills_child():
+    cm = AsyncCommandManager(cmds=[["python", "-c", "import time; time.sleep(5)"]], timeout=10.0)
+
+    async def cancel_run():
+        task = asyncio.create_task(cm.run_command(cm.cmds[0]))
+        await asyncio.sleep(0.2)
+        task.cancel()
+        start = time.monotonic()
+        with pytest.raises(asyncio.CancelledError):
+            await task
+        return time.monotonic() - start
+
+    assert asyncio.run(cancel_run()) < 1.0
+
+
+def test_async_command_manager_parallel_fail_fast_cancels_siblings():
+    cmds = [
+        ["python", "-c", "import time, sys; time.sleep(0.2); sys.exit(3)"],
+        ["python", "-c", "import time; time.sleep(5)"],
+    ]
+    cm = AsyncCommandManager(cmds=cmds, parallel=True, timeout=10.0)
+
+    start = time.monotonic()
+    with pytest.raises(RuntimeError) as exc_info:
+        asyncio.run(cm.run_commands())
+
+    assert time.monotonic() - start < 2.0
+    assert "sys.exit(3)" in str(exc_info.value)
+
+
+@pytest.mark.parametrize("parallel", [False, True])
+def test_async_command_manager_continue_keeps_results(parallel):
+    cmds = [
+        ["python", "-c", "print('ok')"],
+        ["python", "-c", "import sys; sys.exit(3)"],
+    ]
+    cm = AsyncCommandManager(cmds=cmds, parallel=parallel, failure_policy="continue")
+
+    with pytest.raises(CommandBatchError) as exc_info:
+        asyncio.run(cm.run_commands())
+
+    assert exc_info.value.results[0].stdout.strip() == "ok"
+    assert exc_info.value.results[1] is None
+    assert list(exc_info.value.errors) == [1]
+
+
+@pytest.mark.parametrize(
+    "option",
+    [
+        {"stream_output": True},
+        {"on_output": print},
+        {"spool": SpoolConfig()},
+        {"result_cache": ResultCache()},
+    ],
+)
+def test_async_command_manager_rejects_sync_only_options(option):
+    with pytest.raises(ValueError) as exc_info:
+        AsyncCommandManager(cmds=[["python", "--version"]], **option)
+    assert f"does not support: {next(iter(option))}" in str(exc_info.value)
@@ -0,0 +1,95 @@
+import io
+import json
+import logging
+
+import pytest
+
+from src.grpy.tools.bound_logger import BoundLogger
+from src.grpy.tools.json_log_handler import JsonLinesHandler
+from src.grpy.tools.log_manager import LogManager
+
+
+class CollectingHandler(logging.Handler):
+    def __init__(self):
+        super().__init__()
+        self.records = []
+
+    def emit(self, record):
+        self.records.append(record)
+
+
+@pytest.fixture
+def target():
+    return CollectingHandler()
+
+
+def test_bind_adds_context_to_records(target):
+    log = LogManager(handler=target).bind(repo="grpy-tools", command="git fetch")
+    log.error("Command failed: %s", "git fetch")
+
+    record = target.records[0]
+    assert record.getMessage() == "Command failed: git fetch"
+    assert record.repo == "grpy-tools"
+    assert record.command == "git fetch"
+    assert record.funcName == "test_bind_adds_context_to_records"
+    assert record.filename == "test_bound_logger.py"
+
+
+def test_bind_respects_logger_level(target):
+    log_manager = LogManager(handler=target)
+    log = log_manager.bind(repo="grpy-tools")
+    log.debug("hidden")
+    log_manager.setLevel(logging.DEBUG)
+    log.debug("shown")
+
+    assert [record.getMessage() for record in target.records] == ["shown"]
+    assert log.isEnabledFor(logging.DEBUG)
+
+
+def test_nested_bind_and_call_extra(target):
+    log = LogManager(handler=target).bind(repo="grpy-tools", step=1)
+    child = log.bind(step=2, command="git status")
+    child.info("running", extra={"attempt": 3})
+    log.info("parent")
+
+    first, second = target.records
+    assert (first.repo, first.step, first.command, first.attempt) == (
+        "grpy-tools",
+        2,
+        "git status",
+        3,
+    )
+    assert second.step == 1 and not hasattr(second, "command")
+    assert log.context == {"repo": "grpy-tools", "step": 1}
+
+
+def test_exception_includes_traceback(target):
+    log = LogManager(handler=target).bind(repo="grpy-tools")
+    try:
+        raise RuntimeError("boom")
+    except RuntimeError:
+        log.exception("Command failed")
+
+    assert target.records[0].exc_info[0] is RuntimeError
+    assert target.records[0].levelno == logging.ERROR
+
+
+def test_bind_rejects_record_attributes(log_manager):
+    with pytest.raises(ValueError, match="message"):
+        log_manager.bind(message="clobbered")
+
+
+def test_adapter_is_slotted(log_manager):
+    log = log_manager.bind(repo="grpy-tools")
+    assert type(log).__name__ == BoundLogger.__name__
+    assert not hasattr(log, "__dict__")
+    with pytest.raises(AttributeError):
+        log.repo = "other"
+
+
+def test_context_reaches_json_handler():
+    stream = io.StringIO()
+    log = LogManager(handler=JsonLinesHandler(stream, batch_size=1)).bind(repo="grpy-tools")
+    log.info("Command completed successfully: git status")
+
+    assert json.loads(stream.getvalue())["repo"] == "grpy-tools"
@@ -0,0 +1,92 @@
+import os
+import socket
+import stat
+
+import pytest
+
+from src.grpy.tools.command_daemon import CommandDaemon
+from src.grpy.tools.daemon_client import DaemonClient
+
+
+@pytest.fixture
+def socket_path():
+    # Unix socket paths are limited to ~100 bytes, which tmp_path can exceed
+    path = f"/tmp/grpy-test-{os.getpid()}.sock"
+    yield path
+    if os.path.exists(path):
+        os.unlink(path)
+
+
+@pytest.fixture
+def daemon(socket_path):
+    with CommandDaemon(socket_path) as daemon:
+        yield daemon
+
+
+def test_daemon_runs_batch(daemon, socket_path):
+    logs = []
+    results = DaemonClient(socket_path, timeout=10).run(
+        [["python", "-c", "print('hello')"], ["python", "-c", "print('world')"]],
+        on_log=lambda level, message: logs.append((level, message)),
+        parallel=True,
+    )
+
+    assert [result["stdout"].strip() for result in results] == ["hello", "world"]
+    assert all(result["returncode"] == 0 for result in results)
+    assert ("INFO", "All commands executed successfully") in logs
+
+
+def test_daemon_socket_is_private(daemon, socket_path):
+    assert stat.S_IMODE(os.stat(socket_path).st_mode) & 0o077 == 0
+
+
+def test_daemon_reports_command_failure(daemon, socket_path):
+    client = DaemonClient(socket_path, timeout=10)
+    with pytest.raises(RuntimeError) as exc_info:
+        client.run([["python", "-c", "import sys; sys.stderr.write('boom'); sys.exit(1)"]])
+    assert "Error: boom" in str(exc_info.value)
+
+
+def test_daemon_rejects_non_whitelisted_command(daemon, socket_path):
+    with pytest.raises(ValueError) as exc_info:
+        DaemonClient(socket_path, timeout=10).run([["ls", "-la"]])
+    assert "Command 'ls' is not in the permitted commands list" in str(exc_info.value)
+
+
+def test_daemon_rejects_unsupported_options(daemon, socket_path):
+    with pytest.raises(ValueError) as exc_info:
+        DaemonClient(socket_path, timeout=10).run([["git", "status"]], cmd_whitelist=["ls"])
+    assert "Unsupported daemon options: cmd_whitelist" in str(exc_info.value)
+
+
+def test_daemon_close_removes_socket(socket_path):
+    daemon = CommandDaemon(socket_path)
+    daemon.start()
+    daemon.close()
+    assert not os.path.exists(socket_path)
+
+
+def test_daemon_replaces_stale_socket(socket_path):
+    stale = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    stale.bind(socket_path)
+    stale.close()
+
+    with CommandDaemon(socket_path):
+        results = DaemonClient(socket_path, timeout=10).run([["python", "--version"]])
+    assert results[0]["returncode"] == 0
+
+
+def test_daemon_refuses_live_socket(daemon, socket_path):
+    with pytest.raises(RuntimeError) as exc_info:
+        CommandDaemon(socket_path).start()
+    assert "in use" in str(exc_info.value)
+
+
+def test_daemon_refuses_regular_file(socket_path):
+    with open(socket_path, "w") as file:
+        file.write("not a socket")
+
+    with pytest.raises(RuntimeError) as exc_info:
+        CommandDaemon(socket_path).start()
+    assert "not a socket" in str(exc_info.value)
+    assert os.path.isfile(socket_path)
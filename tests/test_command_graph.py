@@ -0,0 +1,174 @@
+import json
+import os
+import time
+
+import pytest
+
+from src.grpy.tools.command_graph import CommandGraph, CommandNode
+
+
+def append_cmd(log_path, label, delay=0.0):
+    script = (
+        f"import time; time.sleep({delay})\n"
+        f"with open({str(log_path)!r}, 'a') as f: f.write({label!r} + '\\n')"
+    )
+    return ["python", "-c", script]
+
+
+def copy_cmd(source, target):
+    script = f"import shutil; shutil.copyfile({str(source)!r}, {str(target)!r})"
+    return ["python", "-c", script]
+
+
+@pytest.fixture
+def workspace(tmp_path):
+    source = tmp_path / "source.txt"
+    source.write_text("v1")
+    return tmp_path, source
+
+
+@pytest.fixture
+def build_graph(workspace):
+    tmp_path, source = workspace
+    copied = tmp_path / "copied.txt"
+    final = tmp_path / "final.txt"
+
+    def make(**kwargs):
+        return CommandGraph(
+            nodes=[
+                CommandNode(
+                    name="copy",
+                    cmd=copy_cmd(source, copied),
+                    inputs=[str(source)],
+                    outputs=[str(copied)],
+                ),
+                CommandNode(
+                    name="final",
+                    cmd=copy_cmd(copied, final),
+                    deps=["copy"],
+                    inputs=[str(copied)],
+                    outputs=[str(final)],
+                ),
+            ],
+            stamp_file=str(tmp_path / "stamps.json"),
+            **kwargs,
+        )
+
+    return make
+
+
+def touch_later(path):
+    stat = os.stat(path)
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+
+
+def test_graph_rejects_unknown_dependency():
+    with pytest.raises(ValueError) as exc_info:
+        CommandGraph(nodes=[CommandNode(name="a", cmd=["git", "status"], deps=["missing"])])
+    assert "depends on unknown command 'missing'" in str(exc_info.value)
+
+
+def test_graph_rejects_cycle():
+    with pytest.raises(ValueError) as exc_info:
+        CommandGraph(
+            nodes=[
+                CommandNode(name="a", cmd=["git", "status"], deps=["b"]),
+                CommandNode(name="b", cmd=["git", "status"], deps=["a"]),
+            ]
+        )
+    assert "contain a cycle: a, b" in str(exc_info.value)
+
+
+def test_graph_rejects_duplicate_names():
+    with pytest.raises(ValueError) as exc_info:
+        CommandGraph(
+            nodes=[
+                CommandNode(name="a", cmd=["git", "status"]),
+                CommandNode(name="a", cmd=["git", "status"]),
+            ]
+        )
+    assert "Duplicate command names: a" in str(exc_info.value)
+
+
+def test_graph_validates_whitelist():
+    with pytest.raises(ValueError) as exc_info:
+        CommandGraph(nodes=[CommandNode(name="a", cmd=["ls", "-la"])])
+    assert "Command 'ls' is not in the permitted commands list" in str(exc_info.value)
+
+
+def test_graph_respects_dependencies_and_runs_branches_concurrently(tmp_path):
+    log = tmp_path / "order.log"
+    graph = CommandGraph(
+        nodes=[
+            CommandNode(name="pull", cmd=append_cmd(log, "pull")),
+            CommandNode(name="install", cmd=append_cmd(log, "install"), deps=["pull"]),
+        ]
+        + [
+            CommandNode(name=f"lint{i}", cmd=append_cmd(log, f"lint{i}", delay=0.5))
+            for i in range(4)
+        ],
+        stamp_file=str(tmp_path / "stamps.json"),
+        max_workers=6,
+    )
+
+    start = time.monotonic()
+    results = graph.run()
+
+    assert time.monotonic() - start < 1.5
+    order = log.read_text().split()
+    assert order.index("pull") < order.index("install")
+    assert all(result.returncode == 0 for result in results.values())
+
+
+def test_graph_skips_up_to_date_nodes(build_graph, workspace):
+    tmp_path, source = workspace
+
+    first = build_graph().run()
+    assert first["copy"] is not None and first["final"] is not None
+    assert (tmp_path / "final.txt").read_text() == "v1"
+
+    second = build_graph().run()
+    assert second == {"copy": None, "final": None}
+
+    source.write_text("v2")
+    touch_later(source)
+    third = build_graph().run()
+    assert third["copy"] is not None and third["final"] is not None
+    assert (tmp_path / "final.txt").read_text() == "v2"
+
+
+def test_graph_reruns_when_output_missing(build_graph, workspace):
+    tmp_path, _ = workspace
+    build_graph().run()
+    (tmp_path / "final.txt").unlink()
+
+    results = build_graph().run()
+
+    assert results["copy"] is None
+    assert results["final"] is not None
+
+
+def test_graph_hash_inputs_ignores_touch(build_graph, workspace):
+    _, source = workspace
+    build_graph(hash_inputs=True).run()
+    touch_later(source)
+
+    assert build_graph(hash_inputs=True).run() == {"copy": None, "final": None}
+
+
+def test_graph_failure_blocks_dependents(tmp_path):
+    log = tmp_path / "order.log"
+    graph = CommandGraph(
+        nodes=[
+            CommandNode(name="broken", cmd=["python", "-c", "import sys; sys.exit(1)"]),
+            CommandNode(name="after", cmd=append_cmd(log, "after"), deps=["broken"]),
+            CommandNode(name="other", cmd=append_cmd(log, "other")),
+        ],
+        stamp_file=str(tmp_path / "stamps.json"),
+    )
+
+    with pytest.raises(RuntimeError):
+        graph.run()
+
+    assert log.read_text().split() == ["other"]
+    assert "broken" not in json.loads((tmp_path / "stamps.json").read_text())
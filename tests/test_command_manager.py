@@ -1,9 +1,14 @@
+import logging
+import os
+import shutil
+import time
 from subprocess import PIPE, TimeoutExpired
 from unittest.mock import Mock, patch
 
 import pytest
 
-from src.grpy.tools.command_manager import CommandManager
+from src.grpy.tools.command_manager import CommandBatchError, CommandManager
+from src.grpy.tools.command_result import CommandResult
 
 
 @pytest.fixture
@@ -132,7 +137,13 @@ def test_command_manager_successful_run():
         cm.run_commands()
 
         mock_popen.assert_called_once_with(
-            ["git", "status"], stdout=PIPE, stdin=PIPE, stderr=PIPE, text=True
+            ["git", "status"],
+            executable=shutil.which("git"),
+            stdout=PIPE,
+            stdin=PIPE,
+            stderr=PIPE,
+            text=True,
+            new_process_group=False,
         )
         process_mock.communicate.assert_called_once()
 
@@ -165,3 +176,251 @@ def test_command_manager_timeouts(
         cm.run_commands()
     assert timeout_error_msg in str(exc_info.value)
     process_mock.communicate.assert_called_once_with(timeout=expected_timeout)
+
+
+@pytest.fixture
+def sleep_commands():
+    return [["python", "-c", "import time; time.sleep(0.5); print('done')"] for _ in range(4)]
+
+
+def test_command_manager_parallel_run(sleep_commands):
+    cm = CommandManager(cmds=sleep_commands, parallel=True, max_workers=4)
+
+    start = time.monotonic()
+    results = cm.run_commands()
+    elapsed = time.monotonic() - start
+
+    assert elapsed < 1.5
+    assert [result.args for result in results] == sleep_commands
+    assert all(result.returncode == 0 for result in results)
+    assert all(result.stdout.strip() == "done" for result in results)
+
+
+def test_command_manager_parallel_continue_raises_after_all_complete(tmp_path):
+    marker = tmp_path / "marker"
+    cmds = [
+        ["python", "-c", "import sys; sys.exit(3)"],
+        [
+            "python",
+            "-c",
+            f"import time, pathlib; time.sleep(0.2); pathlib.Path({str(marker)!r}).touch()",
+        ],
+    ]
+    cm = CommandManager(cmds=cmds, parallel=True, failure_policy="continue")
+
+    with pytest.raises(CommandBatchError) as exc_info:
+        cm.run_commands()
+
+    assert marker.exists()
+    assert "Command failed: python -c import sys; sys.exit(3)" in str(exc_info.value)
+    assert exc_info.value.results[0] is None
+    assert exc_info.value.results[1].returncode == 0
+    assert list(exc_info.value.errors) == [0]
+
+
+def test_command_manager_parallel_fail_fast_kills_siblings(tmp_path):
+    marker = tmp_path / "marker"
+    cmds = [
+        ["python", "-c", "import time, sys; time.sleep(0.2); sys.exit(3)"],
+        [
+            "python",
+            "-c",
+            f"import time, pathlib; time.sleep(3); pathlib.Path({str(marker)!r}).touch()",
+        ],
+    ]
+    cm = CommandManager(cmds=cmds, parallel=True, timeout=10.0)
+
+    start = time.monotonic()
+    with pytest.raises(RuntimeError) as exc_info:
+        cm.run_commands()
+
+    assert time.monotonic() - start < 2.0
+    assert not marker.exists()
+    assert "sys.exit(3)" in str(exc_info.value)
+
+
+def test_command_manager_sequential_continue_runs_all(tmp_path):
+    marker = tmp_path / "marker"
+    cmds = [
+        ["python", "-c", "import sys; sys.exit(3)"],
+        ["python", "-c", f"import pathlib; pathlib.Path({str(marker)!r}).touch()"],
+    ]
+    cm = CommandManager(cmds=cmds, failure_policy="continue")
+
+    with pytest.raises(CommandBatchError) as exc_info:
+        cm.run_commands()
+
+    assert marker.exists()
+    assert [result is None for result in exc_info.value.results] == [True, False]
+    assert isinstance(exc_info.value.errors[0], RuntimeError)
+
+
+def test_command_manager_retry_with_backoff(tmp_path):
+    counter = tmp_path / "attempts"
+    # Fails on the first two attempts, succeeds on the third
+    script = (
+        "import pathlib, sys\n"
+        f"path = pathlib.Path({str(counter)!r})\n"
+        "count = int(path.read_text()) + 1 if path.exists() else 1\n"
+        "path.write_text(str(count))\n"
+        "sys.exit(0 if count >= 3 else 1)"
+    )
+    cm = CommandManager(
+        cmds=[["python", "-c", script]], failure_policy="retry", max_retries=2, retry_backoff=0.01
+    )
+
+    results = cm.run_commands()
+
+    assert results[0].returncode == 0
+    assert counter.read_text() == "3"
+
+
+def test_command_manager_retry_gives_up(tmp_path):
+    cm = CommandManager(
+        cmds=[["python", "-c", "import sys; sys.exit(1)"]],
+        failure_policy="retry",
+        max_retries=1,
+        retry_backoff=0.01,
+    )
+    with pytest.raises(RuntimeError):
+        cm.run_commands()
+
+
+def test_command_manager_timeout_kills_process_group(tmp_path):
+    marker = tmp_path / "marker"
+    grandchild = f"import time, pathlib; time.sleep(1); pathlib.Path({str(marker)!r}).touch()"
+    script = (
+        "import subprocess, sys, time\n"
+        f"subprocess.Popen([sys.executable, '-c', {grandchild!r}])\n"
+        "time.sleep(5)"
+    )
+    cm = CommandManager(cmds=[["python", "-c", script]], timeout=0.5, new_process_group=True)
+
+    with pytest.raises(TimeoutExpired):
+        cm.run_commands()
+
+    time.sleep(1.0)
+    assert not marker.exists()
+
+
+def test_command_manager_interrupt_kills_process_group():
+    spawned = []
+
+    def interrupted(process, timeout=None):
+        spawned.append(process)
+        raise KeyboardInterrupt
+
+    cm = CommandManager(
+        cmds=[["python", "-c", "import time; time.sleep(5)"]],
+        timeout=10.0,
+        new_process_group=True,
+    )
+    with patch("src.grpy.tools.command_manager.Popen.communicate", interrupted):
+        with pytest.raises(KeyboardInterrupt):
+            cm.run_command(cm.cmds[0])
+
+    assert spawned[0].returncode is not None
+
+
+def test_command_manager_keeps_session_by_default():
+    script = "import os; print(os.getsid(0), os.getpgid(0))"
+    cm = CommandManager(cmds=[["python", "-c", script]])
+    sid, pgid = cm.run_command(cm.cmds[0]).stdout.split()
+    assert int(sid) == os.getsid(0)
+    assert int(pgid) == os.getpgid(0)
+
+    grouped = CommandManager(cmds=[["python", "-c", script]], new_process_group=True)
+    sid, pgid = grouped.run_command(grouped.cmds[0]).stdout.split()
+    assert int(sid) == os.getsid(0)
+    assert int(pgid) != os.getpgid(0)
+
+
+def test_command_manager_skips_completion_fields_when_info_disabled():
+    logger = logging.getLogger("grpy_quiet_test")
+    logger.setLevel(logging.WARNING)
+    cm = CommandManager(cmds=[["python", "-c", "pass"]], logger=logger)
+
+    def unexpected(self):
+        raise AssertionError("completion fields built with INFO disabled")
+
+    with patch.object(CommandResult, "duration", property(unexpected)):
+        assert cm.run_commands()[0].returncode == 0
+
+
+def test_command_manager_run_command_after_fail_fast_batch():
+    cm = CommandManager(
+        cmds=[
+            ["python", "-c", "import sys; sys.exit(1)"],
+            ["python", "-c", "import time; time.sleep(5)"],
+        ],
+        parallel=True,
+        timeout=10.0,
+    )
+    with pytest.raises(RuntimeError):
+        cm.run_commands()
+
+    assert cm.run_command(["python", "-c", "print('ok')"]).returncode == 0
+
+
+def test_command_manager_run_command_after_cancel():
+    cm = CommandManager(cmds=[["python", "-c", "print('ok')"]], timeout=10.0)
+    cm.cancel()
+
+    assert cm.run_command(cm.cmds[0]).returncode == 0
+
+
+def test_command_manager_invalid_max_workers(git_status_cmd):
+    with pytest.raises(ValueError) as exc_info:
+        CommandManager(cmds=[git_status_cmd], max_workers=0)
+    assert "Input should be greater than 0" in str(exc_info.value)
+
+
+def test_command_manager_stream_command_yields_lines():
+    script = "import sys\nfor i in range(3): print(i)\nprint('warn', file=sys.stderr)"
+    cm = CommandManager(cmds=[["python", "-c", script]])
+
+    lines = list(cm.stream_command(cm.cmds[0]))
+
+    assert [line for stream, line in lines if stream == "stdout"] == ["0", "1", "2"]
+    assert ("stderr", "warn") in lines
+
+
+def test_command_manager_stream_large_output_without_deadlock():
+    # Far more than a pipe buffer on both streams at once
+    script = "import sys\nfor i in range(50000):\n    print(i)\n    print(i, file=sys.stderr)"
+    cm = CommandManager(cmds=[["python", "-c", script]], timeout=10.0)
+
+    counts = {"stdout": 0, "stderr": 0}
+    for stream, _ in cm.stream_command(cm.cmds[0]):
+        counts[stream] += 1
+
+    assert counts == {"stdout": 50000, "stderr": 50000}
+
+
+def test_command_manager_streaming_callback_and_tail():
+    script = "import sys\nfor i in range(100): print('err', i, file=sys.stderr)\nsys.exit(1)"
+    received = []
+    cm = CommandManager(
+        cmds=[["python", "-c", script]],
+        stream_output=True,
+        tail_lines=2,
+        on_output=lambda stream, line: received.append((stream, line)),
+    )
+
+    with pytest.raises(RuntimeError) as exc_info:
+        cm.run_commands()
+
+    assert len(received) == 100
+    assert str(exc_info.value).endswith("Error: err 98\nerr 99")
+
+
+def test_command_manager_stream_without_timeout():
+    cm = CommandManager(cmds=[["python", "-c", "print('done')"]], timeout=None)
+
+    assert list(cm.stream_command(cm.cmds[0])) == [("stdout", "done")]
+
+
+def test_command_manager_stream_timeout():
+    cm = CommandManager(cmds=[["python", "-c", "import time; time.sleep(5)"]], timeout=0.2)
+    with pytest.raises(TimeoutExpired):
+        list(cm.stream_command(cm.cmds[0]))
@@ -0,0 +1,118 @@
+import threading
+import time
+from subprocess import TimeoutExpired
+
+import pytest
+
+from src.grpy.tools.command_pipeline import CommandPipeline
+from src.grpy.tools.result_cache import ResultCache
+from src.grpy.tools.spooled_output import SpoolConfig
+
+
+def python_cmd(script):
+    return ["python", "-c", script]
+
+
+@pytest.fixture
+def produce():
+    return python_cmd("for i in range(10000): print(i)")
+
+
+@pytest.fixture
+def keep_even():
+    return python_cmd(
+        "import sys\nfor line in sys.stdin:\n    if int(line) % 2 == 0: sys.stdout.write(line)"
+    )
+
+
+@pytest.fixture
+def count_lines():
+    return python_cmd("import sys; print(sum(1 for _ in sys.stdin))")
+
+
+def test_pipeline_chains_stages(produce, keep_even, count_lines):
+    pipeline = CommandPipeline(cmds=[produce, keep_even, count_lines], timeout=10.0)
+    results = pipeline.run_commands()
+
+    assert len(results) == 3
+    assert results[-1].stdout.strip() == "5000"
+    assert all(result.stdout is None for result in results[:-1])
+    assert all(result.returncode == 0 for result in results)
+
+
+def test_pipeline_validates_every_stage(produce):
+    with pytest.raises(ValueError) as exc_info:
+        CommandPipeline(cmds=[produce, ["sort"]])
+    assert "Command 'sort' is not in the permitted commands list" in str(exc_info.value)
+
+
+def test_pipeline_reports_failing_stage(produce, count_lines):
+    broken = python_cmd("import sys; sys.stdin.read(); sys.exit('filter blew up')")
+    pipeline = CommandPipeline(cmds=[produce, broken, count_lines], timeout=10.0)
+
+    with pytest.raises(RuntimeError) as exc_info:
+        pipeline.run_commands()
+
+    message = str(exc_info.value)
+    assert "Pipeline failed at stage 2" in message
+    assert "Exit code: 1" in message
+    assert "filter blew up" in message
+
+
+def test_pipeline_upstream_sigpipe_is_not_a_failure():
+    # Python ignores SIGPIPE by default; restore it to behave like yes(1) or git
+    endless = python_cmd(
+        "import signal, sys\n"
+        "signal.signal(signal.SIGPIPE, signal.SIG_DFL)\n"
+        "while True: sys.stdout.write('y\\n')"
+    )
+    head = python_cmd("import sys; print(sys.stdin.readline().strip())")
+    pipeline = CommandPipeline(cmds=[endless, head], timeout=10.0)
+
+    results = pipeline.run_commands()
+
+    assert results[-1].stdout.strip() == "y"
+
+
+def test_pipeline_without_timeout(produce, count_lines):
+    pipeline = CommandPipeline(cmds=[produce, count_lines], timeout=None)
+
+    assert pipeline.run_commands()[-1].stdout.strip() == "10000"
+
+
+def test_pipeline_overall_timeout(produce):
+    stall = python_cmd("import time; time.sleep(5)")
+    pipeline = CommandPipeline(cmds=[produce, stall], timeout=0.3)
+
+    with pytest.raises(TimeoutExpired):
+        pipeline.run_commands()
+
+
+@pytest.mark.parametrize(
+    "option",
+    [
+        {"parallel": True},
+        {"stream_output": True},
+        {"spool": SpoolConfig()},
+        {"result_cache": ResultCache()},
+        {"failure_policy": "retry"},
+        {"max_retries": 1},
+    ],
+)
+def test_pipeline_rejects_unsupported_options(produce, count_lines, option):
+    with pytest.raises(ValueError) as exc_info:
+        CommandPipeline(cmds=[produce, count_lines], **option)
+    assert f"CommandPipeline does not support: {next(iter(option))}" in str(exc_info.value)
+
+
+def test_pipeline_cancel_kills_stages(produce):
+    stall = python_cmd("import time; time.sleep(5)")
+    pipeline = CommandPipeline(cmds=[produce, stall], timeout=10.0)
+    threading.Timer(0.3, pipeline.cancel).start()
+
+    start = time.monotonic()
+    with pytest.raises(RuntimeError):
+        pipeline.run_commands()
+
+    assert time.monotonic() - start < 2.0
+    assert not pipeline._running
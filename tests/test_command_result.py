@@ -0,0 +1,77 @@
+import pytest
+
+from src.grpy.tools.command_manager import CommandManager
+from src.grpy.tools.command_result import CommandResult, byte_count
+from src.grpy.tools.process import Popen
+
+
+@pytest.fixture
+def allocate_cmd():
+    # Allocates and touches ~64MB so peak RSS is clearly above the interpreter baseline
+    return ["python", "-c", "data = bytearray(64 * 1024 * 1024); print(len(data))"]
+
+
+def test_command_result_is_slotted():
+    result = CommandResult(["git", "status"], 0)
+    assert not hasattr(result, "__dict__")
+    with pytest.raises(AttributeError):
+        result.extra = True
+
+
+def test_command_result_duration_and_cpu_time():
+    result = CommandResult(
+        ["git", "status"], 0, started_at=10.0, ended_at=12.5, user_time=0.5, system_time=0.25
+    )
+    assert result.duration == 2.5
+    assert result.cpu_time == 0.75
+    assert result.args == ["git", "status"]
+
+
+def test_command_result_cpu_time_unavailable():
+    assert CommandResult(["git", "status"], 0).cpu_time is None
+
+
+def test_command_result_to_dict():
+    result = CommandResult(["git", "status"], 1, stdout="out", stdout_bytes=3)
+    data = result.to_dict()
+    assert data["argv"] == ["git", "status"]
+    assert data["returncode"] == 1
+    assert data["stdout_bytes"] == 3
+    assert set(data) == set(CommandResult.__slots__)
+
+
+@pytest.mark.parametrize(
+    "output,expected",
+    [(None, 0), ("", 0), ("abc", 3), ("é", 2), (b"\x00\x01", 2)],
+)
+def test_byte_count(output, expected):
+    assert byte_count(output) == expected
+
+
+def test_popen_records_rusage(allocate_cmd):
+    with Popen(allocate_cmd) as process:
+        process.wait()
+    assert process.rusage is not None
+    assert process.rusage.ru_maxrss > 0
+
+
+def test_run_command_returns_metrics(allocate_cmd):
+    cm = CommandManager(cmds=[allocate_cmd], timeout=10.0)
+    result = cm.run_commands()[0]
+
+    assert isinstance(result, CommandResult)
+    assert result.returncode == 0
+    assert result.ended_at >= result.started_at
+    assert result.stdout_bytes == len(f"{64 * 1024 * 1024}\n")
+    assert result.stderr_bytes == 0
+    assert result.max_rss >= 64 * 1024 * 1024
+    assert result.user_time is not None and result.system_time is not None
+
+
+def test_stream_command_returns_metrics():
+    cm = CommandManager(cmds=[["python", "-c", "print('x' * 99)"]], stream_output=True)
+    result = cm.run_commands()[0]
+
+    assert result.stdout is None
+    assert result.stdout_bytes == 100
+    assert result.max_rss is not None
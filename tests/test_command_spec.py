@@ -0,0 +1,79 @@
+import shutil
+from unittest.mock import patch
+
+import pytest
+from pydantic import ValidationError
+
+from src.grpy.tools.command_manager import CommandManager
+from src.grpy.tools.command_spec import CommandSpec
+
+
+def test_command_spec_validates_once():
+    spec = CommandSpec(["git", "status"])
+    assert spec.argv == ("git", "status")
+    assert spec.program == "git"
+    assert spec.executable == shutil.which("git")
+
+
+def test_command_spec_splits_single_string():
+    assert CommandSpec(["git log --oneline"]).argv == ("git", "log", "--oneline")
+
+
+def test_command_spec_is_immutable():
+    spec = CommandSpec(["git", "status"])
+    with pytest.raises(AttributeError):
+        spec.argv = ("git", "push")
+    with pytest.raises(AttributeError):
+        spec.extra = 1
+
+
+def test_command_spec_rejects_non_whitelisted_command():
+    with pytest.raises(ValueError) as exc_info:
+        CommandSpec(["ls", "-la"])
+    assert "Command 'ls' is not in the permitted commands list" in str(exc_info.value)
+
+
+def test_command_spec_rejects_missing_command():
+    with pytest.raises(ValueError) as exc_info:
+        CommandSpec(["grpy-missing-tool"], cmd_whitelist=["grpy-missing-tool"])
+    assert "not found in system PATH" in str(exc_info.value)
+
+
+def test_command_spec_validate_many_resolves_each_program_once():
+    with patch(
+        "src.grpy.tools.command_spec.resolve_executable", return_value="/usr/bin/git"
+    ) as resolve:
+        specs = CommandSpec.validate_many([["git", "status"], ["git", "fetch"], ["git", "log"]])
+
+    resolve.assert_called_once_with("git")
+    assert [spec.argv[1] for spec in specs] == ["status", "fetch", "log"]
+
+
+def test_command_manager_from_specs_skips_validation():
+    specs = CommandSpec.validate_many([["git", "status"], ["python", "--version"]])
+    with patch.object(CommandManager, "validate_command") as validate_command:
+        cm = CommandManager.from_specs(specs, timeout=5.0)
+
+    validate_command.assert_not_called()
+    assert cm.cmds == [["git", "status"], ["python", "--version"]]
+    assert cm.executable_for(cm.cmds[1]) == specs[1].executable
+
+
+def test_command_manager_from_specs_enforces_manager_whitelist():
+    spec = CommandSpec(["ls", "/"], cmd_whitelist=["ls"])
+    with pytest.raises(ValidationError) as exc_info:
+        CommandManager.from_specs([spec])
+    assert "Command 'ls' is not in the permitted commands list" in str(exc_info.value)
+
+    cm = CommandManager.from_specs([spec], cmd_whitelist=["ls"])
+    assert cm.executable_for(cm.cmds[0]) == spec.executable
+
+
+def test_command_manager_from_specs_rejects_other_objects():
+    with pytest.raises(TypeError):
+        CommandManager.from_specs([["git", "status"]])
+
+
+def test_command_spec_does_not_accept_an_executable():
+    with pytest.raises(TypeError):
+        CommandSpec(["git", "status"], executable="/bin/rm")
@@ -0,0 +1,79 @@
+from pathlib import Path
+from unittest.mock import patch
+
+import pytest
+from pydantic import ValidationError
+
+from src.grpy.tools.command_manager import CommandManager
+from src.grpy.tools.command_template import CommandTemplate
+
+
+@pytest.fixture
+def fetch_template():
+    return CommandTemplate("git -C {repo} fetch --prune")
+
+
+def test_template_render(fetch_template):
+    assert fetch_template.render({"repo": "/src/a"}) == ["git", "-C", "/src/a", "fetch", "--prune"]
+    assert fetch_template.fields == {"repo"}
+
+
+def test_template_render_does_not_split_values(fetch_template):
+    argv = fetch_template.render({"repo": Path("/src/my repo; rm -rf ~")})
+    assert argv[2] == "/src/my repo; rm -rf ~"
+    assert len(argv) == 5
+
+
+def test_template_render_formatted_token():
+    template = CommandTemplate(["git", "log", "--format={fmt}", "{start}..{end}"])
+    argv = template.render({"fmt": "%H", "start": "v1", "end": "v2"})
+    assert argv == ["git", "log", "--format=%H", "v1..v2"]
+
+
+def test_template_render_missing_parameter(fetch_template):
+    with pytest.raises(KeyError):
+        fetch_template.render({"path": "/src/a"})
+
+
+def test_template_render_many(fetch_template):
+    argvs = list(fetch_template.render_many({"repo": f"/src/{i}"} for i in range(3)))
+    assert [argv[2] for argv in argvs] == ["/src/0", "/src/1", "/src/2"]
+
+
+def test_template_rejects_placeholder_program():
+    with pytest.raises(ValueError) as exc_info:
+        CommandTemplate("{tool} --version")
+    assert "program must be literal" in str(exc_info.value)
+
+
+def test_template_rejects_non_whitelisted_program():
+    with pytest.raises(ValueError) as exc_info:
+        CommandTemplate("ls {path}")
+    assert "Command 'ls' is not in the permitted commands list" in str(exc_info.value)
+
+
+def test_template_manager_skips_per_command_validation(fetch_template):
+    with patch.object(CommandManager, "validate_command") as validate_command:
+        cm = fetch_template.manager(({"repo": f"/src/{i}"} for i in range(100)), parallel=True)
+
+    validate_command.assert_not_called()
+    assert len(cm.cmds) == 100
+    assert cm.parallel is True
+    assert cm.executable_for(cm.cmds[0]) == fetch_template.executable
+
+
+def test_template_manager_still_validates_fields(fetch_template):
+    with pytest.raises(ValueError) as exc_info:
+        fetch_template.manager([{"repo": "/src/a"}], timeout=0)
+    assert "Input should be greater than 0" in str(exc_info.value)
+
+
+def test_template_run():
+    template = CommandTemplate(["python", "-c", "print({value})"])
+    results = template.run({"value": i} for i in range(3))
+    assert [result.stdout.strip() for result in results] == ["0", "1", "2"]
+
+
+def test_template_manager_enforces_manager_whitelist(fetch_template):
+    with pytest.raises(ValidationError):
+        fetch_template.manager([{"repo": "/src/a"}], cmd_whitelist=["python"])
@@ -0,0 +1,117 @@
+import subprocess
+import time
+from concurrent.futures import ThreadPoolExecutor
+from subprocess import TimeoutExpired
+
+import pytest
+
+from src.grpy.tools.command_manager import CommandManager
+from src.grpy.tools.coprocess import CoProcessPool, GitBatchProtocol
+
+WORKER = (
+    "import sys, time\n"
+    "for line in sys.stdin:\n"
+    "    request = line.strip()\n"
+    "    if request == 'exit': sys.exit(1)\n"
+    "    if request == 'sleep': time.sleep(5)\n"
+    "    print(request.upper(), flush=True)\n"
+)
+
+
+@pytest.fixture
+def command_manager():
+    return CommandManager(cmds=[["python", "--version"]], timeout=5.0)
+
+
+@pytest.fixture
+def worker_pool(command_manager):
+    with command_manager.open_coprocess(["python", "-u", "-c", WORKER], size=2) as pool:
+        yield pool
+
+
+@pytest.fixture
+def git_repo(tmp_path):
+    subprocess.run(["git", "init", "-q", str(tmp_path)], check=True)
+    blob = subprocess.run(
+        ["git", "-C", str(tmp_path), "hash-object", "-w", "--stdin"],
+        input=b"hello blob\n",
+        capture_output=True,
+        check=True,
+    )
+    return tmp_path, blob.stdout.decode().strip()
+
+
+def test_open_coprocess_enforces_whitelist(command_manager):
+    with pytest.raises(ValueError) as exc_info:
+        command_manager.open_coprocess(["ls", "-la"])
+    assert "Command 'ls' is not in the permitted commands list" in str(exc_info.value)
+
+
+def test_pool_size_validation():
+    with pytest.raises(ValueError):
+        CoProcessPool(["python"], size=0)
+
+
+def test_coprocess_reuses_process(worker_pool):
+    assert worker_pool.request("first") == b"FIRST"
+    assert worker_pool.request(b"second") == b"SECOND"
+    assert len(worker_pool._processes) == 1
+
+
+def test_coprocess_concurrent_requests(worker_pool):
+    with ThreadPoolExecutor(max_workers=4) as executor:
+        responses = list(executor.map(worker_pool.request, [f"r{i}" for i in range(50)]))
+
+    assert responses == [f"R{i}".encode() for i in range(50)]
+    assert len(worker_pool._processes) <= 2
+
+
+def test_coprocess_restarts_after_exit(worker_pool):
+    with pytest.raises(RuntimeError) as exc_info:
+        worker_pool.request("exit")
+    assert "Co-process failed" in str(exc_info.value)
+
+    assert worker_pool.request("again") == b"AGAIN"
+    assert worker_pool.restarts == 1
+
+
+def test_coprocess_without_timeout():
+    cm = CommandManager(cmds=[["python", "--version"]], timeout=None)
+    with cm.open_coprocess(["python", "-u", "-c", WORKER]) as pool:
+        assert pool.request("ping") == b"PING"
+
+
+def test_coprocess_request_timeout(worker_pool):
+    with pytest.raises(TimeoutExpired):
+        worker_pool.request("sleep", timeout=0.2)
+
+    assert worker_pool.request("recovered") == b"RECOVERED"
+
+
+def test_coprocess_request_timeout_covers_write(command_manager):
+    idle = ["python", "-c", "import time; time.sleep(5)"]
+    with command_manager.open_coprocess(idle) as pool:
+        start = time.monotonic()
+        with pytest.raises(TimeoutExpired):
+            # Far more than a pipe buffer, and nothing reads it
+            pool.request(b"x" * (4 * 1024 * 1024), timeout=0.3)
+        assert time.monotonic() - start < 2.0
+
+
+def test_coprocess_pool_closed(worker_pool):
+    worker_pool.close()
+    with pytest.raises(RuntimeError):
+        worker_pool.request("late")
+
+
+def test_git_cat_file_batch(command_manager, git_repo):
+    repo, oid = git_repo
+    cmd = ["git", "-C", str(repo), "cat-file", "--batch"]
+    with command_manager.open_coprocess(cmd, protocol=GitBatchProtocol()) as pool:
+        obj = pool.request(oid)
+        missing = pool.request("0" * 40)
+
+    assert obj.oid == oid
+    assert obj.type == "blob"
+    assert obj.content == b"hello blob\n"
+    assert missing.type == "missing"
@@ -0,0 +1,77 @@
+import os
+import shutil
+from unittest.mock import patch
+
+import pytest
+
+from src.grpy.tools.executable_cache import ExecutableCache
+
+
+@pytest.fixture
+def bin_dir(tmp_path):
+    directory = tmp_path / "bin"
+    directory.mkdir()
+    return directory
+
+
+def make_executable(directory, name):
+    target = directory / name
+    target.write_text("#!/bin/sh\n")
+    target.chmod(0o755)
+    return target
+
+
+def test_resolve_returns_absolute_path(bin_dir):
+    target = make_executable(bin_dir, "tool")
+    cache = ExecutableCache()
+    assert cache.resolve("tool", path=str(bin_dir)) == str(target)
+
+
+def test_resolve_missing_executable(bin_dir):
+    cache = ExecutableCache()
+    assert cache.resolve("missing", path=str(bin_dir)) is None
+
+
+def test_resolve_is_cached(bin_dir):
+    make_executable(bin_dir, "tool")
+    cache = ExecutableCache()
+
+    with patch("shutil.which", wraps=shutil.which) as mock_which:
+        for _ in range(10):
+            cache.resolve("tool", path=str(bin_dir))
+
+    assert mock_which.call_count == 1
+
+
+def test_resolve_keyed_on_path(bin_dir, tmp_path):
+    other_dir = tmp_path / "other"
+    other_dir.mkdir()
+    make_executable(bin_dir, "tool")
+    other = make_executable(other_dir, "tool")
+    cache = ExecutableCache()
+
+    cache.resolve("tool", path=str(bin_dir))
+    assert cache.resolve("tool", path=str(other_dir)) == str(other)
+
+
+def test_directory_change_invalidates_entry(bin_dir):
+    cache = ExecutableCache(recheck_interval=0)
+    assert cache.resolve("tool", path=str(bin_dir)) is None
+
+    target = make_executable(bin_dir, "tool")
+    # Guarantee a visible mtime change on filesystems with coarse timestamps
+    stat = os.stat(bin_dir)
+    os.utime(bin_dir, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+
+    assert cache.resolve("tool", path=str(bin_dir)) == str(target)
+
+
+def test_clear(bin_dir):
+    make_executable(bin_dir, "tool")
+    cache = ExecutableCache()
+    cache.resolve("tool", path=str(bin_dir))
+    cache.clear()
+
+    with patch("shutil.which", wraps=shutil.which) as mock_which:
+        cache.resolve("tool", path=str(bin_dir))
+    assert mock_which.call_count == 1
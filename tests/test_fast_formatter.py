@@ -0,0 +1,92 @@
+import logging
+import sys
+import time
+
+import pytest
+
+from src.grpy.tools.fast_formatter import FastFormatter, compile_format
+from src.grpy.tools.log_manager import LogManager
+
+
+def make_record(message="Command failed: %s", args=("git fetch",), created=1700000000.123456):
+    record = logging.LogRecord("grpy", logging.ERROR, __file__, 12, message, args, None)
+    record.created = created
+    record.msecs = int((created - int(created)) * 1000) + 0.0
+    return record
+
+
+@pytest.mark.parametrize(
+    "fmt",
+    [
+        "%(asctime)s - %(levelname)s - %(message)s",
+        "%(asctime)s %(levelname)-8s %(name)s:%(lineno)d %(message)s",
+        "[%(levelno)03d] %(message)r 100%%",
+    ],
+)
+def test_matches_stdlib_formatter(fmt):
+    record = make_record()
+    assert FastFormatter(fmt).format(record) == logging.Formatter(fmt).format(record)
+
+
+def test_matches_stdlib_with_datefmt():
+    record = make_record()
+    expected = logging.Formatter("%(asctime)s %(message)s", datefmt="%Y-%m-%d").format(record)
+    formatter = FastFormatter("%(asctime)s %(message)s", datefmt="%Y-%m-%d", precision=0)
+    assert formatter.format(record) == expected
+
+
+def test_sub_second_precision():
+    formatter = FastFormatter("%(asctime)s", datefmt="%H:%M:%S", precision=6, separator=".")
+    assert formatter.format(make_record()).endswith(".123456")
+
+
+def test_timestamp_prefix_cached_per_second(monkeypatch):
+    calls = []
+    formatter = FastFormatter("%(asctime)s")
+    strftime = time.strftime
+
+    def counting_strftime(*args):
+        calls.append(args)
+        return strftime(*args)
+
+    monkeypatch.setattr("src.grpy.tools.fast_formatter.time.strftime", counting_strftime)
+    for i in range(10):
+        formatter.format(make_record(created=1700000000 + i / 10))
+    formatter.format(make_record(created=1700000001.5))
+    assert len(calls) == 2
+
+
+def test_exception_and_missing_field():
+    formatter = FastFormatter("%(message)s")
+    try:
+        raise RuntimeError("boom")
+    except RuntimeError:
+        record = make_record()
+        record.exc_info = sys.exc_info()
+    text = formatter.format(record)
+    assert text.startswith("Command failed: git fetch\nTraceback")
+    assert text.endswith("RuntimeError: boom")
+
+    with pytest.raises(ValueError):
+        FastFormatter("%(missing)s").format(make_record())
+
+
+def test_compile_format_reads_extra_fields():
+    render = compile_format("%(argv)s rc=%(returncode)d")
+    record = make_record()
+    record.argv = ["git", "status"]
+    record.returncode = 1
+    assert render(record, "", "") == "['git', 'status'] rc=1"
+
+
+def test_invalid_precision():
+    with pytest.raises(ValueError):
+        FastFormatter(precision=10)
+
+
+def test_log_manager_fast_format(log_handler):
+    LogManager(handler=log_handler, fast_format=True)
+    assert isinstance(log_handler.formatter, FastFormatter)
+    record = make_record()
+    expected = LogManager(handler=logging.StreamHandler()).formatter().format(record)
+    assert log_handler.formatter.format(record) == expected
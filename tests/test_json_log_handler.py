@@ -0,0 +1,104 @@
+import io
+import json
+import logging
+import time
+
+import pytest
+
+from src.grpy.tools.command_manager import CommandManager
+from src.grpy.tools.json_log_handler import JsonLinesHandler
+
+
+class CountingStream(io.StringIO):
+    def __init__(self):
+        super().__init__()
+        self.writes = 0
+
+    def write(self, text):
+        self.writes += 1
+        return super().write(text)
+
+
+@pytest.fixture
+def json_logger():
+    stream = CountingStream()
+    handler = JsonLinesHandler(stream, batch_size=10, flush_interval=60)
+    logger = logging.getLogger("grpy_json_test")
+    logger.setLevel(logging.DEBUG)
+    logger.propagate = False
+    logger.addHandler(handler)
+    yield logger, handler, stream
+    logger.removeHandler(handler)
+    handler.close()
+
+
+def read_lines(stream):
+    return [json.loads(line) for line in stream.getvalue().splitlines()]
+
+
+def test_json_handler_serializes_record_and_extra(json_logger):
+    logger, handler, stream = json_logger
+    logger.info("ran %s", "git", extra={"argv": ["git", "status"], "returncode": 0})
+    handler.flush()
+
+    (line,) = read_lines(stream)
+    assert line["message"] == "ran git"
+    assert line["level"] == "INFO"
+    assert line["logger"] == "grpy_json_test"
+    assert line["argv"] == ["git", "status"]
+    assert line["returncode"] == 0
+    assert isinstance(line["ts"], float)
+    assert "args" not in line and "msg" not in line
+
+
+def test_json_handler_batches_writes(json_logger):
+    logger, handler, stream = json_logger
+    for i in range(25):
+        logger.info("record %d", i)
+
+    assert stream.writes == 2
+    handler.flush()
+    assert [line["message"] for line in read_lines(stream)] == [f"record {i}" for i in range(25)]
+    assert stream.writes == 3
+
+
+def test_json_handler_flushes_idle_buffer_after_interval():
+    stream = CountingStream()
+    handler = JsonLinesHandler(stream, batch_size=100, flush_interval=0.05)
+    logger = logging.getLogger("grpy_json_idle_test")
+    logger.propagate = False
+    logger.addHandler(handler)
+    try:
+        logger.warning("burst")
+
+        deadline = time.monotonic() + 5
+        while not stream.writes and time.monotonic() < deadline:
+            time.sleep(0.01)
+        assert [line["message"] for line in read_lines(stream)] == ["burst"]
+    finally:
+        logger.removeHandler(handler)
+        handler.close()
+
+
+def test_json_handler_flushes_errors_immediately(json_logger):
+    logger, _, stream = json_logger
+    logger.info("queued")
+    try:
+        raise ValueError("boom")
+    except ValueError:
+        logger.exception("failed")
+
+    lines = read_lines(stream)
+    assert [line["message"] for line in lines] == ["queued", "failed"]
+    assert "ValueError: boom" in lines[1]["exc_info"]
+
+
+def test_json_handler_receives_command_fields(json_logger):
+    logger, handler, stream = json_logger
+    CommandManager(cmds=[["python", "-c", "pass"]], logger=logger).run_commands()
+    handler.flush()
+
+    completed = [line for line in read_lines(stream) if "returncode" in line]
+    assert completed[0]["argv"] == ["python", "-c", "pass"]
+    assert completed[0]["returncode"] == 0
+    assert completed[0]["duration"] >= 0
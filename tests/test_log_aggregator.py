@@ -0,0 +1,129 @@
+import logging
+import multiprocessing
+import os
+import time
+
+import pytest
+
+from src.grpy.tools.log_aggregator import AggregatingHandler, LogAggregator
+from src.grpy.tools.log_manager import LogManager
+
+
+class CollectingHandler(logging.Handler):
+    def __init__(self, level=logging.NOTSET):
+        super().__init__(level)
+        self.messages = []
+
+    def emit(self, record):
+        self.messages.append(record.getMessage())
+
+
+@pytest.fixture
+def socket_path():
+    path = f"/tmp/grpy-log-{os.getpid()}.sock"
+    yield path
+    if os.path.exists(path):
+        os.unlink(path)
+
+
+def make_record(message, level=logging.INFO, **extra):
+    record = logging.makeLogRecord(
+        {"msg": message, "levelno": level, "levelname": logging.getLevelName(level)}
+    )
+    record.__dict__.update(extra)
+    return record
+
+
+def test_aggregator_receives_batched_records(socket_path):
+    target = CollectingHandler()
+    with LogAggregator(socket_path, [target]):
+        sender = AggregatingHandler(socket_path, batch_size=10)
+        for i in range(25):
+            sender.handle(make_record(f"record {i}", argv=["git", "status"]))
+        sender.close()
+
+    assert target.messages == [f"record {i}" for i in range(25)]
+    assert sender.dropped == 0
+
+
+def test_aggregator_respects_handler_level(socket_path):
+    target = CollectingHandler(logging.WARNING)
+    with LogAggregator(socket_path, [target]):
+        sender = AggregatingHandler(socket_path)
+        sender.handle(make_record("info"))
+        sender.handle(make_record("warning", logging.WARNING))
+        sender.close()
+
+    assert target.messages == ["warning"]
+
+
+def test_sender_never_blocks_without_aggregator(socket_path):
+    sender = AggregatingHandler(socket_path, queue_size=5)
+    for i in range(10):
+        sender.handle(make_record(f"record {i}"))
+    sender.close()
+
+    # Five were dropped by the full queue, the rest because nobody was listening
+    assert sender.dropped == 10
+
+
+@pytest.mark.skipif(not hasattr(os, "fork"), reason="requires fork")
+def test_forked_sender_does_not_resend_parent_records(socket_path):
+    target = CollectingHandler()
+    with LogAggregator(socket_path, [target]):
+        sender = AggregatingHandler(socket_path, batch_size=1000, flush_interval=10.0)
+        sender.handle(make_record("parent record"))
+        pid = os.fork()
+        if pid == 0:
+            sender.handle(make_record("child record"))
+            sender.close()
+            os._exit(0)
+        os.waitpid(pid, 0)
+        sender.close()
+        # The aggregator reads each connection on its own thread
+        deadline = time.monotonic() + 5
+        while len(target.messages) < 2 and time.monotonic() < deadline:
+            time.sleep(0.01)
+        time.sleep(0.1)
+
+    assert sorted(target.messages) == ["child record", "parent record"]
+
+
+def log_from_worker(index):
+    lm = LogManager.current()
+    for i in range(50):
+        lm.info(f"worker {index} line {i}")
+
+
+def init_worker(path):
+    LogManager(aggregate_to=path)
+
+
+@pytest.mark.skipif("fork" not in multiprocessing.get_all_start_methods(), reason="requires fork")
+def test_log_manager_aggregates_worker_processes(socket_path):
+    target = CollectingHandler()
+    lm = LogManager(handler=target)
+    lm.start_aggregator(socket_path)
+    lm.info("parent")
+
+    context = multiprocessing.get_context("fork")
+    with context.Pool(3, initializer=init_worker, initargs=(socket_path,)) as pool:
+        pool.map(log_from_worker, range(3))
+        pool.close()
+        pool.join()
+    lm.stop_aggregation()
+
+    assert target.messages[0] == "parent"
+    assert len(target.messages) == 151
+
+    for index in range(3):
+        lines = [message for message in target.messages if message.startswith(f"worker {index} ")]
+        assert lines == [f"worker {index} line {i}" for i in range(50)]
+
+
+def test_aggregator_refuses_live_socket(socket_path):
+    with LogAggregator(socket_path, [CollectingHandler()]):
+        with pytest.raises(RuntimeError) as exc_info:
+            LogAggregator(socket_path, [CollectingHandler()]).start()
+        assert "in use" in str(exc_info.value)
+    assert not os.path.exists(socket_path)
@@ -2,6 +2,7 @@ import logging
 
 import pytest
 
+from grpy.tools.json_log_handler import JsonLinesHandler
 from grpy.tools.log_handler import LogHandler
 
 
@@ -24,3 +25,8 @@ class TestLogHandler:
         handler = LogHandler()
         with pytest.raises(KeyError):
             handler.create(handler_type="INVALID")
+
+    def test_create_json_handler(self):
+        handler = LogHandler()
+        result = handler.create(handler_type="JSON")
+        assert isinstance(result, JsonLinesHandler)
@@ -1,8 +1,10 @@
 import logging
+import threading
+import time
 
 import pytest
 
-from grpy.tools.log_manager import LogManager
+from grpy.tools.log_manager import LogManager, log_lazy
 
 
 def test_log_manager_initialization_defaults():
@@ -104,3 +106,125 @@ def test_log_manager_add_handler():
     lm.add_handler(logging.StreamHandler())
 
     assert len(lm.handlers) == 1
+
+
+class GatedHandler(logging.Handler):
+    """Collects messages, but only once the gate is opened."""
+
+    def __init__(self):
+        super().__init__()
+        self.gate = threading.Event()
+        self.messages = []
+
+    def emit(self, record):
+        self.gate.wait(5)
+        self.messages.append(record.getMessage())
+
+
+def test_log_manager_async_mode_delivers_on_stop():
+    handler = GatedHandler()
+    lm = LogManager(handler=handler, async_mode=True)
+    assert handler not in lm.handlers
+
+    for i in range(5):
+        lm.info(f"record {i}")
+    assert handler.messages == []
+
+    handler.gate.set()
+    lm.stop_listener()
+
+    assert handler.messages == [f"record {i}" for i in range(5)]
+    assert lm.dropped_records == 0
+    assert lm.handlers == []
+
+
+@pytest.mark.parametrize(
+    "overflow_policy,kept",
+    [("drop_new", ["first", "second"]), ("drop_oldest", ["first", "fourth"])],
+)
+def test_log_manager_async_overflow_policy(overflow_policy, kept):
+    handler = GatedHandler()
+    lm = LogManager(handler=handler, async_mode=True, queue_size=1, overflow_policy=overflow_policy)
+
+    lm.info("first")
+    # Wait for the listener to pick up "first" and block in the handler
+    deadline = time.monotonic() + 5
+    while lm._queue_handler.queue.qsize() and time.monotonic() < deadline:
+        time.sleep(0.01)
+    for message in ("second", "third", "fourth"):
+        lm.info(message)
+
+    handler.gate.set()
+    lm.stop_listener()
+
+    assert handler.messages == kept
+    assert lm.dropped_records == 2
+
+
+def test_log_manager_reinit_stops_listener():
+    handler = GatedHandler()
+    handler.gate.set()
+    lm = LogManager(handler=handler, async_mode=True)
+    lm.info("queued")
+
+    LogManager(handler=handler)
+
+    assert handler.messages == ["queued"]
+    assert lm.handlers == [handler]
+
+
+def test_log_manager_current_keeps_configuration():
+    lm = LogManager(log_level="DEBUG", async_mode=True)
+    try:
+        assert LogManager.current() is lm
+        assert lm.async_mode is True
+        assert lm.log_level == "DEBUG"
+    finally:
+        lm.stop_listener()
+
+
+def test_log_manager_log_lazy_skips_disabled_level(caplog):
+    lm = LogManager(log_level="WARNING")
+    calls = []
+
+    def build():
+        calls.append(1)
+        return "expensive message"
+
+    with caplog.at_level(logging.DEBUG, logger=lm.log_handle):
+        lm.setLevel(logging.WARNING)
+        lm.log_lazy(logging.INFO, build)
+        assert calls == []
+        assert lm.is_enabled(logging.INFO) is False
+
+        lm.log_lazy(logging.WARNING, build)
+
+    assert calls == [1]
+    assert caplog.records[-1].getMessage() == "expensive message"
+    assert caplog.records[-1].funcName == "test_log_manager_log_lazy_skips_disabled_level"
+
+
+def test_log_lazy_with_plain_logger(caplog):
+    logger = logging.getLogger("grpy_lazy_test")
+    logger.setLevel(logging.INFO)
+
+    with caplog.at_level(logging.INFO, logger="grpy_lazy_test"):
+        log_lazy(logger, logging.DEBUG, lambda: pytest.fail("built a disabled message"))
+        log_lazy(logger, logging.INFO, lambda: "built")
+
+    assert [record.getMessage() for record in caplog.records] == ["built"]
+    assert caplog.records[0].funcName == "test_log_lazy_with_plain_logger"
+
+
+def test_log_manager_delegates_without_getattr(caplog):
+    lm = LogManager()
+    assert lm.info == lm.logger.info
+    assert "info" in vars(lm)
+
+    with caplog.at_level(logging.DEBUG, logger=lm.log_handle):
+        lm.setLevel(logging.WARNING)
+        lm.info("hidden")
+        lm.setLevel(logging.DEBUG)
+        lm.debug("shown")
+
+    assert [record.getMessage() for record in caplog.records] == ["shown"]
@@ -0,0 +1,85 @@
+import io
+import json
+import logging
+
+from src.grpy.tools.json_log_handler import JsonLinesHandler
+from src.grpy.tools.log_manager import LogManager
+from src.grpy.tools.log_metrics import LATENCY_BUCKETS_NS, HandlerStats, LogMetrics
+
+
+def test_histogram_buckets():
+    stats = HandlerStats("test")
+    for elapsed in (500, 1_000, 1_001, 3_000_000, 5_000_000_000):
+        stats.observe(elapsed)
+
+    snapshot = stats.snapshot()
+    assert snapshot["count"] == 5
+    assert snapshot["max_ns"] == 5_000_000_000
+    assert snapshot["buckets"][0] == 2
+    assert snapshot["buckets"][1] == 1
+    assert snapshot["buckets"][LATENCY_BUCKETS_NS.index(5_000_000)] == 1
+    assert snapshot["buckets"][-1] == 1
+    assert sum(snapshot["buckets"]) == 5
+
+
+def test_instrument_and_restore_handler():
+    stream = io.StringIO()
+    handler = logging.StreamHandler(stream)
+    logger = logging.getLogger("grpy-metrics-test")
+    logger.propagate = False
+    logger.setLevel(logging.INFO)
+    logger.addHandler(handler)
+    metrics = LogMetrics()
+    metrics.instrument(handler)
+    try:
+        logger.info("hello")
+        logger.warning("world")
+        logging.getLogger("grpy-metrics-test.child").error("propagated: é")
+        snapshot = metrics.snapshot()
+    finally:
+        logger.removeHandler(handler)
+        metrics.close()
+
+    assert snapshot["levels"] == {"INFO": 1, "WARNING": 1, "ERROR": 1}
+    assert snapshot["loggers"] == {"grpy-metrics-test": 2, "grpy-metrics-test.child": 1}
+    assert snapshot["handlers"]["StreamHandler"]["count"] == 3
+    # é is two bytes in UTF-8
+    assert snapshot["bytes"] == len("hello") + len("world") + len("propagated: é") + 1
+    assert "emit" not in handler.__dict__ and "format" not in handler.__dict__
+    json.dumps(snapshot)
+
+
+def test_log_manager_metrics(log_handler):
+    json_handler = JsonLinesHandler(io.StringIO(), batch_size=1)
+    json_handler.set_name("json")
+    log_manager = LogManager(handler=log_handler, instrument=True)
+    log_manager.addHandler(json_handler)
+    log_manager.enable_metrics()
+    log_manager.info("Command completed successfully: git status")
+    log_manager.error("Command failed: git fetch")
+
+    snapshot = log_manager.metrics_snapshot()
+    assert snapshot["records"] == 2
+    assert snapshot["levels"] == {"INFO": 1, "ERROR": 1}
+    assert set(snapshot["handlers"]) == {"StreamHandler", "json"}
+    assert snapshot["handlers"]["json"]["count"] == 2
+    assert snapshot["handlers"]["json"]["bytes"] > snapshot["handlers"]["StreamHandler"]["bytes"]
+
+    log_manager.disable_metrics()
+    assert log_manager.metrics_snapshot() == {}
+    assert "emit" not in log_handler.__dict__
+    for handler in (json_handler, log_handler):
+        log_manager.removeHandler(handler)
+
+
+def test_log_manager_metrics_async(log_handler):
+    log_manager = LogManager(handler=log_handler, async_mode=True, instrument=True)
+    log_manager.info("queued")
+    log_manager.stop_listener()
+
+    snapshot = log_manager.metrics_snapshot()
+    assert snapshot["records"] == 1
+    handlers = snapshot["handlers"]
+    assert handlers["StreamHandler"]["count"] == 1
+    assert handlers["BoundedQueueHandler"]["count"] == 1
+    assert handlers["BoundedQueueHandler"]["bytes"] == 0
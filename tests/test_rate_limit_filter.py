@@ -0,0 +1,126 @@
+import logging
+
+import pytest
+
+from src.grpy.tools.log_manager import LogManager
+from src.grpy.tools.rate_limit_filter import RateLimitFilter
+
+
+class CollectingHandler(logging.Handler):
+    def __init__(self):
+        super().__init__()
+        self.messages = []
+
+    def emit(self, record):
+        self.messages.append(record.getMessage())
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr("src.grpy.tools.rate_limit_filter.time.monotonic", lambda: now[0])
+    return now
+
+
+@pytest.fixture
+def logger():
+    logger = logging.getLogger("grpy-rate-limit-test")
+    logger.propagate = False
+    logger.setLevel(logging.INFO)
+    target = CollectingHandler()
+    logger.addHandler(target)
+    yield logger
+    logger.removeHandler(target)
+    for log_filter in logger.filters[:]:
+        logger.removeFilter(log_filter)
+
+
+def messages(logger):
+    return logger.handlers[0].messages
+
+
+def test_consecutive_duplicates_collapse_into_summary(logger, clock):
+    rate_limit = RateLimitFilter(rate=100).attach(logger)
+    for _ in range(5):
+        logger.error("Command failed: git fetch")
+    logger.info("Command completed successfully: git status")
+
+    assert messages(logger) == [
+        "Command failed: git fetch",
+        "Last message repeated 4 times",
+        "Command completed successfully: git status",
+    ]
+    assert rate_limit.suppressed == 4
+
+
+def test_duplicate_after_quiet_window_passes(logger, clock):
+    RateLimitFilter(rate=100, window=1.0).attach(logger)
+    for _ in range(3):
+        logger.error("Command failed: git fetch")
+        clock[0] += 0.5
+    clock[0] += 3600
+    logger.error("Command failed: git fetch")
+
+    assert messages(logger) == [
+        "Command failed: git fetch",
+        "Last message repeated 2 times",
+        "Command failed: git fetch",
+    ]
+
+
+def test_rate_limits_interleaved_records_per_window(logger, clock):
+    rate_limit = RateLimitFilter(rate=2, window=1.0).attach(logger)
+    for i in range(4):
+        logger.info("line a")
+        logger.info("line b")
+    assert messages(logger) == ["line a", "line b", "line a", "line b"]
+    assert rate_limit.suppressed == 4
+
+    clock[0] += 1.0
+    logger.info("line a")
+    assert messages(logger)[4:] == ["Suppressed 2 records like: line a", "line a"]
+
+
+def test_flush_reports_open_run(logger, clock):
+    rate_limit = RateLimitFilter().attach(logger)
+    for _ in range(3):
+        logger.warning("retrying")
+    rate_limit.flush()
+    rate_limit.flush()
+
+    assert messages(logger) == ["retrying", "Last message repeated 2 times"]
+
+
+def test_key_table_is_bounded(logger, clock):
+    rate_limit = RateLimitFilter(rate=1, max_keys=8, collapse=False).attach(logger)
+    for i in range(100):
+        logger.info(f"output line {i}")
+
+    assert len(rate_limit._keys) == 8
+    assert len(messages(logger)) == 100
+
+
+def test_attached_to_handler(clock):
+    target = CollectingHandler()
+    RateLimitFilter().attach(target)
+    record = logging.makeLogRecord({"msg": "same", "levelno": logging.INFO})
+    for _ in range(3):
+        target.handle(record)
+    target.handle(logging.makeLogRecord({"msg": "other", "levelno": logging.INFO}))
+
+    assert target.messages == ["same", "Last message repeated 2 times", "other"]
+
+
+def test_log_manager_rate_limit(clock):
+    target = CollectingHandler()
+    log_manager = LogManager(handler=target)
+    log_manager.add_rate_limit(rate=10)
+    for _ in range(1000):
+        log_manager.error("Command failed: flaky")
+    assert target.messages == ["Command failed: flaky"]
+    assert log_manager.suppressed_records == 999
+
+    log_manager.remove_rate_limit()
+    assert target.messages[-1] == "Last message repeated 999 times"
+    assert log_manager.logger.filters == []
+    assert log_manager.suppressed_records == 0
@@ -0,0 +1,115 @@
+import os
+from unittest.mock import patch
+
+import pytest
+
+from src.grpy.tools.command_manager import CommandManager
+from src.grpy.tools.command_result import CommandResult
+from src.grpy.tools.result_cache import ResultCache
+
+
+@pytest.fixture
+def version_cmd():
+    return ["python", "-c", "import time; print(time.time())"]
+
+
+@pytest.fixture
+def result():
+    return CommandResult(["git", "rev-parse", "HEAD"], 0, stdout="abc123\n")
+
+
+def test_cache_hit_and_miss(result):
+    cache = ResultCache()
+    key = cache.key(result.argv)
+
+    assert cache.get(key) is None
+    cache.put(key, result)
+    assert cache.get(key) is result
+    assert cache.stats() == {"hits": 1, "misses": 1, "disk_hits": 0, "size": 1}
+
+
+def test_cache_lru_eviction():
+    cache = ResultCache(maxsize=2)
+    keys = [cache.key(["git", str(i)]) for i in range(3)]
+    for key in keys:
+        cache.put(key, CommandResult(list(key[0]), 0))
+        cache.get(keys[0])
+
+    assert cache.get(keys[0]) is not None
+    assert cache.get(keys[1]) is None
+    assert cache.get(keys[2]) is not None
+
+
+def test_cache_ttl(result):
+    cache = ResultCache(ttl=10.0)
+    key = cache.key(result.argv)
+    with patch("src.grpy.tools.result_cache.time.time", return_value=1000.0):
+        cache.put(key, result)
+    with patch("src.grpy.tools.result_cache.time.time", return_value=1005.0):
+        assert cache.get(key) is result
+    with patch("src.grpy.tools.result_cache.time.time", return_value=1011.0):
+        assert cache.get(key) is None
+
+
+def test_cache_key_includes_env(monkeypatch, result):
+    cache = ResultCache(env_keys=["GRPY_TEST_ENV"])
+    monkeypatch.setenv("GRPY_TEST_ENV", "one")
+    cache.put(cache.key(result.argv), result)
+
+    monkeypatch.setenv("GRPY_TEST_ENV", "two")
+    assert cache.get(cache.key(result.argv)) is None
+
+
+def test_cache_key_includes_input_fingerprints(tmp_path, result):
+    head = tmp_path / "HEAD"
+    head.write_text("ref: refs/heads/main\n")
+    cache = ResultCache(input_paths=[str(head)])
+    cache.put(cache.key(result.argv), result)
+    assert cache.get(cache.key(result.argv)) is result
+
+    head.write_text("ref: refs/heads/feature\n")
+    stat = os.stat(head)
+    os.utime(head, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+    assert cache.get(cache.key(result.argv)) is None
+
+
+def test_cache_disk_store(tmp_path, result):
+    first = ResultCache(directory=str(tmp_path))
+    first.put(first.key(result.argv), result)
+
+    second = ResultCache(directory=str(tmp_path))
+    cached = second.get(second.key(result.argv))
+
+    assert cached.stdout == "abc123\n"
+    assert second.disk_hits == 1
+
+    second.clear()
+    assert os.listdir(tmp_path) == []
+
+
+def test_cache_invalid_maxsize():
+    with pytest.raises(ValueError):
+        ResultCache(maxsize=0)
+
+
+def test_command_manager_uses_cache(version_cmd):
+    cache = ResultCache()
+    cm = CommandManager(cmds=[version_cmd, version_cmd], result_cache=cache)
+
+    first, second = cm.run_commands()
+
+    assert first is second
+    assert cache.hits == 1
+    assert cache.misses == 1
+
+
+def test_command_manager_does_not_cache_failures():
+    cache = ResultCache()
+    cm = CommandManager(cmds=[["python", "-c", "import sys; sys.exit(1)"]], result_cache=cache)
+
+    for _ in range(2):
+        with pytest.raises(RuntimeError):
+            cm.run_commands()
+
+    assert cache.stats()["size"] == 0
+    assert cache.misses == 2
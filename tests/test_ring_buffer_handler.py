@@ -0,0 +1,121 @@
+import logging
+
+import pytest
+
+from src.grpy.tools.command_manager import CommandManager
+from src.grpy.tools.ring_buffer_handler import ByteRing, RingBufferHandler
+
+
+class CollectingHandler(logging.Handler):
+    def __init__(self, level=logging.NOTSET):
+        super().__init__(level)
+        self.messages = []
+
+    def emit(self, record):
+        self.messages.append(record.getMessage())
+
+
+def make_record(message, level=logging.DEBUG):
+    return logging.makeLogRecord(
+        {"msg": message, "levelno": level, "levelname": logging.getLevelName(level)}
+    )
+
+
+def test_ring_buffer_holds_records_until_trigger():
+    target = CollectingHandler()
+    ring = RingBufferHandler(target=target, capacity=3)
+
+    for i in range(5):
+        ring.handle(make_record(f"debug {i}"))
+    assert target.messages == []
+    assert [record.getMessage() for record in ring.records()] == ["debug 2", "debug 3", "debug 4"]
+
+    ring.handle(make_record("failed", logging.ERROR))
+
+    assert target.messages == ["debug 3", "debug 4", "failed"]
+    assert len(ring) == 0
+
+
+def test_ring_buffer_bounds_bytes():
+    ring = RingBufferHandler(target=CollectingHandler(), capacity=100, max_bytes=25)
+    ring.setFormatter(logging.Formatter("%(message)s"))
+    for i in range(5):
+        ring.handle(make_record(f"record {i}"))
+
+    # Each formatted line is 9 bytes, so only two fit in 25
+    assert [record.getMessage() for record in ring.records()] == ["record 3", "record 4"]
+
+
+def test_ring_buffer_flush_does_not_dump():
+    target = CollectingHandler()
+    ring = RingBufferHandler(target=target)
+    ring.handle(make_record("debug"))
+
+    ring.flush()
+    assert target.messages == []
+
+    ring.flush_buffer()
+    assert target.messages == ["debug"]
+
+
+def test_ring_buffer_rejects_empty_capacity():
+    with pytest.raises(ValueError):
+        RingBufferHandler(capacity=0)
+
+
+def test_ring_buffer_mmap_dump(tmp_path):
+    path = str(tmp_path / "ring.dump")
+    ring = RingBufferHandler(target=CollectingHandler(), dump_path=path, dump_bytes=64)
+    ring.setFormatter(logging.Formatter("%(message)s"))
+    for i in range(20):
+        ring.handle(make_record(f"line {i:02d}"))
+
+    # Readable without closing the handler, as after a crash
+    lines = ByteRing.read_dump(path)
+    assert lines[-1] == "line 19"
+    assert lines == [f"line {i:02d}" for i in range(20 - len(lines), 20)]
+    assert 0 < len(lines) < 20
+    ring.close()
+
+
+@pytest.mark.parametrize(
+    "lines, expected",
+    [
+        ([b"aaa\n", b"bbb\n", b"ccc\n", b"ddd\n"], ["ccc", "ddd"]),
+        ([b"aaa\n", b"bbb\n", b"cc\n"], ["bbb", "cc"]),
+    ],
+)
+def test_byte_ring_read_dump_after_wrapping(tmp_path, lines, expected):
+    path = str(tmp_path / "ring.dump")
+    ring = ByteRing(path, 8)
+    for line in lines:
+        ring.write(line)
+    ring.close()
+
+    assert ByteRing.read_dump(path) == expected
+
+
+def test_ring_buffer_read_dump_rejects_other_files(tmp_path):
+    path = tmp_path / "other"
+    path.write_bytes(b"x" * 32)
+    with pytest.raises(ValueError):
+        ByteRing.read_dump(str(path))
+
+
+def test_ring_buffer_dumps_debug_context_on_command_failure():
+    target = CollectingHandler()
+    logger = logging.getLogger("grpy_ring_test")
+    logger.setLevel(logging.DEBUG)
+    logger.propagate = False
+    ring = RingBufferHandler(target=target)
+    logger.addHandler(ring)
+    try:
+        logger.debug("context before the failure")
+        cm = CommandManager(cmds=[["python", "-c", "import sys; sys.exit(1)"]], logger=logger)
+        with pytest.raises(RuntimeError):
+            cm.run_commands()
+    finally:
+        logger.removeHandler(ring)
+
+    assert target.messages[0] == "context before the failure"
+    assert target.messages[-1].startswith("Command failed")
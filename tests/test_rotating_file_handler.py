@@ -0,0 +1,96 @@
+import gzip
+import logging
+import lzma
+import time
+
+import pytest
+
+from src.grpy.tools.rotating_file_handler import BufferedRotatingFileHandler
+
+
+def make_record(message, level=logging.INFO):
+    return logging.makeLogRecord({"msg": message, "levelno": level, "levelname": "INFO"})
+
+
+@pytest.fixture
+def log_path(tmp_path):
+    return tmp_path / "grpy.log"
+
+
+def test_file_handler_buffers_until_threshold(log_path):
+    handler = BufferedRotatingFileHandler(str(log_path), buffer_bytes=100, flush_interval=60)
+    handler.emit(make_record("first"))
+    assert not log_path.exists() or log_path.read_text() == ""
+
+    handler.emit(make_record("x" * 100))
+    assert log_path.read_text().splitlines() == ["first", "x" * 100]
+    handler.close()
+
+
+def test_file_handler_flushes_idle_buffer_after_interval(log_path):
+    handler = BufferedRotatingFileHandler(str(log_path), flush_interval=0.05)
+    try:
+        handler.emit(make_record("burst"))
+
+        deadline = time.monotonic() + 5
+        while not (log_path.exists() and log_path.read_text()) and time.monotonic() < deadline:
+            time.sleep(0.01)
+        assert log_path.read_text().splitlines() == ["burst"]
+    finally:
+        handler.close()
+
+
+def test_file_handler_flushes_errors_and_on_close(log_path):
+    handler = BufferedRotatingFileHandler(str(log_path), flush_interval=60)
+    handler.emit(make_record("queued"))
+    handler.emit(make_record("failed", logging.ERROR))
+    assert log_path.read_text().splitlines() == ["queued", "failed"]
+
+    handler.emit(make_record("last"))
+    handler.close()
+    assert log_path.read_text().splitlines()[-1] == "last"
+
+
+@pytest.mark.parametrize(
+    "compression,opener,extension", [("gzip", gzip.open, ".gz"), ("lzma", lzma.open, ".xz")]
+)
+def test_file_handler_rotates_by_size_and_compresses(log_path, compression, opener, extension):
+    handler = BufferedRotatingFileHandler(
+        str(log_path), buffer_bytes=1, max_bytes=50, compression=compression, backup_count=10
+    )
+    for i in range(6):
+        handler.emit(make_record(f"record {i:02d} " + "x" * 20))
+    handler.close()
+
+    segments = handler.segments()
+    assert len(segments) == 5
+    assert all(path.endswith(extension) for path in segments)
+    rotated = [opener(path, "rt").read() for path in segments]
+    assert rotated[0].startswith("record 00")
+    assert log_path.read_text().startswith("record 05")
+
+
+def test_file_handler_prunes_old_segments(log_path):
+    handler = BufferedRotatingFileHandler(
+        str(log_path), buffer_bytes=1, max_bytes=10, backup_count=2, compression=None
+    )
+    for i in range(5):
+        handler.emit(make_record(f"record {i} " + "x" * 10))
+    handler.close()
+
+    segments = handler.segments()
+    assert len(segments) == 2
+    assert [open(path).read().split()[1] for path in segments] == ["2", "3"]
+
+
+def test_file_handler_rotates_by_time(log_path):
+    handler = BufferedRotatingFileHandler(
+        str(log_path), buffer_bytes=1, rotate_interval=0.01, compression=None
+    )
+    handler.emit(make_record("before"))
+    handler._opened_at -= 1
+    handler.emit(make_record("after"))
+    handler.close()
+
+    assert [open(path).read() for path in handler.segments()] == ["before\n"]
+    assert log_path.read_text() == "after\n"
@@ -0,0 +1,105 @@
+import os
+
+import pytest
+
+from src.grpy.tools.command_manager import CommandManager
+from src.grpy.tools.spooled_output import SpoolConfig, SpooledOutput
+
+
+def write_cmd(size, stream="stdout"):
+    return [
+        "python",
+        "-c",
+        f"import sys; sys.{stream}.buffer.write(b'x' * {size}); sys.{stream}.flush()",
+    ]
+
+
+@pytest.fixture
+def spool_dir(tmp_path):
+    directory = tmp_path / "spool"
+    directory.mkdir()
+    return directory
+
+
+def test_spool_config_defaults():
+    config = SpoolConfig()
+    assert config.memory_threshold == 1024 * 1024
+    assert config.max_bytes is None
+    assert config.on_limit == "truncate"
+
+
+def test_spool_config_invalid_policy():
+    with pytest.raises(ValueError):
+        SpoolConfig(on_limit="discard")
+
+
+def test_small_output_returned_in_memory(spool_dir):
+    cm = CommandManager(
+        cmds=[["python", "-c", "print('hello')"]], spool=SpoolConfig(directory=str(spool_dir))
+    )
+    result = cm.run_commands()[0]
+
+    assert result.stdout.strip() == "hello"
+    assert result.stdout_bytes == 6
+    assert os.listdir(spool_dir) == []
+
+
+@pytest.mark.parametrize("on_limit", ["truncate", "abort"])
+def test_spooled_command_without_timeout(spool_dir, on_limit):
+    config = SpoolConfig(directory=str(spool_dir), max_bytes=100, on_limit=on_limit)
+    cm = CommandManager(cmds=[["python", "-c", "print('hello')"]], spool=config, timeout=None)
+
+    assert cm.run_commands()[0].stdout.strip() == "hello"
+
+
+def test_large_output_spooled_to_file(spool_dir):
+    config = SpoolConfig(directory=str(spool_dir), memory_threshold=1024)
+    cm = CommandManager(cmds=[write_cmd(1024 * 1024)], spool=config)
+    result = cm.run_commands()[0]
+
+    with result.stdout as output:
+        assert isinstance(output, SpooledOutput)
+        assert output.size == 1024 * 1024
+        assert os.path.getsize(output.path) == 1024 * 1024
+        buffer = output.mmap()
+        assert buffer[:3] == b"xxx"
+        assert len(buffer) == 1024 * 1024
+
+    assert not os.path.exists(output.path)
+    assert os.listdir(spool_dir) == []
+
+
+def test_output_truncated_at_max_bytes(spool_dir):
+    config = SpoolConfig(directory=str(spool_dir), memory_threshold=0, max_bytes=100)
+    cm = CommandManager(cmds=[write_cmd(10000)], spool=config)
+    result = cm.run_commands()[0]
+
+    with result.stdout as output:
+        assert output.truncated
+        assert output.size == 100
+        assert output.read() == b"x" * 100
+    assert result.stdout_bytes == 10000
+
+
+def test_output_limit_aborts_command(spool_dir):
+    script = "import sys, time\nwhile True:\n    sys.stdout.write('x' * 4096); sys.stdout.flush()"
+    config = SpoolConfig(directory=str(spool_dir), max_bytes=64 * 1024, on_limit="abort")
+    cm = CommandManager(cmds=[["python", "-c", script]], spool=config, timeout=10.0)
+
+    with pytest.raises(RuntimeError) as exc_info:
+        cm.run_commands()
+
+    assert "output exceeded 65536 bytes" in str(exc_info.value)
+    assert os.listdir(spool_dir) == []
+
+
+def test_spooled_failure_reports_stderr(spool_dir):
+    script = "import sys; sys.stderr.write('e' * 10000 + 'boom'); sys.exit(2)"
+    config = SpoolConfig(directory=str(spool_dir), memory_threshold=0)
+    cm = CommandManager(cmds=[["python", "-c", script]], spool=config)
+
+    with pytest.raises(RuntimeError) as exc_info:
+        cm.run_commands()
+
+    assert str(exc_info.value).endswith("boom")
+    assert os.listdir(spool_dir) == []